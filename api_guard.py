@@ -0,0 +1,231 @@
+import math
+import time
+import random
+import threading
+from typing import Callable, Optional, Tuple, Type
+
+from settings import get_section
+
+
+class CloudUnavailableError(Exception):
+    """เรียก API ไม่ได้ในตอนนี้ (ถูกจำกัดอัตรา / Circuit เปิดอยู่) ข้อความใช้แสดงบน Overlay ได้เลย"""
+
+
+class RateLimitedError(CloudUnavailableError):
+    pass
+
+
+class CircuitOpenError(CloudUnavailableError):
+    pass
+
+
+# ====================================================================
+# I. Token Bucket: จำกัดจำนวน Request ต่อวินาที (กันโควตาหมดเมื่อกดคีย์ลัดรัวๆ)
+# ====================================================================
+class TokenBucket:
+    """
+    Args:
+        rate: จำนวน Request ต่อวินาทีโดยเฉลี่ย (0 = ไม่จำกัด)
+        burst: จำนวน Request ที่ยิงติดกันได้ทันที
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """จอง Token 1 อัน คืนเวลาที่ต้องรอก่อนใช้ได้ (วินาที)"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def _refund(self):
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+    def acquire(self, max_wait: float) -> bool:
+        """รอ Token ได้ไม่เกิน max_wait วินาที (False = ต้องรอนานเกิน จึงไม่จอง)"""
+        if self.rate <= 0:
+            return True
+        wait = self._reserve()
+        if wait > max_wait:
+            self._refund()
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+
+# ====================================================================
+# II. Circuit Breaker: Backend ล่มแล้วให้ล้มเหลวทันที แทนการรอ Timeout ทุกครั้ง
+# ====================================================================
+class CircuitBreaker:
+    """
+    ล้มเหลวติดกัน failure_threshold ครั้ง -> เปิด Circuit (ปฏิเสธทุก Request) เป็นเวลา reset_seconds
+    จากนั้นปล่อยให้ลอง 1 Request (half-open): สำเร็จ = ปิด Circuit, ล้มเหลว = เปิดต่ออีกรอบ
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def retry_in(self) -> float:
+        """วินาทีที่เหลือก่อนจะลองเรียกใหม่ได้ (0 = เรียกได้)"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            # OPEN: รอครบเวลา / HALF_OPEN: มี Request ทดสอบอยู่แล้ว (ถ้าเงียบไปนานเกินก็ให้ลองใหม่)
+            if now - self._opened_at < self.reset_seconds:
+                return False
+            self._state = self.HALF_OPEN   # ให้ผ่าน 1 Request เพื่อทดสอบ
+            self._opened_at = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+# ====================================================================
+# III. ApiGuard: รวม Rate Limit + Retry แบบ Backoff + Circuit Breaker สำหรับ 1 API
+# ====================================================================
+class ApiGuard:
+    """
+    ห่อการเรียก API หนึ่งตัว (เช่น 'vision', 'translate') ใช้ร่วมกันทุก Thread
+
+    Args:
+        name: ชื่อ API (ใช้ในข้อความ Error)
+        limiter: TokenBucket ของ API นี้
+        breaker: CircuitBreaker ของ API นี้
+        transient_errors: Exception ที่ถือว่าชั่วคราว (ลองใหม่ได้ และนับเป็นความล้มเหลวของ Backend)
+        max_attempts: จำนวนครั้งที่ลองทั้งหมด (รวมครั้งแรก)
+        base_delay, max_delay: Backoff แบบ Exponential + Full Jitter (วินาที)
+        max_wait: รอ Rate Limit ได้นานสุดกี่วินาที ก่อนยอมแพ้
+    """
+
+    def __init__(self, name: str, limiter: TokenBucket, breaker: CircuitBreaker,
+                 transient_errors: Tuple[Type[BaseException], ...] = (), max_attempts: int = 3,
+                 base_delay: float = 0.2, max_delay: float = 2.0, max_wait: float = 2.0):
+        self.name = name
+        self.limiter = limiter
+        self.breaker = breaker
+        self.transient_errors = transient_errors
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_wait = max_wait
+
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.rejected = 0
+        self.failures = 0
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _count(self, field: str):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def call(self, fn: Callable, on_error: Optional[Callable[[Exception], None]] = None):
+        """
+        เรียก fn() ภายใต้ข้อจำกัดของ API นี้
+
+        Args:
+            fn: ฟังก์ชันที่เรียก API จริง (ควรดึง Client ใหม่ทุกครั้ง เผื่อ Client ถูกสร้างใหม่ระหว่าง Retry)
+            on_error: เรียกทุกครั้งที่ fn ล้มเหลว (เช่น CloudClientManager.handle_error)
+
+        Raises:
+            CircuitOpenError / RateLimitedError: ไม่ได้เรียก API เลย
+            Exception เดิมของ fn: เมื่อล้มเหลวแบบถาวร หรือ Retry ครบแล้ว
+        """
+        self._count('calls')
+        if not self.breaker.allow():
+            self._count('rejected')
+            raise CircuitOpenError(f"Google {self.name} ไม่พร้อมใช้งานชั่วคราว "
+                                   f"(ลองใหม่ได้ใน {math.ceil(self.breaker.retry_in())} วินาที)")
+
+        for attempt in range(self.max_attempts):
+            if not self.limiter.acquire(self.max_wait):
+                self._count('rejected')
+                raise RateLimitedError(f"เรียก Google {self.name} ถี่เกินไป กรุณารอสักครู่")
+            try:
+                result = fn()
+            except self.transient_errors as e:
+                if on_error:
+                    on_error(e)
+                if attempt + 1 >= self.max_attempts:
+                    self._count('failures')
+                    self.breaker.record_failure()
+                    raise
+                self._count('retries')
+                delay = self.backoff(attempt)
+                print(f"Info: {self.name} error ({type(e).__name__}), retry {attempt + 1} in {delay:.2f}s")
+                time.sleep(delay)
+            except Exception as e:
+                # Error ถาวร (เช่น Key ผิด / ภาพเสีย) ไม่ลองซ้ำ และไม่ถือว่า Backend ล่ม (ยังตอบกลับมาได้)
+                if on_error:
+                    on_error(e)
+                self.breaker.record_success()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'retries': self.retries,
+                'rejected': self.rejected,
+                'failures': self.failures,
+                'circuit': self.breaker.state,
+            }
+
+
+def create_api_guard(name: str, transient_errors: Tuple[Type[BaseException], ...] = ()) -> ApiGuard:
+    """สร้าง ApiGuard ของ API ชื่อ name ตามค่าในหมวด api_limits ของ settings"""
+    config = get_section('api_limits')
+    limit = config.get(name, {})
+    return ApiGuard(
+        name,
+        TokenBucket(limit.get('rate', 5), limit.get('burst', 5)),
+        CircuitBreaker(config.get('failure_threshold', 5), config.get('reset_seconds', 30)),
+        transient_errors=transient_errors,
+        max_attempts=config.get('max_attempts', 3),
+        base_delay=config.get('base_delay', 0.2),
+        max_delay=config.get('max_delay', 2.0),
+        max_wait=config.get('max_wait', 2.0),
+    )
@@ -0,0 +1,253 @@
+import os
+import html
+import base64
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from google.oauth2 import service_account
+
+from cloud_processor import (get_key_path, translation_cache, translation_memory, OCR_FAILED_MESSAGE,
+                             TRANSLATE_FAILED_MESSAGE)
+from settings import get_section
+
+SCOPES = ['https://www.googleapis.com/auth/cloud-platform']
+VISION_ENDPOINT = "https://vision.googleapis.com"
+TRANSLATE_ENDPOINT = "https://translation.googleapis.com"
+
+
+class CloudEngineError(Exception):
+    pass
+
+
+# ====================================================================
+# Engine แบบ asyncio: OCR -> แปล หลายงานพร้อมกันบน Event Loop เดียว
+# ====================================================================
+class AsyncCloudEngine:
+    """
+    เรียก Vision / Translate v2 ผ่าน REST แบบ async (aiohttp) บน Event Loop Thread เดียว
+    งานหลายเฟรมทำงานซ้อนกันได้ (OCR ของเฟรม N+1 เกิดขึ้นระหว่างแปลเฟรม N)
+    โดยไม่ต้องใช้ OS Thread ต่อ 1 Request
+
+    ฝั่ง Qt ใช้ผ่าน Facade แบบ Sync: submit() คืน concurrent.futures.Future
+    หรือ process_and_translate_sync() ที่รอผลให้เลย
+
+    ใช้ Translation Cache และ Translation Memory ร่วมกับ cloud_processor (SQLite เป็นงาน Blocking
+    จึงเรียกใน Executor ไม่ให้ Loop ค้าง) แต่ไม่ผ่านส่วนเหล่านี้ของ cloud_processor:
+        - ApiGuard: ไม่มี Rate Limit / Retry / Circuit Breaker (จำกัดแค่จำนวน Request พร้อมกัน max_concurrency)
+        - SingleFlight: Request ที่เหมือนกันซึ่งส่งพร้อมกันจะเรียก API ซ้ำ (รวมถึงกับงานจาก Thread Pool)
+        - แปลทีละประโยค (incremental_translate): แปลทั้งก้อนทุกครั้ง
+
+    Args:
+        vision_endpoint, translate_endpoint: URL ของ API (เปลี่ยนเป็น Mock Server ในเครื่องได้)
+        anonymous: True = ไม่แนบ Token (สำหรับ Mock Server)
+        max_concurrency: จำนวน Request ที่ส่งพร้อมกันได้สูงสุด
+        timeout: เวลารอสูงสุดต่อ Request (วินาที)
+    """
+
+    def __init__(self, vision_endpoint: str = VISION_ENDPOINT, translate_endpoint: str = TRANSLATE_ENDPOINT,
+                 anonymous: bool = False, max_concurrency: int = 8, timeout: float = 15.0,
+                 target_language: str = 'th', source_language: str = 'en'):
+        self.vision_endpoint = vision_endpoint.rstrip('/')
+        self.translate_endpoint = translate_endpoint.rstrip('/')
+        self.anonymous = anonymous
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.target_language = target_language
+        self.source_language = source_language
+
+        self._credentials = None
+        self._token_lock = None
+        self._session = None
+        self._semaphore = None
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    # --- Auth ---
+    def _load_credentials(self):
+        key_path = get_key_path()
+        if os.path.exists(key_path):
+            return service_account.Credentials.from_service_account_file(key_path, scopes=SCOPES)
+        import google.auth
+        credentials, _ = google.auth.default(scopes=SCOPES)
+        return credentials
+
+    def _refresh_credentials(self):
+        from google.auth.transport.requests import Request
+        if self._credentials is None:
+            self._credentials = self._load_credentials()
+        self._credentials.refresh(Request())
+        return self._credentials.token
+
+    async def _auth_headers(self) -> dict:
+        if self.anonymous:
+            return {}
+        async with self._token_lock:
+            if self._credentials is None or not self._credentials.valid:
+                # การขอ Token เป็นงาน Blocking -> ทำใน Executor ไม่ให้ Loop ค้าง
+                await asyncio.get_running_loop().run_in_executor(None, self._refresh_credentials)
+        return {"Authorization": f"Bearer {self._credentials.token}"}
+
+    # --- HTTP ---
+    async def _ensure_session(self):
+        if self._session is None:
+            import aiohttp
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._token_lock = asyncio.Lock()
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60),
+            )
+        return self._session
+
+    async def _post_json(self, url: str, payload: dict) -> dict:
+        session = await self._ensure_session()
+        headers = await self._auth_headers()
+        async with self._semaphore:
+            async with session.post(url, json=payload, headers=headers) as response:
+                body = await response.json(content_type=None)
+                if response.status >= 400:
+                    message = (body or {}).get('error', {}).get('message', response.reason)
+                    raise CloudEngineError(f"HTTP {response.status}: {message}")
+                return body
+
+    # --- API ---
+    async def ocr(self, image_data: bytes) -> Optional[str]:
+        """เหมือน process_image_to_text แต่เป็น Coroutine"""
+        payload = {"requests": [{
+            "image": {"content": base64.b64encode(image_data).decode('ascii')},
+            "features": [{"type": "TEXT_DETECTION"}],
+        }]}
+        body = await self._post_json(f"{self.vision_endpoint}/v1/images:annotate", payload)
+        response = (body.get('responses') or [{}])[0]
+        if 'error' in response:
+            raise CloudEngineError(response['error'].get('message', 'Vision error'))
+        annotations = response.get('textAnnotations') or []
+        if not annotations:
+            return None
+        return annotations[0].get('description', '').strip() or None
+
+    async def translate(self, text: str, target_language: str = None, source_language: str = None,
+                        use_cache: bool = True) -> Optional[str]:
+        """เหมือน translate_content แต่เป็น Coroutine (ใช้ Translation Cache / Memory ร่วมกัน)"""
+        if not text:
+            return None
+        target_language = target_language or self.target_language
+        source_language = source_language or self.source_language
+        loop = asyncio.get_running_loop()
+        if use_cache:
+            cached = await loop.run_in_executor(None, self._cached, text, source_language, target_language)
+            if cached is not None:
+                return cached
+
+        payload = {"q": [text], "target": target_language, "source": source_language}
+        body = await self._post_json(f"{self.translate_endpoint}/language/translate/v2", payload)
+        translations = body.get('data', {}).get('translations') or []
+        if not translations:
+            return None
+        translated = html.unescape(translations[0]['translatedText'].strip())
+        if use_cache:
+            await loop.run_in_executor(None, self._remember, text, source_language, target_language, translated)
+        return translated
+
+    @staticmethod
+    def _cached(text: str, source_language: str, target_language: str) -> Optional[str]:
+        cached = translation_cache.get(text, source_language, target_language)
+        if cached is None:
+            cached = translation_memory.get(text, source_language, target_language)
+        return cached
+
+    @staticmethod
+    def _remember(text: str, source_language: str, target_language: str, translated: str):
+        translation_cache.put(text, source_language, target_language, translated)
+        translation_memory.put(text, source_language, target_language, translated)
+
+    async def process_and_translate(self, image_data: bytes, on_ocr: Optional[Callable[[str], None]] = None
+                                    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        OCR แล้วแปล คืน (original, translated) แบบเดียวกับ cloud_processor.process_and_translate
+        on_ocr: เรียกด้วยข้อความต้นฉบับทันทีที่ OCR เสร็จ (บน Thread ของ Event Loop)
+        """
+        try:
+            original = await self.ocr(image_data)
+        except Exception as e:
+            print(f"ERROR: การทำ OCR (async) ล้มเหลว: {e}")
+            original = None
+        if not original:
+            return None, OCR_FAILED_MESSAGE
+        if on_ocr:
+            on_ocr(original)
+        try:
+            translated = await self.translate(original)
+        except Exception as e:
+            print(f"ERROR: การแปล (async) ล้มเหลว: {e}")
+            translated = None
+        return original, translated or TRANSLATE_FAILED_MESSAGE
+
+    async def process_many(self, images: Iterable[bytes]) -> List[Tuple[Optional[str], Optional[str]]]:
+        """ประมวลผลหลายภาพพร้อมกัน (ลำดับผลลัพธ์ตรงกับลำดับภาพ)"""
+        return await asyncio.gather(*(self.process_and_translate(image) for image in images))
+
+    async def aclose(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    # --- Sync Facade (เรียกจาก Thread อื่น เช่น Qt) ---
+    def start(self):
+        """เปิด Event Loop ใน Background Thread (เรียกซ้ำได้)"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="AsyncCloudEngine", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.run_until_complete(self.aclose())
+        self._loop.close()
+
+    def submit(self, image_data: bytes, on_ocr: Optional[Callable[[str], None]] = None) -> Future:
+        """ส่งภาพเข้า Engine คืน Future ที่ได้ (original, translated)"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self.process_and_translate(image_data, on_ocr), self._loop)
+
+    def submit_translate(self, text: str, **kwargs) -> Future:
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self.translate(text, **kwargs), self._loop)
+
+    def process_and_translate_sync(self, image_data: bytes, on_ocr: Optional[Callable[[str], None]] = None
+                                   ) -> Tuple[Optional[str], Optional[str]]:
+        return self.submit(image_data, on_ocr).result()
+
+    def translate_sync(self, text: str, **kwargs) -> Optional[str]:
+        return self.submit_translate(text, **kwargs).result()
+
+    def close(self):
+        if self._loop is not None and self._thread is not None and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+
+def create_async_engine() -> AsyncCloudEngine:
+    """
+    สร้าง Engine ตามค่าใน settings (หมวด async_engine)
+    Endpoint ที่ไม่ได้ตั้งไว้จะใช้ของหมวด cloud_endpoints (เช่น Mock Server) และใช้ anonymous จากหมวดนั้น
+    เหมือน Client แบบ Sync
+    """
+    config = get_section('async_engine')
+    endpoints = get_section('cloud_endpoints')
+    return AsyncCloudEngine(
+        vision_endpoint=config.get('vision_endpoint') or endpoints.get('vision') or VISION_ENDPOINT,
+        translate_endpoint=config.get('translate_endpoint') or endpoints.get('translate') or TRANSLATE_ENDPOINT,
+        anonymous=endpoints.get('anonymous', False),
+        max_concurrency=config.get('max_concurrency', 8),
+        timeout=config.get('timeout', 15.0),
+    )
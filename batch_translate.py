@@ -0,0 +1,287 @@
+"""
+แปลภาพหน้าจอทีละมากๆ โดยไม่เปิดหน้าต่าง (เช่น แปลภาพเกมหลายพันภาพข้ามคืน)
+
+แต่ละภาพ: อ่านไฟล์ -> ถอดรหัส -> เตรียมภาพ (หมวด preprocess) -> OCR -> แปล
+ทำพร้อมกันบน Thread Pool หรือ Process Pool ที่จำกัดจำนวน แล้วเขียนผลทีละบรรทัดเป็น JSONL หรือ CSV
+ถ้าหยุดกลางคัน รันคำสั่งเดิมซ้ำจะข้ามภาพที่แปลสำเร็จแล้วในไฟล์ผลลัพธ์
+
+วิธีใช้:
+    python batch_translate.py screenshots/ -o results.jsonl
+    python batch_translate.py "shots/**/*.png" -o results.csv --workers 8
+    dir /b /s *.png | python batch_translate.py - -o results.jsonl
+"""
+import os
+import sys
+import csv
+import glob
+import json
+import time
+import argparse
+import statistics
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, List, Optional, Set
+
+import settings
+from settings import get_section
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.webp')
+FIELDS = ('path', 'status', 'original', 'translated', 'error', 'ms')
+
+
+# ====================================================================
+# I. หารายการไฟล์ภาพ (โฟลเดอร์ / Glob / stdin)
+# ====================================================================
+def iter_image_paths(sources: Iterable[str]) -> Iterator[str]:
+    """
+    แปลง Argument แต่ละตัวเป็น path ของไฟล์ภาพ (ไม่ซ้ำ เรียงตามชื่อภายในแต่ละ Argument)
+        - โฟลเดอร์: ทุกไฟล์ภาพในโฟลเดอร์และโฟลเดอร์ย่อย
+        - '-': อ่าน path จาก stdin บรรทัดละ 1 ไฟล์
+        - อย่างอื่น: Glob (รองรับ **) หรือ path ของไฟล์ตรงๆ
+    """
+    seen = set()
+
+    def emit(paths):
+        for path in paths:
+            path = os.path.abspath(path)
+            if path not in seen:
+                seen.add(path)
+                yield path
+
+    for source in sources:
+        if source == '-':
+            yield from emit(line.strip() for line in sys.stdin if line.strip())
+        elif os.path.isdir(source):
+            found = []
+            for root, _, files in os.walk(source):
+                found.extend(os.path.join(root, name) for name in files
+                             if name.lower().endswith(IMAGE_EXTENSIONS))
+            yield from emit(sorted(found))
+        else:
+            matches = sorted(glob.glob(source, recursive=True))
+            if not matches and not glob.has_magic(source):
+                matches = [source]   # ไฟล์ที่ไม่มีอยู่จริงจะถูกรายงานเป็น error ตอนประมวลผล
+            yield from emit(path for path in matches if not os.path.isdir(path))
+
+
+# ====================================================================
+# II. งานของแต่ละภาพ (รันใน Worker)
+# ====================================================================
+_pipeline = None
+
+
+def init_worker(settings_path: Optional[str] = None):
+    """
+    เตรียม Worker: โหลด settings จากไฟล์ที่ระบุ (ต้องทำก่อน import cloud_processor
+    เพราะ Client / Cache ถูกสร้างจาก settings ตอน import)
+    """
+    global _pipeline
+    if settings_path:
+        settings.settings.clear()
+        settings.settings.update(settings.load_settings(settings_path))
+    from image_pipeline import create_image_pipeline
+    _pipeline = create_image_pipeline()
+
+
+def translate_file(path: str, source_language: str, target_language: str) -> dict:
+    """อ่าน + OCR + แปลภาพ 1 ไฟล์ คืน record ตาม FIELDS (ไม่ raise)"""
+    from cloud_processor import process_image_to_text, translate_incremental
+    from image_pipeline import decode_image
+
+    start = time.perf_counter()
+    record = {'path': path, 'status': 'ok', 'original': None, 'translated': None, 'error': None}
+    try:
+        with open(path, 'rb') as f:
+            frame = decode_image(f.read())
+        original = process_image_to_text(_pipeline.run(frame))
+        if not original:
+            record['status'] = 'no_text'
+        else:
+            record['original'] = original
+            record['translated'] = translate_incremental(original, target_language, source_language)
+            if not record['translated']:
+                record['status'], record['error'] = 'error', "แปลไม่สำเร็จ"
+    except Exception as e:
+        record['status'], record['error'] = 'error', str(e) or type(e).__name__
+    record['ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return record
+
+
+# ====================================================================
+# III. ไฟล์ผลลัพธ์ (JSONL / CSV ต่อท้ายได้ เพื่อทำต่อจากที่ค้าง)
+# ====================================================================
+class ResultWriter:
+    """
+    เขียนผลทีละ record แล้ว flush ทันที (หยุดกลางคันเสียไม่เกินงานที่กำลังทำอยู่)
+    รูปแบบดูจากนามสกุลไฟล์: .csv = CSV, อื่นๆ = JSON Lines
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.is_csv = path.lower().endswith('.csv')
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'a', encoding='utf-8', newline='')
+        if self.is_csv:
+            self._csv = csv.DictWriter(self._file, fieldnames=FIELDS)
+            if is_new:
+                self._csv.writeheader()
+
+    def write(self, record: dict):
+        if self.is_csv:
+            self._csv.writerow({key: record.get(key) for key in FIELDS})
+        else:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def read_completed(path: str) -> Set[str]:
+    """อ่านไฟล์ผลลัพธ์เดิม คืน path ที่ status เป็น ok (บรรทัดหลังสุดของแต่ละ path ชนะ)"""
+    if not os.path.exists(path):
+        return set()
+    status = {}
+    with open(path, encoding='utf-8', newline='') as f:
+        if path.lower().endswith('.csv'):
+            rows = csv.DictReader(f)
+        else:
+            rows = []
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    pass   # บรรทัดสุดท้ายที่เขียนไม่ครบตอนถูกหยุด
+        for row in rows:
+            if row.get('path'):
+                status[row['path']] = row.get('status')
+    return {p for p, s in status.items() if s == 'ok'}
+
+
+# ====================================================================
+# IV. ตัวจัดการงาน
+# ====================================================================
+def run_batch(paths: List[str], writer: ResultWriter, workers: int = 4, executor: str = 'thread',
+              max_pending: int = 0, source_language: str = 'en', target_language: str = 'th',
+              settings_path: Optional[str] = None, progress_every: float = 5.0) -> dict:
+    """
+    ส่งงานเข้า Pool ทีละไม่เกิน max_pending งาน (ไม่สร้าง Future หลายพันตัวพร้อมกัน) แล้วเขียนผลตามลำดับที่เสร็จ
+
+    Returns:
+        สรุปผล (จำนวนแต่ละสถานะ, เวลา, อัตราภาพต่อวินาที, Latency ต่อภาพ)
+    """
+    max_pending = max_pending or workers * 2
+    if executor == 'process':
+        # แต่ละ Process มี Client / Cache / Rate Limit ของตัวเอง
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(settings_path,))
+    else:
+        init_worker(settings_path)
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Batch")
+
+    counts = {'ok': 0, 'no_text': 0, 'error': 0}
+    latencies = []
+    start = last_report = time.perf_counter()
+    pending = set()
+    interrupted = False
+
+    def collect(done):
+        nonlocal last_report
+        for future in done:
+            record = future.result()
+            writer.write(record)
+            counts[record['status']] += 1
+            latencies.append(record['ms'])
+        now = time.perf_counter()
+        if progress_every and now - last_report >= progress_every:
+            finished = sum(counts.values())
+            print(f"[{finished}/{len(paths)}] {finished / (now - start):.2f} ภาพ/วินาที  error {counts['error']}")
+            last_report = now
+
+    try:
+        for path in paths:
+            while len(pending) >= max_pending:
+                done, pending = wait(pending, timeout=progress_every or None, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(pool.submit(translate_file, path, source_language, target_language))
+        while pending:
+            done, pending = wait(pending, timeout=progress_every or None, return_when=FIRST_COMPLETED)
+            collect(done)
+    except KeyboardInterrupt:
+        # เก็บผลที่เสร็จแล้ว ที่เหลือจะถูกทำต่อในการรันครั้งถัดไป
+        interrupted = True
+        for future in pending:
+            future.cancel()
+        collect(future for future in pending if future.done() and not future.cancelled())
+    finally:
+        pool.shutdown(wait=not interrupted, cancel_futures=True)
+
+    elapsed = time.perf_counter() - start
+    finished = sum(counts.values())
+    latencies.sort()
+    return {
+        **counts,
+        'processed': finished,
+        'interrupted': interrupted,
+        'seconds': round(elapsed, 2),
+        'images_per_second': round(finished / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': statistics.median(latencies) if latencies else 0.0,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0,
+    }
+
+
+def cloud_stats() -> dict:
+    """สถิติการเรียก API / Cache ของ Process นี้ (โหมด thread)"""
+    import cloud_processor
+    return {
+        'api': {name: guard.stats() for name, guard in cloud_processor.api_guards.items()},
+        'translation_cache': cloud_processor.translation_cache.stats(),
+        'translation_memory': cloud_processor.translation_memory.stats(),
+        'inflight': cloud_processor.inflight.stats(),
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    config = get_section('batch')
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', nargs='+', help="โฟลเดอร์ / Glob / path ของไฟล์ภาพ หรือ '-' เพื่ออ่าน path จาก stdin")
+    parser.add_argument('-o', '--output', default=config.get('output', 'translations.jsonl'),
+                        help="ไฟล์ผลลัพธ์ (.jsonl หรือ .csv) ถ้ามีอยู่แล้วจะทำต่อจากเดิม")
+    parser.add_argument('--workers', type=int, default=config.get('workers', 4))
+    parser.add_argument('--executor', choices=('thread', 'process'), default=config.get('executor', 'thread'),
+                        help="thread = ใช้ Cache / Rate Limit ร่วมกัน, process = ถอดรหัส/เตรียมภาพขนานได้เต็มที่")
+    parser.add_argument('--max-pending', type=int, default=config.get('max_pending', 0),
+                        help="จำนวนงานที่ส่งเข้า Pool ค้างไว้ได้สูงสุด (0 = workers x 2)")
+    parser.add_argument('--source', default='en', help="ภาษาต้นทาง")
+    parser.add_argument('--target', default='th', help="ภาษาปลายทาง")
+    parser.add_argument('--settings', help="ไฟล์ settings.json ที่จะใช้แทนของโฟลเดอร์โปรแกรม")
+    parser.add_argument('--restart', action='store_true', help="ไม่ข้ามภาพที่เคยแปลสำเร็จในไฟล์ผลลัพธ์")
+    args = parser.parse_args(argv)
+
+    paths = list(iter_image_paths(args.inputs))
+    done = set() if args.restart else read_completed(args.output)
+    writer = ResultWriter(args.output)
+    todo = [path for path in paths if path not in done]
+    print(f"พบ {len(paths)} ภาพ, แปลแล้ว {len(paths) - len(todo)}, ต้องแปล {len(todo)} "
+          f"({args.executor} x {args.workers}) -> {args.output}")
+
+    try:
+        summary = run_batch(todo, writer, workers=args.workers, executor=args.executor,
+                            max_pending=args.max_pending, source_language=args.source,
+                            target_language=args.target, settings_path=args.settings)
+    finally:
+        writer.close()
+
+    print("\n--- สรุป ---")
+    print(f"สำเร็จ {summary['ok']}  ไม่พบข้อความ {summary['no_text']}  ผิดพลาด {summary['error']}  "
+          f"(ข้ามเพราะเคยแปลแล้ว {len(paths) - len(todo)})")
+    print(f"{summary['processed']} ภาพใน {summary['seconds']}s = {summary['images_per_second']} ภาพ/วินาที  "
+          f"ต่อภาพ p50={summary['p50_ms']:.0f} ms  p95={summary['p95_ms']:.0f} ms")
+    if args.executor == 'thread' and todo:
+        print(json.dumps(cloud_stats(), ensure_ascii=False))
+    if summary['interrupted']:
+        print("หยุดกลางคัน: รันคำสั่งเดิมอีกครั้งเพื่อทำต่อ")
+        return 130
+    return 1 if summary['error'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Throughput benchmark: OCR -> แปล หลายภาพ เทียบ 3 แบบ กับ Mock Server ในเครื่อง
+  1. sequential  - process_and_translate ทีละภาพ (Client แบบ Blocking)
+  2. threads     - process_and_translate บน ThreadPoolExecutor (1 OS Thread ต่อ Request)
+  3. asyncio     - AsyncCloudEngine.process_many บน Event Loop เดียว
+
+วิธีใช้:
+    python benchmarks/bench_async.py --images 64 --latency 0.05
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio  # noqa: E402
+import settings  # noqa: E402
+
+# วัดโค้ด ไม่ใช่ Rate Limit ของ ApiGuard (ค่าเริ่มต้น Vision 5 req/s) ต้องตั้งก่อน import cloud_processor
+for _name in ('vision', 'translate'):
+    settings.settings['api_limits'][_name]['rate'] = 0
+
+import cloud_processor  # noqa: E402
+from cloud_processor import CloudClientManager  # noqa: E402
+from async_engine import AsyncCloudEngine  # noqa: E402
+from mock_cloud_server import MockCloudServer  # noqa: E402
+
+
+def _report(label: str, count: int, elapsed: float):
+    print(f"{label:<12} {elapsed * 1000:9.1f} ms total   {count / elapsed:8.1f} images/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--images', type=int, default=32)
+    parser.add_argument('--latency', type=float, default=0.05, help="หน่วงเวลาฝั่ง Mock ต่อ Request (วินาที)")
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    # ปิด Cache คำแปล ไม่ให้ภาพที่ข้อความซ้ำกันข้ามการเรียก API
+    cloud_processor.translation_cache.enabled = False
+    cloud_processor.translation_memory.enabled = False
+    images = [f"frame-{i}".encode() for i in range(args.images)]
+
+    with MockCloudServer(latency=args.latency) as mock:
+        options = {'api_endpoint': mock.endpoint}
+        cloud_processor.client_manager = CloudClientManager(
+            client_options={'vision': options, 'translate': options}, vision_transport='rest', anonymous=True)
+        cloud_processor.client_manager.warm_up()
+
+        start = time.perf_counter()
+        for image in images:
+            cloud_processor.process_and_translate(image)
+        _report("sequential", len(images), time.perf_counter() - start)
+
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            start = time.perf_counter()
+            list(pool.map(cloud_processor.process_and_translate, images))
+            _report("threads", len(images), time.perf_counter() - start)
+
+        engine = AsyncCloudEngine(mock.endpoint, mock.endpoint, anonymous=True, max_concurrency=args.concurrency)
+
+        async def run():
+            await engine.process_many(images[:1])   # เปิด Connection ก่อนจับเวลา
+            start = time.perf_counter()
+            results = await engine.process_many(images)
+            elapsed = time.perf_counter() - start
+            await engine.aclose()
+            return results, elapsed
+
+        results, elapsed = asyncio.run(run())
+        assert all(original for original, _ in results)
+        _report("asyncio", len(images), elapsed)
+
+        # Facade แบบ Sync (แบบที่ฝั่ง Qt เรียกใช้)
+        engine = AsyncCloudEngine(mock.endpoint, mock.endpoint, anonymous=True,
+                                  max_concurrency=args.concurrency).start()
+        engine.process_and_translate_sync(images[0])
+        start = time.perf_counter()
+        futures = [engine.submit(image) for image in images]
+        for future in futures:
+            future.result()
+        _report("async facade", len(images), time.perf_counter() - start)
+        engine.close()
+
+
+if __name__ == '__main__':
+    main()
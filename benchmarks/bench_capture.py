@@ -0,0 +1,74 @@
+"""
+Micro-benchmark: เปรียบเทียบ Latency การจับภาพหน้าจอ
+  - แบบเดิม: เปิด mss.mss() ใหม่ทุกครั้ง (ต่อ Display ใหม่ + จอง Buffer ใหม่)
+  - แบบใหม่: CaptureService (mss Handle ต่อ Thread ใช้ซ้ำ + คืน NumPy View)
+
+ต้องรันบนเครื่องที่มีหน้าจอจริง (Windows / X11 / macOS) เพราะวัดการจับภาพจริง
+
+วิธีใช้:
+    python benchmarks/bench_capture.py --runs 100
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mss  # noqa: E402
+from capture_service import CaptureService  # noqa: E402
+from frame_tools import frame_to_array  # noqa: E402
+
+REGION_SIZES = [(800, 160), (1600, 400), (1920, 1080)]
+
+
+def _per_call_grab(monitor):
+    with mss.mss() as sct:
+        sct_img = sct.grab(monitor)
+        return frame_to_array(sct_img.raw, sct_img.width, sct_img.height)
+
+
+def _measure(fn, monitor, runs: int):
+    fn(monitor)   # Warm-up
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(monitor)
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)
+
+
+def _report(label: str, samples):
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"  {label:<16} mean={statistics.mean(samples):7.2f} ms  "
+          f"p50={statistics.median(samples):7.2f} ms  p95={p95:7.2f} ms")
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=100)
+    args = parser.parse_args()
+
+    try:
+        with mss.mss() as sct:
+            screen = sct.monitors[1]
+    except Exception as e:
+        print(f"Error: เปิดหน้าจอไม่ได้ ({e}) Benchmark นี้ต้องรันบนเครื่องที่มีหน้าจอจริง")
+        return 1
+
+    service = CaptureService()
+    for width, height in REGION_SIZES:
+        monitor = {"top": screen["top"], "left": screen["left"],
+                   "width": min(width, screen["width"]), "height": min(height, screen["height"])}
+        print(f"{monitor['width']}x{monitor['height']}")
+        before = _report("mss per call", _measure(_per_call_grab, monitor, args.runs))
+        after = _report("CaptureService", _measure(service.grab, monitor, args.runs))
+        print(f"  เร็วขึ้น {before / after:.1f} เท่า (p50)")
+    service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Micro-benchmark: เปรียบเทียบ Latency ระหว่าง Client แบบ Cold (สร้างใหม่ทุกครั้ง แบบเดิม)
+กับ Client แบบ Warm (CloudClientManager ใช้ซ้ำ) โดยยิงไปที่ Mock Server ในเครื่อง
+
+วิธีใช้:
+    python benchmarks/bench_clients.py --runs 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.cloud import vision  # noqa: E402
+from cloud_processor import CloudClientManager  # noqa: E402
+from mock_cloud_server import MockCloudServer  # noqa: E402
+
+
+def _new_manager(endpoint: str) -> CloudClientManager:
+    return CloudClientManager(
+        client_options={'vision': {'api_endpoint': endpoint}, 'translate': {'api_endpoint': endpoint}},
+        vision_transport='rest',
+        anonymous=True,
+    )
+
+
+def _call(manager: CloudClientManager, name: str):
+    if name == 'vision':
+        client = manager.get_vision_client()
+        client.text_detection(image=vision.Image(content=b"stub"))
+    else:
+        client = manager.get_translate_client()
+        client.translate("Hello", target_language='th', source_language='en')
+
+
+def _measure(fn, runs: int):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label: str, samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"{label:<22} mean={statistics.mean(samples):7.2f} ms  "
+          f"p50={statistics.median(samples):7.2f} ms  p95={p95:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=30)
+    parser.add_argument('--latency', type=float, default=0.0, help="หน่วงเวลาฝั่ง Mock (วินาที)")
+    args = parser.parse_args()
+
+    with MockCloudServer(latency=args.latency) as mock:
+        for name in CloudClientManager.CLIENT_NAMES:
+            cold = _measure(lambda: _call(_new_manager(mock.endpoint), name), args.runs)
+
+            shared = _new_manager(mock.endpoint)
+            shared.warm_up()
+            warm = _measure(lambda: _call(shared, name), args.runs)
+
+            _report(f"{name} cold", cold)
+            _report(f"{name} warm", warm)
+
+
+if __name__ == '__main__':
+    main()
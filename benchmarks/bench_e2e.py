@@ -0,0 +1,220 @@
+"""
+End-to-end latency benchmark: จากการกดคีย์ลัด Ctrl+Alt+E จนหน้าต่าง OverlayResultWindow วาดเสร็จ
+
+ขับ MainController แบบไม่มีหน้าจอ (Qt platform 'offscreen') ใช้ภาพปลอมแทนการจับหน้าจอ
+และ Mock Server แทน Google แล้วรายงาน p50/p95/p99 ของแต่ละขั้น:
+    capture -> encode -> ocr -> translate -> render (และ total)
+และ first = เวลาจนต้นฉบับขึ้นบน Overlay (ก่อนได้คำแปล) ซึ่งเป็นเวลาที่ผู้ใช้รอจริง
+วนทดสอบหลายขนาดภาพ x หลายความยาวข้อความ แล้วบันทึกผลเป็น JSON เพื่อเทียบระหว่างเวอร์ชัน
+
+วิธีใช้:
+    python benchmarks/bench_e2e.py --runs 30 --latency 0.05 --output e2e_latency.json
+"""
+import os
+import sys
+import json
+import time
+import types
+import argparse
+import platform
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+import settings  # noqa: E402
+from mock_cloud_server import MockCloudServer  # noqa: E402
+from samples import render_text_frame, SAMPLE_LINES  # noqa: E402
+
+STAGES = ("capture", "encode", "ocr", "translate", "render", "first", "total")
+IMAGE_SIZES = [(800, 160), (1600, 400), (1920, 1080), (3840, 2160)]
+TEXT_LENGTHS = [40, 400, 2000]
+
+
+def _text_of_length(length: int) -> str:
+    text, i = "", 0
+    while len(text) < length:
+        text += SAMPLE_LINES[i % len(SAMPLE_LINES)] + ("\n" if i % 2 else " ")
+        i += 1
+    return text[:length].strip()
+
+
+class _FakeShot:
+    """หน้าตาเหมือน mss.ScreenShot เท่าที่ main_app ใช้ (raw / width / height)"""
+
+    def __init__(self, raw: bytes, width: int, height: int):
+        self.raw = raw
+        self.width = width
+        self.height = height
+
+
+class _FakeMss:
+    frame = None
+    raw = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def close(self):
+        pass
+
+    def grab(self, monitor):
+        return _FakeShot(self.raw, self.frame.shape[1], self.frame.shape[0])
+
+
+class _StageTimer:
+    """ห่อฟังก์ชันเพื่อจับเวลาลงใน trace ปัจจุบัน"""
+
+    def __init__(self):
+        self.trace = {}
+        self.started = 0.0
+
+    def wrap(self, stage: str, fn):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.trace[stage] = self.trace.get(stage, 0.0) + (time.perf_counter() - start) * 1000
+        return wrapper
+
+
+def _percentiles(samples):
+    values = np.asarray(samples, dtype=np.float64)
+    return {
+        "p50": round(float(np.percentile(values, 50)), 3),
+        "p95": round(float(np.percentile(values, 95)), 3),
+        "p99": round(float(np.percentile(values, 99)), 3),
+        "mean": round(float(values.mean()), 3),
+    }
+
+
+def _setup(mock: MockCloudServer):
+    # ชี้ทุกอย่างไปที่ Mock และปิด Cache ทุกชั้น เพื่อวัดเส้นทางเต็มทุกครั้ง
+    settings.settings['cloud_endpoints'].update(vision=mock.endpoint, translate=mock.endpoint, anonymous=True)
+    settings.settings['translation_cache']['enabled'] = False
+    settings.settings['translation_memory']['enabled'] = False
+    settings.settings['ocr_cache']['enabled'] = False
+    settings.settings['tiled_ocr']['enabled'] = False
+    settings.settings['incremental_translate']['enabled'] = False
+    settings.settings['ocr']['backend'] = 'cloud'
+    # วัดโค้ด ไม่ใช่ Rate Limit ของ ApiGuard (ค่าเริ่มต้น Vision 5 req/s)
+    for name in ('vision', 'translate'):
+        settings.settings['api_limits'][name]['rate'] = 0
+
+    # pynput ต้องใช้ Keyboard/X Server จริง ไม่มีในโหมด offscreen และ Benchmark นี้ไม่ได้ใช้คีย์บอร์ดจริง
+    try:
+        import pynput  # noqa: F401
+    except Exception:
+        sys.modules['pynput'] = types.SimpleNamespace(keyboard=types.SimpleNamespace(GlobalHotKeys=None))
+
+    import main_app
+    import cloud_processor
+    import capture_service
+    main_app.HotkeyListener.start = lambda self: None
+    main_app.capture_service.close()
+    capture_service.mss.mss = _FakeMss
+    return main_app, cloud_processor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0, help="หน่วงเวลาฝั่ง Mock ต่อ Request (วินาที)")
+    parser.add_argument('--output', default="e2e_latency.json")
+    args = parser.parse_args()
+
+    mock = MockCloudServer(latency=args.latency).start()
+    main_app, cloud_processor = _setup(mock)
+
+    from PyQt6.QtCore import QEventLoop, QRect, QTimer
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    controller = main_app.MainController()
+    timer = _StageTimer()
+
+    # จับเวลาแต่ละขั้นโดยห่อฟังก์ชันที่ MainController / cloud_processor เรียกจริง
+    original_grab = _FakeMss.grab
+    _FakeMss.grab = timer.wrap("capture", original_grab)
+    pipeline = main_app.upload_pipeline
+    pipeline.run = timer.wrap("encode", pipeline.run)
+    cloud_processor.process_image_to_text = timer.wrap("ocr", cloud_processor.process_image_to_text)
+    cloud_processor.translate_incremental = timer.wrap("translate", cloud_processor.translate_incremental)
+
+    loop = QEventLoop()
+    timeout = QTimer()
+    timeout.setSingleShot(True)
+    timeout.timeout.connect(loop.quit)
+    show_result = controller.show_ocr_result
+
+    def show_and_paint(original, translated, *a, **kw):
+        start = time.perf_counter()
+        show_result(original, translated, *a, **kw)
+        controller.overlay_result_window.repaint()
+        if translated is None:
+            # แสดงต้นฉบับระหว่างรอคำแปล -> รอผลสุดท้ายต่อ
+            timer.trace["first"] = (time.perf_counter() - timer.started) * 1000
+            return
+        timer.trace["render"] = (time.perf_counter() - start) * 1000
+        timer.trace.setdefault("first", (time.perf_counter() - timer.started) * 1000)
+        loop.quit()
+
+    controller.show_ocr_result = show_and_paint
+    controller.show_ocr_error = lambda msg: (print(f"ERROR: {msg}"), loop.quit())
+
+    results = []
+    for width, height in IMAGE_SIZES:
+        _FakeMss.frame = render_text_frame(width, height, SAMPLE_LINES[:3], font_size=max(16, height // 12))
+        _FakeMss.raw = _FakeMss.frame.tobytes()
+        controller.saved_story_rect = QRect(0, 0, width, height)
+        for length in TEXT_LENGTHS:
+            text = _text_of_length(length)
+            mock.ocr = lambda image_data, text=text: text
+            samples = {stage: [] for stage in STAGES}
+            for run in range(args.runs + 1):
+                timer.trace = {}
+                start = timer.started = time.perf_counter()
+                controller.hotkey_thread.on_trigger_story_translate.emit()
+                timeout.start(10000)
+                loop.exec()
+                timeout.stop()
+                timer.trace["total"] = (time.perf_counter() - start) * 1000
+                if run == 0:
+                    continue   # รอบแรกเป็น Warm-up (เปิด Connection / โหลด Plugin)
+                for stage in STAGES:
+                    samples[stage].append(timer.trace.get(stage, 0.0))
+
+            row = {"image": f"{width}x{height}", "text_chars": len(text),
+                   "stages": {stage: _percentiles(values) for stage, values in samples.items()}}
+            results.append(row)
+            summary = "  ".join(f"{stage} {row['stages'][stage]['p50']:7.2f}" for stage in STAGES)
+            print(f"{row['image']:>10} {len(text):>5} chars | p50 ms: {summary}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec='seconds'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": args.runs,
+            "mock_latency_s": args.latency,
+            "image_encoding": settings.settings['image_encoding'],
+            "preprocess": settings.settings['preprocess'],
+        },
+        "results": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"บันทึกผลที่ {args.output}")
+
+    controller.cloud_pool.shutdown()
+    mock.stop()
+
+
+if __name__ == '__main__':
+    main()
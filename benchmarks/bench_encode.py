@@ -0,0 +1,84 @@
+"""
+Benchmark การเข้ารหัสภาพก่อนส่ง Cloud Vision: เวลา Encode, ขนาด Payload และความแม่นยำ OCR
+เทียบ mss.tools.to_png แบบเดิม กับ ImageEncoder แต่ละรูปแบบ บนชุดภาพตัวอย่างคงที่
+
+วิธีใช้:
+    python benchmarks/bench_encode.py                # ความแม่นยำจาก Mock Server (ไม่ต้องมี key.json)
+    python benchmarks/bench_encode.py --ocr vision   # เรียก Cloud Vision จริง (ต้องมี key.json)
+    python benchmarks/bench_encode.py --ocr off      # วัดเฉพาะเวลา/ขนาด
+
+--ocr mock ใช้แบบจำลองความอ่านออกเดียวกับ bench_preprocess (samples.LegibilityOcr)
+    จับ Payload ที่ทำให้แถวข้อความหายหรือคอนทราสต์ตก แต่ไม่เห็น Artifact ระดับตัวอักษรของ JPEG
+"""
+import argparse
+import difflib
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mss.tools  # noqa: E402
+import settings  # noqa: E402
+from image_pipeline import ImageEncoder  # noqa: E402
+from samples import LegibilityOcr, load_samples  # noqa: E402
+
+
+def _legacy_png(frame):
+    # เส้นทางเดิม: สร้าง RGB bytes แล้วใช้ PNG encoder ของ mss
+    rgb = frame[:, :, [2, 1, 0]].tobytes()
+    return mss.tools.to_png(rgb, (frame.shape[1], frame.shape[0]))
+
+
+def _variants():
+    yield "mss.to_png (เดิม)", _legacy_png
+    for level in (1, 6):
+        yield f"png level={level}", ImageEncoder('png', png_level=level).encode
+        yield f"png_gray level={level}", ImageEncoder('png_gray', png_level=level).encode
+    for quality in (75, 90):
+        yield f"jpeg q={quality}", ImageEncoder('jpeg', jpeg_quality=quality).encode
+
+
+def _accuracy(image_bytes: bytes, expected: str):
+    from cloud_processor import process_image_to_text
+    text = process_image_to_text(image_bytes) or ""
+    return difflib.SequenceMatcher(None, " ".join(text.split()), " ".join(expected.split())).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--ocr', default='mock', choices=('mock', 'vision', 'off'),
+                        help="วัดความแม่นยำ OCR: mock (ค่าเริ่มต้น ไม่ต้องมี key.json), vision (Cloud Vision จริง) หรือ off")
+    args = parser.parse_args()
+
+    mock = legibility = None
+    if args.ocr == 'mock':
+        from mock_cloud_server import MockCloudServer
+        legibility = LegibilityOcr()
+        mock = MockCloudServer(ocr=legibility).start()
+        settings.settings['cloud_endpoints'].update(vision=mock.endpoint, translate=mock.endpoint, anonymous=True)
+        settings.settings['ocr']['backend'] = 'cloud'
+
+    samples = load_samples()
+    print(f"{'sample':<15}{'encoder':<24}{'encode ms':>10}{'bytes':>12}{'ocr':>8}")
+    for name, frame, expected in samples:
+        if legibility is not None:
+            legibility.expected = expected
+        for label, encode in _variants():
+            times = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                payload = encode(frame)
+                times.append((time.perf_counter() - start) * 1000)
+            accuracy = f"{_accuracy(payload, expected):.3f}" if args.ocr != 'off' else "-"
+            print(f"{name:<15}{label:<24}{statistics.median(times):>10.2f}{len(payload):>12,}{accuracy:>8}")
+        print()
+
+    if mock is not None:
+        mock.stop()
+
+
+if __name__ == '__main__':
+    main()
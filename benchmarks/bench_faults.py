@@ -0,0 +1,152 @@
+"""
+ตรวจ Rate Limit / Retry / Circuit Breaker (api_guard.py) กับ Mock Server ที่จำลอง Error
+ไม่ต้องใช้ key.json หรือ Network ตรวจจำนวน Request ที่ถึง Server และสถานะ Circuit ทุกขั้น
+(Retry -> เปิด Circuit -> half-open ล้มเหลว -> กลับมาปกติ) จบด้วย exit code 1 ถ้าพฤติกรรมไม่เป็นไปตามที่คาด
+
+วิธีใช้:
+    python benchmarks/bench_faults.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import settings  # noqa: E402
+from mock_cloud_server import MockCloudServer  # noqa: E402
+
+IMAGE = "Hello traveler.".encode("utf-8")   # default_ocr ของ Mock อ่าน bytes เป็นข้อความตรงๆ
+
+
+def _guard(cloud_processor, name, rate=0, burst=1, failure_threshold=3, reset_seconds=0.5):
+    from api_guard import ApiGuard, CircuitBreaker, TokenBucket
+    guard = ApiGuard(name, TokenBucket(rate, burst), CircuitBreaker(failure_threshold, reset_seconds),
+                     transient_errors=cloud_processor.TRANSIENT_ERRORS, max_attempts=3,
+                     base_delay=0.02, max_delay=0.1, max_wait=5.0)
+    cloud_processor.api_guards[name] = guard
+    return guard
+
+
+def _check(label: str, ok: bool, detail: str) -> bool:
+    print(f"[{'PASS' if ok else 'FAIL'}] {label}: {detail}")
+    return ok
+
+
+def _expect_open(cloud_processor, CircuitOpenError) -> bool:
+    try:
+        cloud_processor.cloud_vision_ocr(IMAGE)
+    except CircuitOpenError as e:
+        print(f"       ข้อความบน Overlay: {e}")
+        return True
+    return False
+
+
+def run_checks(mock, cloud_processor) -> list:
+    from api_guard import CircuitOpenError
+    results = []
+
+    # 1. Error ชั่วคราว 2 ครั้ง -> Retry แล้วสำเร็จ (ยิง 3 Request พอดี)
+    guard = _guard(cloud_processor, 'vision')
+    sent = mock.counts['vision']
+    mock.fail_next('vision', 2, 503)
+    text = cloud_processor.cloud_vision_ocr(IMAGE)
+    sent = mock.counts['vision'] - sent
+    results.append(_check("retry 503", text == IMAGE.decode() and guard.retries == 2 and sent == 3
+                          and guard.failures == 0 and guard.breaker.state == 'closed',
+                          f"text={text!r} retries={guard.retries} requests={sent} state={guard.breaker.state}"))
+
+    # 2. 429 จาก Server -> Retry ด้วย Backoff
+    guard = _guard(cloud_processor, 'translate')
+    sent = mock.counts['translate']
+    mock.fail_next('translate', 1, 429)
+    translated = cloud_processor.translate_content("Good morning.", use_cache=False)
+    sent = mock.counts['translate'] - sent
+    results.append(_check("retry 429", translated == "[th] Good morning." and guard.retries == 1 and sent == 2,
+                          f"translated={translated!r} retries={guard.retries} requests={sent}"))
+
+    # 3. Backend ล่มถาวร -> ล้มเหลว (หลัง Retry ครบ) 3 ครั้งติดกันจึงเปิด Circuit แล้วล้มเหลวทันทีโดยไม่ยิง Request
+    guard = _guard(cloud_processor, 'vision', failure_threshold=3, reset_seconds=0.5)
+    mock.error_rate = 1.0
+    sent = mock.counts['vision']
+    texts, states = [], []
+    for _ in range(3):
+        texts.append(cloud_processor.cloud_vision_ocr(IMAGE))
+        states.append(guard.breaker.state)
+    sent = mock.counts['vision'] - sent
+    results.append(_check("circuit opens at threshold", texts == [None] * 3 and sent == 9
+                          and states == ['closed', 'closed', 'open'],
+                          f"states={states} requests={sent} (3 ครั้ง x 3 attempts)"))
+    sent = mock.counts['vision']
+    start = time.perf_counter()
+    fast_fail = _expect_open(cloud_processor, CircuitOpenError)
+    elapsed = (time.perf_counter() - start) * 1000
+    results.append(_check("circuit open", fast_fail and mock.counts['vision'] == sent and guard.rejected == 1,
+                          f"state={guard.breaker.state} fail-fast={elapsed:.2f} ms rejected={guard.rejected}"))
+
+    # 4. ครบเวลาแต่ Backend ยังล่ม -> half-open ลอง 1 ครั้งแล้วเปิดต่อทันที
+    time.sleep(0.6)
+    sent = mock.counts['vision']
+    text = cloud_processor.cloud_vision_ocr(IMAGE)
+    reopened = guard.breaker.state == 'open'
+    results.append(_check("half-open probe fails", text is None and reopened and mock.counts['vision'] - sent == 3
+                          and _expect_open(cloud_processor, CircuitOpenError),
+                          f"state={guard.breaker.state} requests={mock.counts['vision'] - sent}"))
+
+    # 5. Backend กลับมา -> half-open ผ่าน แล้วปิด Circuit (Request ถัดไปผ่านตามปกติ)
+    mock.error_rate = 0.0
+    time.sleep(0.6)
+    sent = mock.counts['vision']
+    texts = [cloud_processor.cloud_vision_ocr(IMAGE) for _ in range(2)]
+    results.append(_check("circuit recovers", texts == [IMAGE.decode()] * 2 and guard.breaker.state == 'closed'
+                          and mock.counts['vision'] - sent == 2,
+                          f"state={guard.breaker.state} requests={mock.counts['vision'] - sent}"))
+    return results
+
+
+def run_rate_limit(cloud_processor) -> list:
+    # Server จำกัด 5 req/s: ยิง 15 ครั้งติดกัน โดยมี / ไม่มี Token Bucket ฝั่ง Client
+    results = []
+    with MockCloudServer(rate_limit=5) as mock:
+        cloud_processor.client_manager = cloud_processor.CloudClientManager(
+            client_options={'vision': {'api_endpoint': mock.endpoint}, 'translate': {'api_endpoint': mock.endpoint}},
+            vision_transport='rest', anonymous=True)
+        for label, rate in (("no client limit", 0), ("client limit 4/s", 4)):
+            time.sleep(1.2)   # ให้ Bucket ของ Mock เต็มก่อนเริ่ม
+            mock.counts.clear()
+            guard = _guard(cloud_processor, 'vision', rate=rate, burst=4, failure_threshold=100)
+            guard.max_attempts = 1
+            start = time.perf_counter()
+            ok = sum(cloud_processor.cloud_vision_ocr(IMAGE) is not None for _ in range(15))
+            elapsed = time.perf_counter() - start
+            rejected = mock.counts['vision_error_429']
+            print(f"       {label:<18} สำเร็จ {ok}/15  429 จาก Server = {rejected}  ใช้เวลา {elapsed:.2f}s")
+            if rate:
+                # Burst 4 แล้วได้ Token ละ 0.25s -> 11 ครั้งที่เหลือต้องรออย่างน้อย ~2.75s
+                results.append(_check("token bucket", rejected == 0 and ok == 15 and elapsed >= 2.5,
+                                      f"ไม่โดน 429 เมื่อจำกัดอัตราฝั่ง Client (429={rejected}, {elapsed:.2f}s)"))
+            else:
+                results.append(_check("server limit reproduced", rejected > 0 and ok + rejected == 15,
+                                      f"ไม่จำกัดฝั่ง Client ต้องโดน 429 (429={rejected})"))
+    return results
+
+
+def main():
+    mock = MockCloudServer().start()
+    settings.settings['cloud_endpoints'].update(vision=mock.endpoint, translate=mock.endpoint, anonymous=True)
+    settings.settings['translation_cache']['enabled'] = False
+    settings.settings['translation_memory']['enabled'] = False
+    import cloud_processor
+
+    try:
+        results = run_checks(mock, cloud_processor)
+    finally:
+        mock.stop()
+    results += run_rate_limit(cloud_processor)
+
+    failed = results.count(False)
+    print(f"{'FAILED' if failed else 'OK'}: ผ่าน {len(results) - failed}/{len(results)} รายการ")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
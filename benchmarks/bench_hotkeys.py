@@ -0,0 +1,75 @@
+"""
+ตรวจการกรองคีย์ลัดรัวๆ (HotkeyGate) และวัด CPU ขณะ HotkeyListener รออยู่เฉยๆ
+
+1. จำลองการกดคีย์ลัดติดกันหลายครั้ง (เหมือนกดค้าง / กดรัว) แล้วนับว่าทำงานจริงกี่ครั้ง
+2. เปิด HotkeyListener ทิ้งไว้ --idle วินาที แล้ววัดเวลา CPU ของ Process เทียบกับเวลาจริง
+   (ต้องมี Display และ pynput ถ้าไม่มีจะข้ามส่วนนี้)
+
+วิธีใช้:
+    python benchmarks/bench_hotkeys.py --presses 20 --interval 30 --idle 10
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hotkey_listener import HotkeyGate  # noqa: E402
+
+
+def _burst(label: str, presses: int, interval: float, **limits):
+    fired = []
+    gate = HotkeyGate(lambda: fired.append(time.perf_counter()), **limits)
+    start = time.perf_counter()
+    for _ in range(presses):
+        gate.press()
+        time.sleep(interval)
+    time.sleep(limits.get('debounce_ms', 0) / 1000.0 + 0.05)   # รอ Timer ของ debounce
+    delays = ", ".join(f"{(t - start) * 1000:.0f}" for t in fired)
+    stats = gate.stats()
+    print(f"{label:<22} กด {stats['presses']:>3} ครั้ง -> ทำงาน {stats['fired']:>2} ครั้ง "
+          f"(ตัดทิ้ง {stats['coalesced']})  เวลาที่ทำงาน: [{delays}] ms")
+
+
+def _idle_cpu(seconds: float) -> bool:
+    try:
+        import pynput.keyboard  # noqa: F401  (ไม่มี Display จะ import ไม่ผ่าน)
+        from PyQt6.QtCore import QCoreApplication
+        from hotkey_listener import HotkeyListener
+        app = QCoreApplication.instance() or QCoreApplication(sys.argv)  # noqa: F841
+        listener = HotkeyListener()
+        listener.start()
+        time.sleep(1.0)   # ให้ pynput เชื่อมต่อ Display ให้เสร็จก่อน
+        if listener.isFinished():
+            raise RuntimeError("HotkeyListener หยุดทำงานทันที")
+    except Exception as e:
+        print(f"ข้ามการวัด CPU: เปิด HotkeyListener ไม่ได้ ({type(e).__name__}: {e})")
+        return False
+
+    cpu, wall = time.process_time(), time.perf_counter()
+    time.sleep(seconds)
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    print(f"HotkeyListener ว่าง {wall:.1f}s: CPU {cpu * 1000:.1f} ms ({cpu / wall * 100:.2f}% ของ 1 Core)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--presses', type=int, default=20)
+    parser.add_argument('--interval', type=float, default=30, help="ระยะห่างระหว่างการกด (ms)")
+    parser.add_argument('--idle', type=float, default=10, help="เวลาที่วัด CPU ขณะรอ (วินาที, 0 = ข้าม)")
+    args = parser.parse_args()
+
+    interval = args.interval / 1000.0
+    _burst("ไม่กรอง", args.presses, interval)
+    _burst("throttle 300 ms", args.presses, interval, throttle_ms=300)
+    _burst("debounce 150 ms", args.presses, interval, debounce_ms=150)
+
+    if args.idle > 0:
+        _idle_cpu(args.idle)
+    os._exit(0)   # Thread ของ pynput ไม่มีทางสั่งหยุดจากภายนอก
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark Translation Memory (translation_memory.py): ความเร็วในการค้นหาเมื่อมีหลายหมื่นรายการ
+และความแม่นยำกับข้อความที่ OCR อ่านคลาดเคลื่อน
+
+สร้างประโยคสุ่ม --entries รายการ แล้วค้นหาด้วย
+    noisy     : ประโยคเดิมที่ถูกทำให้เพี้ยนแบบ OCR 1 จุด (l/I, ช่องว่างหาย, m/rn, ตัวอักษรผิด 1 ตัวในคำยาว) -> ควรเจอ
+    unrelated : ประโยคใหม่ที่ไม่เคยจำ -> ไม่ควรเจอ
+    numbers   : ประโยคเดิมแต่ตัวเลขเปลี่ยน -> ไม่ควรเจอ
+    meaning   : ประโยคเดิมที่ความหมายเปลี่ยน (เติม not, ลบคำ 1 คำ, เปลี่ยนเครื่องหมายท้ายประโยค) -> ไม่ควรเจอ
+
+วิธีใช้:
+    python benchmarks/bench_memory.py --entries 30000 --queries 2000
+"""
+import os
+import sys
+import random
+import argparse
+import tempfile
+import statistics
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translation_memory import TranslationMemory  # noqa: E402
+
+WORDS = ("the of and to in is you that it he was for on are as with his they at be this have from or one had "
+         "by word but not what all were we when your can said there use an each which she do how their if will "
+         "up other about out many then them these so some her would make like him into time has look two more "
+         "write go see number no way could people my than first water been call who oil its now find long down "
+         "day did get come made may part lighthouse keeper traveler ancient sword village dragon castle quest "
+         "merchant potion shield forest river mountain king queen knight village gold silver key door").split()
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(5, 14))]
+    if rng.random() < 0.3:
+        words.insert(rng.randrange(len(words)), str(rng.randint(2, 500)))
+    return " ".join(words).capitalize() + rng.choice(".!?")
+
+
+def _ocr_noise(text: str, rng: random.Random) -> str:
+    kind = rng.randrange(4)
+    if kind == 0 and 'l' in text:
+        i = rng.choice([i for i, c in enumerate(text) if c == 'l'])
+        return text[:i] + 'I' + text[i + 1:]
+    if kind == 1 and ' ' in text:
+        i = rng.choice([i for i, c in enumerate(text) if c == ' '])
+        return text[:i] + text[i + 1:]
+    if kind == 2 and 'm' in text:
+        i = rng.choice([i for i, c in enumerate(text) if c == 'm'])
+        return text[:i] + 'rn' + text[i + 1:]
+    # ตัวอักษรผิด 1 ตัว ในคำที่ยาวอย่างน้อย 4 ตัว
+    letters = [i for i, c in enumerate(text) if c.isalpha() and len(_word_at(text, i)) >= 4]
+    if not letters:
+        return text
+    i = rng.choice(letters)
+    return text[:i] + rng.choice('abcdefghijklmnopqrstuvwxyz') + text[i + 1:]
+
+
+def _word_at(text: str, i: int) -> str:
+    start = text.rfind(' ', 0, i) + 1
+    end = text.find(' ', i)
+    return text[start:end if end >= 0 else len(text)].strip('.!?')
+
+
+def _change_meaning(text: str, rng: random.Random) -> str:
+    words = text[:-1].split(' ')
+    kind = rng.randrange(3)
+    if kind == 0 and 'not' not in words:
+        words.insert(rng.randrange(1, len(words) + 1), 'not')
+        return ' '.join(words) + text[-1]
+    if kind == 1 and len(words) > 5:
+        del words[rng.randrange(1, len(words))]
+        return ' '.join(words) + text[-1]
+    return text[:-1] + rng.choice([mark for mark in '.!?' if mark != text[-1]])
+
+
+def _change_numbers(text: str) -> str:
+    return " ".join(str(int(w) + 1) if w.isdigit() else w for w in text.split(" "))
+
+
+def _lookups(memory, queries, expected=None):
+    times, correct, found = [], 0, 0
+    for i, text in enumerate(queries):
+        start = time.perf_counter()
+        result = memory.get(text, 'en', 'th')
+        times.append((time.perf_counter() - start) * 1e6)
+        if result is not None:
+            found += 1
+            correct += expected is not None and result == expected[i]
+    times.sort()
+    return found, correct, statistics.median(times), times[int(len(times) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, default=30000)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    sources = list(dict.fromkeys(_sentence(rng) for _ in range(args.entries)))
+    translations = [f"[th] {text}" for text in sources]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'memory.sqlite3')
+        memory = TranslationMemory(db_path, max_entries=len(sources))
+        start = time.perf_counter()
+        memory.put_many(zip(sources, ['en'] * len(sources), ['th'] * len(sources), translations))
+        print(f"จำ {len(sources)} รายการ: {time.perf_counter() - start:.2f}s")
+        memory.close()
+
+        # เปิดใหม่ (เหมือนเปิดโปรแกรมครั้งถัดไป) -> โหลดลายเซ็นจากไฟล์
+        memory = TranslationMemory(db_path, max_entries=len(sources))
+        start = time.perf_counter()
+        memory.stats() and memory.get("warm up the index please", 'en', 'th')
+        print(f"โหลดจากไฟล์: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        picks = rng.sample(range(len(sources)), min(args.queries, len(sources)))
+        noisy = [_ocr_noise(sources[i], rng) for i in picks]
+        expected = [translations[i] for i in picks]
+        unrelated = [_sentence(random.Random(10_000 + i)) for i in range(args.queries)]
+        unrelated = [text for text in unrelated if text not in set(sources)]
+        with_numbers = [sources[i] for i in range(len(sources)) if any(c.isdigit() for c in sources[i])]
+        numbers = [_change_numbers(text) for text in with_numbers[:args.queries]]
+        # ประโยคที่เปลี่ยนแล้วบังเอิญตรงกับประโยคอื่นที่จำไว้ ไม่นับ
+        meaning = [_change_meaning(sources[i], rng) for i in picks]
+        meaning = [text for text in meaning if text not in set(sources)]
+
+        for label, queries, answers in (("noisy", noisy, expected), ("unrelated", unrelated, None),
+                                        ("numbers", numbers, None), ("meaning", meaning, None)):
+            found, correct, p50, p99 = _lookups(memory, queries, answers)
+            detail = f"ถูก {correct}" if answers else "ควรเป็น 0"
+            print(f"{label:<10} {len(queries):>5} ครั้ง  เจอ {found:>5} ({detail})  p50={p50:6.1f} µs  p99={p99:7.1f} µs")
+        print(memory.stats())
+        memory.close()
+
+
+if __name__ == "__main__":
+    main()
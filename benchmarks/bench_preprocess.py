@@ -0,0 +1,95 @@
+"""
+Benchmark ขั้นตอน Preprocess ก่อน OCR: ขนาด Payload, เวลา และ (ถ้าเลือก) ความแม่นยำ OCR
+เทียบภาพดิบกับ Preprocess แต่ละแบบ บนชุดภาพตัวอย่างคงที่ (benchmarks/samples.py)
+
+วิธีใช้:
+    python benchmarks/bench_preprocess.py
+    python benchmarks/bench_preprocess.py --ocr          # ตรวจความแม่นยำกับ Mock Server (ไม่ต้องมี key.json)
+    python benchmarks/bench_preprocess.py --ocr vision   # ตรวจกับ Cloud Vision จริง (ต้องมี key.json)
+
+--ocr (mock): Mock Server "อ่าน" ภาพด้วยแบบจำลองความอ่านออกที่ตายตัว แทนการอ่านตัวอักษรจริง
+    แต่ละบรรทัดของเฉลยจะถูกอ่านออก ก็ต่อเมื่อในภาพที่ส่งไปยังเห็นเป็นแถวข้อความแยกกันครบทุกบรรทัด
+    สูงอย่างน้อย MIN_ROW_HEIGHT พิกเซล และตัวอักษรต่างจากพื้นอย่างน้อย MIN_CONTRAST (ดู samples.py)
+    จับความผิดพลาดที่ Preprocess ทำให้เกิดได้ (ตัดบรรทัดทิ้ง, ย่อจนตัวเล็กเกินไป, คอนทราสต์หาย, บรรทัดติดกัน)
+    แต่ไม่เห็นรายละเอียดระดับตัวอักษร (เช่น ตัวอักษรแตกจาก Binarize) ซึ่งต้องตรวจด้วย --ocr vision
+
+เมื่อใช้ --ocr สคริปต์จะจบด้วย exit code 1 ถ้าแบบใดแม่นยำน้อยกว่าภาพดิบเกิน --tolerance
+"""
+import argparse
+import difflib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import settings  # noqa: E402
+from image_pipeline import ImageEncoder, ImagePreprocessor  # noqa: E402
+from samples import LegibilityOcr, load_samples  # noqa: E402
+
+VARIANTS = {
+    "raw": ImagePreprocessor(enabled=False),
+    "trim+gray": ImagePreprocessor(target_text_height=0),
+    "trim+gray+scale32": ImagePreprocessor(target_text_height=32),
+    "scale24+contrast": ImagePreprocessor(target_text_height=24, contrast=True),
+    "scale32+binarize": ImagePreprocessor(target_text_height=32, binarize=True),
+}
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ocr', nargs='?', const='mock', choices=('mock', 'vision'),
+                        help="วัดความแม่นยำ OCR: mock (ค่าเริ่มต้น ไม่ต้องมี key.json) หรือ vision (Cloud Vision จริง)")
+    parser.add_argument('--tolerance', type=float, default=0.01)
+    args = parser.parse_args()
+
+    mock = legibility = None
+    if args.ocr == 'mock':
+        from mock_cloud_server import MockCloudServer
+        legibility = LegibilityOcr()
+        mock = MockCloudServer(ocr=legibility).start()
+        settings.settings['cloud_endpoints'].update(vision=mock.endpoint, translate=mock.endpoint, anonymous=True)
+        settings.settings['ocr']['backend'] = 'cloud'
+    if args.ocr:
+        from cloud_processor import process_image_to_text
+
+    encoder = ImageEncoder('png', png_level=1)
+    regressions = []
+    print(f"{'sample':<15}{'variant':<20}{'size':>12}{'bytes':>10}{'ms':>8}{'ocr':>8}")
+    for name, frame, expected in load_samples():
+        if legibility is not None:
+            legibility.expected = expected
+        baseline = None
+        for label, preprocessor in VARIANTS.items():
+            start = time.perf_counter()
+            processed = preprocessor.process(frame)
+            payload = encoder.encode(processed)
+            elapsed = (time.perf_counter() - start) * 1000
+
+            accuracy = None
+            if args.ocr:
+                text = process_image_to_text(payload) or ""
+                accuracy = difflib.SequenceMatcher(None, _normalize(text), _normalize(expected)).ratio()
+                if baseline is None:
+                    baseline = accuracy
+                elif accuracy < baseline - args.tolerance:
+                    regressions.append((name, label, baseline, accuracy))
+
+            size = f"{processed.shape[1]}x{processed.shape[0]}"
+            shown = f"{accuracy:.3f}" if accuracy is not None else "-"
+            print(f"{name:<15}{label:<20}{size:>12}{len(payload):>10,}{elapsed:>8.1f}{shown:>8}")
+        print()
+
+    if mock is not None:
+        mock.stop()
+    for name, label, baseline, accuracy in regressions:
+        print(f"REGRESSION: {name} / {label}: {accuracy:.3f} < raw {baseline:.3f}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark เวลาเปิดโปรแกรม (Cold Start): จากเริ่ม Process จนหน้าต่างหลักวาดเสร็จ
+
+รันโปรแกรมใน Process ใหม่ทุกรอบ (Qt platform 'offscreen', ชี้ Cloud ไปที่ Mock Server) แล้วเทียบ:
+    lazy  : แบบปัจจุบัน โหลด cloud_processor ใน Background หลังหน้าต่างขึ้น
+    eager : import cloud_processor ก่อนสร้างหน้าต่าง (เหมือนเวอร์ชันก่อน)
+รายงาน
+    window : เวลาจนหน้าต่างหลักวาดเสร็จ
+    cloud  : เวลาจน cloud_processor พร้อมใช้
+    wait   : ถ้ากดคีย์ลัดทันทีที่หน้าต่างขึ้น งานแรกต้องรอโหลดนานเท่าไร
+
+วิธีใช้:
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --importtime     # แสดงโมดูลที่ import ช้าที่สุดตอนเปิดโปรแกรม
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def _child(endpoint: str, eager: bool):
+    """ทำงานใน Process ลูก: เปิดหน้าต่างหลัก แล้วพิมพ์เวลาต่างๆ (วินาทีแบบ time.time()) เป็น JSON"""
+    import settings
+    settings.settings['cloud_endpoints'].update(vision=endpoint, translate=endpoint, anonymous=True)
+    if eager:
+        import cloud_processor  # noqa: F401
+
+    from PyQt6.QtWidgets import QApplication
+    import main_app
+    main_app.HotkeyListener.start = lambda self: None   # ไม่มีคีย์บอร์ด/X Server จริงในโหมด offscreen
+
+    app = QApplication(sys.argv)
+    controller = main_app.MainController()
+    controller.show()
+    app.processEvents()
+    window = time.time()
+
+    main_app.cloud_warmup.start()   # เหมือน QTimer.singleShot(0, ...) ใน main_app
+    start = time.perf_counter()
+    main_app.cloud_warmup.result()  # กรณีแย่สุด: กดคีย์ลัดทันทีที่หน้าต่างขึ้น
+    wait_ms = (time.perf_counter() - start) * 1000
+    print(json.dumps({'window': window, 'cloud': time.time(), 'wait_ms': wait_ms}))
+    sys.stdout.flush()
+    os._exit(0)   # ไม่รอ Thread ของ Prewarm
+
+
+def _run(endpoint: str, eager: bool) -> dict:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    cmd = [sys.executable, os.path.abspath(__file__), '--child', endpoint] + (['--eager'] if eager else [])
+    launched = time.time()
+    out = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True, timeout=120).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    return {
+        'window': (result['window'] - launched) * 1000,
+        'cloud': (result['cloud'] - launched) * 1000,
+        'wait': result['wait_ms'],
+    }
+
+
+def _importtime(top: int):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    err = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main_app'],
+                         cwd=ROOT, env=env, capture_output=True, text=True, timeout=120).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative), name.rstrip()))
+    print(f"import main_app: โมดูลที่ใช้เวลารวมมากที่สุด {top} อันดับ (ms)")
+    for cumulative, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative / 1000:8.1f}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--importtime', action='store_true')
+    parser.add_argument('--child', metavar='ENDPOINT', help=argparse.SUPPRESS)
+    parser.add_argument('--eager', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child, args.eager)
+    if args.importtime:
+        _importtime(15)
+        return
+
+    from mock_cloud_server import MockCloudServer
+    mock = MockCloudServer().start()
+    _run(mock.endpoint, eager=False)   # รอบแรกทิ้ง (ให้ไฟล์อยู่ใน Disk Cache ของ OS)
+    for label, eager in (("lazy", False), ("eager", True)):
+        runs = [_run(mock.endpoint, eager) for _ in range(args.runs)]
+        print(f"{label:<6} " + "  ".join(f"{key} p50={statistics.median(r[key] for r in runs):7.1f} ms"
+                                         for key in ('window', 'cloud', 'wait')))
+    mock.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark การ OCR พื้นที่ใหญ่แบบแบ่งแถบ (TiledOcr) เทียบกับส่งทั้งภาพทุกครั้ง
+จำลอง Quest Log / แชท ที่เปลี่ยนทีละบรรทัด แล้ววัดขนาด Payload ที่ส่ง Vision และเวลา (ยิงไปที่ Mock Server)
+
+วิธีใช้:
+    python benchmarks/bench_tiles.py --updates 10 --latency 0.05
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import settings  # noqa: E402
+from mock_cloud_server import MockCloudServer  # noqa: E402
+from samples import render_text_frame, SAMPLE_LINES  # noqa: E402
+
+WIDTH, HEIGHT, LINES = 1200, 1200, 24
+
+
+def _log_lines(offset: int):
+    # บรรทัดที่ offset จะเปลี่ยนทุกรอบ (เหมือนมีข้อความใหม่เข้ามา) ที่เหลือคงเดิม
+    lines = [f"{i:02d} {SAMPLE_LINES[i % len(SAMPLE_LINES)]}" for i in range(LINES)]
+    lines[-1] = f"{LINES - 1:02d} New message #{offset}"
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--updates', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.05, help="หน่วงเวลาฝั่ง Mock ต่อ Request (วินาที)")
+    args = parser.parse_args()
+
+    mock = MockCloudServer(latency=args.latency, ocr=lambda data: f"text {len(data)}").start()
+    settings.settings['cloud_endpoints'].update(vision=mock.endpoint, translate=mock.endpoint, anonymous=True)
+    # วัดโค้ด ไม่ใช่ Rate Limit ของ ApiGuard (ค่าเริ่มต้น Vision 5 req/s)
+    for name in ('vision', 'translate'):
+        settings.settings['api_limits'][name]['rate'] = 0
+
+    import cloud_processor
+    from api_guard import create_api_guard
+    from cloud_processor import process_images_to_text
+    from image_pipeline import create_image_pipeline
+    from tiled_ocr import TiledOcr
+
+    def reset_state():
+        # ทุกแบบเริ่มจากสถานะเดียวกัน: ApiGuard ใหม่ (Bucket เต็ม / Circuit ปิด) และ Connection ที่เปิดไว้แล้ว
+        for name in cloud_processor.api_guards:
+            cloud_processor.api_guards[name] = create_api_guard(name, cloud_processor.TRANSIENT_ERRORS)
+        process_images_to_text([b"warm up"])
+        mock.counts.clear()
+
+    pipeline = create_image_pipeline()
+    tiled = TiledOcr(pipeline, process_images_to_text, min_height=0)
+    frames = [render_text_frame(WIDTH, HEIGHT, _log_lines(i), font_size=18) for i in range(args.updates + 1)]
+    print(f"{WIDTH}x{HEIGHT}, {LINES} บรรทัด, แถบละ ~{tiled.band_height}px -> {len(tiled.plan_tiles(frames[0]))} แถบ")
+
+    # แบบเดิม: encode + OCR ทั้งภาพทุกครั้ง
+    reset_state()
+    full_ms, full_bytes = [], []
+    for frame in frames[1:]:
+        start = time.perf_counter()
+        payload = pipeline.run(frame)
+        process_images_to_text([payload])
+        full_ms.append((time.perf_counter() - start) * 1000)
+        full_bytes.append(len(payload))
+
+    full_requests = mock.counts['vision']
+
+    # แบบแบ่งแถบ: รอบแรกส่งทุกแถบ (ไม่จับเวลา) รอบต่อไปส่งเฉพาะแถบที่เปลี่ยน
+    reset_state()
+    tiled.recognize(frames[0])
+    mock.counts.clear()
+    tiled_ms = []
+    before = tiled.stats()
+    for frame in frames[1:]:
+        start = time.perf_counter()
+        tiled.recognize(frame)
+        tiled_ms.append((time.perf_counter() - start) * 1000)
+    after = tiled.stats()
+    tiled_bytes = (after['bytes_sent'] - before['bytes_sent']) / args.updates
+    recognized = (after['recognized'] - before['recognized']) / args.updates
+
+    print(f"{'ทั้งภาพ':<12} p50={statistics.median(full_ms):7.2f} ms  payload={statistics.mean(full_bytes):9.0f} B  "
+          f"(Vision {full_requests} Request)")
+    print(f"{'แบ่งแถบ':<12} p50={statistics.median(tiled_ms):7.2f} ms  payload={tiled_bytes:9.0f} B  "
+          f"(OCR {recognized:.1f} แถบ/รอบ, Vision {mock.counts['vision']} Request)")
+    mock.stop()
+
+
+if __name__ == "__main__":
+    main()
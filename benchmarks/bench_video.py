@@ -0,0 +1,164 @@
+"""
+Benchmark โหมดดึงคำบรรยายจากวิดีโอ (video_subtitles.py) กับ Mock Server (ต้องมี ffmpeg)
+
+สร้างวิดีโอทดสอบที่ฉากหลังขยับตลอดเวลา และมีคำบรรยายตามตาราง SCHEDULE แล้วตรวจว่า
+    - OCR เฉพาะคำบรรยายที่ต่างกัน (จำนวนครั้งที่เรียก Vision เทียบกับจำนวนเฟรมที่ตรวจ)
+    - เวลาเริ่ม / จบของแต่ละ Cue คลาดจากเฉลยไม่เกิน 1/fps วินาที
+    - หน่วยความจำสูงสุด (tracemalloc) ไม่เพิ่มตามความยาววิดีโอ (วิดีโอเดิมต่อกัน --loops รอบ)
+
+วิธีใช้:
+    python benchmarks/bench_video.py --loops 20
+    python benchmarks/bench_video.py --ffmpeg C:\\ffmpeg\\bin\\ffmpeg.exe
+"""
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import settings  # noqa: E402
+from samples import render_text_frame  # noqa: E402
+
+WIDTH, HEIGHT, FPS, SECONDS = 640, 360, 25, 20
+LINES = [
+    "Hi.",
+    "Where are you going now?",
+    "The lighthouse keeper is waiting by the sea tonight.",
+    "Run!",
+    "We should rest here until the storm passes over us.",
+]
+# (เริ่ม, จบ, บรรทัด) ช่วงที่ติดกันและเป็นบรรทัดเดียวกันต้องออกมาเป็น Cue เดียว
+SCHEDULE = [(1.0, 3.0, 0), (3.0, 6.2, 1), (7.0, 10.0, 2), (10.5, 11.3, 3), (12.0, 16.0, 4), (16.0, 18.0, 4)]
+EXPECTED = [(1.0, 3.0, 0), (3.0, 6.2, 1), (7.0, 10.0, 2), (10.5, 11.3, 3), (12.0, 18.0, 4)]
+
+
+def _text_aspect(frame: np.ndarray) -> float:
+    # สัดส่วนกว้าง/สูงของกรอบตัวอักษรสีขาว ใช้แยกว่าเป็นบรรทัดไหน (ความยาวต่างกันทุกบรรทัด)
+    ys, xs = np.nonzero(frame[:, :, :3].min(axis=2) > 200)
+    return (xs.max() - xs.min() + 1) / (ys.max() - ys.min() + 1) if len(xs) else 0.0
+
+
+def make_video(path: str, ffmpeg: str):
+    """เขียนวิดีโอทดสอบ H.264 ผ่าน Pipe ของ ffmpeg (ฉากหลังเป็นลายคลื่นที่เลื่อนทุกเฟรม)"""
+    subtitles = [render_text_frame(WIDTH, 40, [line], 16, background=(0, 0, 0), foreground=(250, 250, 250))
+                 for line in LINES]
+    yy, xx = np.mgrid[0:HEIGHT, 0:WIDTH * 2]
+    background = np.zeros((HEIGHT, WIDTH * 2, 4), dtype=np.uint8)
+    background[:, :, 0] = 60 + 50 * np.sin(xx / 40.0)
+    background[:, :, 1] = 50 + 40 * np.cos(yy / 30.0)
+    background[:, :, 2] = 70
+    background[:, :, 3] = 255
+    cmd = [ffmpeg, '-v', 'error', '-y', '-f', 'rawvideo', '-pix_fmt', 'bgra', '-s', f'{WIDTH}x{HEIGHT}',
+           '-r', str(FPS), '-i', '-', '-c:v', 'libx264', '-pix_fmt', 'yuv420p', path]
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    for k in range(SECONDS * FPS):
+        t = k / FPS
+        shift = (k * 8) % WIDTH
+        frame = background[:, shift:shift + WIDTH].copy()
+        for start, end, line in SCHEDULE:
+            if start <= t < end:
+                text = subtitles[line]
+                mask = text[:, :, 1] > 128
+                frame[HEIGHT - 70:HEIGHT - 30][mask] = text[mask]
+        proc.stdin.write(frame.tobytes())
+    proc.stdin.close()
+    proc.wait()
+
+
+def run(video: str, output: str, ffmpeg: str, fps: float) -> dict:
+    import video_subtitles
+    reader = video_subtitles.open_video(video, fps, decoder='ffmpeg', ffmpeg=ffmpeg)
+    writer = video_subtitles.SubtitleWriter(output)
+    tracemalloc.start()
+    try:
+        summary = video_subtitles.extract_subtitles(reader, writer, video_subtitles.create_subtitle_tracker(),
+                                                    workers=4, progress_every=0)
+    finally:
+        writer.close()
+    summary['peak_kb'] = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return summary
+
+
+def _parse_srt(path: str):
+    cues = []
+    with open(path, encoding='utf-8') as f:
+        for block in f.read().strip().split("\n\n"):
+            lines = block.splitlines()
+            start, end = (sum(float(part.replace(',', '.')) * 60 ** (2 - i) for i, part in enumerate(stamp.split(':')))
+                          for stamp in lines[1].split(' --> '))
+            cues.append((start, end, lines[2]))
+    return cues
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--loops', type=int, default=20, help="ต่อวิดีโอ 20 วินาทีกี่รอบสำหรับวัดหน่วยความจำ")
+    parser.add_argument('--fps', type=float, default=5)
+    parser.add_argument('--ffmpeg', default=shutil.which('ffmpeg') or '')
+    args = parser.parse_args()
+    if not args.ffmpeg:
+        print("ต้องมี ffmpeg ใน PATH หรือระบุ --ffmpeg")
+        return 1
+
+    from mock_cloud_server import MockCloudServer
+    from image_pipeline import decode_image
+    references = [_text_aspect(render_text_frame(WIDTH, 40, [line], 16, background=(0, 0, 0),
+                                                 foreground=(250, 250, 250))) for line in LINES]
+
+    def ocr(data: bytes) -> str:
+        aspect = _text_aspect(decode_image(data))
+        return LINES[int(np.argmin([abs(np.log(aspect / r)) for r in references]))] if aspect else ""
+
+    mock = MockCloudServer(latency=0.05, ocr=ocr).start()
+    settings.settings['cloud_endpoints'].update(vision=mock.endpoint, translate=mock.endpoint, anonymous=True)
+    settings.settings['translation_cache']['enabled'] = False
+    settings.settings['translation_memory']['enabled'] = False
+    settings.settings['preprocess']['enabled'] = False   # Mock อ่าน "ข้อความ" จากกรอบตัวอักษรในภาพเดิม
+    settings.settings['tracing']['enabled'] = False
+    import video_subtitles
+    video_subtitles.init_pipeline()
+    import cloud_processor  # noqa: F401  (import ก่อนวัด ไม่ให้นับรวมในหน่วยความจำของรอบแรก)
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        short, long = os.path.join(tmp, 'short.mp4'), os.path.join(tmp, 'long.mp4')
+        make_video(short, args.ffmpeg)
+        subprocess.run([args.ffmpeg, '-v', 'error', '-y', '-stream_loop', str(args.loops - 1), '-i', short,
+                        '-c', 'copy', long], check=True)
+
+        vision_before = mock.counts['vision']
+        summary = run(short, os.path.join(tmp, 'short.srt'), args.ffmpeg, args.fps)
+        cues = _parse_srt(os.path.join(tmp, 'short.srt'))
+        tolerance = 1.0 / args.fps + 1e-6
+        for (start, end, line), expected in zip(cues, EXPECTED):
+            ok = abs(start - expected[0]) <= tolerance and abs(end - expected[1]) <= tolerance \
+                and line == f"[th] {LINES[expected[2]]}"
+            failed |= not ok
+            print(f"{'OK  ' if ok else 'FAIL'} {start:5.1f} - {end:5.1f}  (เฉลย {expected[0]:5.1f} - {expected[1]:5.1f})  {line}")
+        if len(cues) != len(EXPECTED):
+            failed = True
+            print(f"FAIL ได้ {len(cues)} Cue (เฉลย {len(EXPECTED)})")
+        print(f"{SECONDS}s: ตรวจ {summary['frames']} เฟรม, OCR {mock.counts['vision'] - vision_before} ครั้ง, "
+              f"x{summary['speed']} เวลาจริง, หน่วยความจำสูงสุด {summary['peak_kb']:.0f} KB")
+
+        long_summary = run(long, os.path.join(tmp, 'long.srt'), args.ffmpeg, args.fps)
+        print(f"{SECONDS * args.loops}s: ตรวจ {long_summary['frames']} เฟรม, OCR {long_summary['ocr']} ครั้ง, "
+              f"Cue {long_summary['cues']}, x{long_summary['speed']} เวลาจริง, "
+              f"หน่วยความจำสูงสุด {long_summary['peak_kb']:.0f} KB")
+        if long_summary['cues'] != len(EXPECTED) * args.loops:
+            failed = True
+            print(f"FAIL ได้ {long_summary['cues']} Cue (เฉลย {len(EXPECTED) * args.loops})")
+    mock.stop()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
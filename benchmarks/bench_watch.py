@@ -0,0 +1,114 @@
+"""
+Benchmark โหมดเฝ้าดู Story (StoryWatcher): CPU ที่ใช้ต่อ 1 Core และจำนวนเฟรมที่ส่งไป OCR
+เป้าหมาย: ใช้ CPU ไม่เกินไม่กี่ % ของ 1 Core และส่งงาน Cloud ค้างได้ทีละ 1 งานเท่านั้น
+
+  --source replay (ค่าเริ่มต้น): เล่นเฟรมบทสนทนาที่ "พิมพ์ออกมา" ทีละไม่กี่ตัวอักษรแล้วค้างไว้ (benchmarks/samples.py)
+                                 ไม่ต้องมีหน้าจอ ได้จำนวนเฟรมที่ควรส่งแน่นอน (1 ครั้งต่อบรรทัด)
+  --source screen: จับภาพหน้าจอจริงผ่าน CaptureService (ต้องรันบนเครื่องที่มีหน้าจอ)
+
+CPU วัดจาก time.process_time() ของทั้ง Process ระหว่างที่ Thread หลักหลับรอ จึงเป็นค่าของ Watcher (รวม Encode)
+
+วิธีใช้:
+    python benchmarks/bench_watch.py --seconds 10
+    python benchmarks/bench_watch.py --source screen --width 1200 --height 300
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import Qt  # noqa: E402
+from samples import SAMPLE_LINES, render_text_frame  # noqa: E402
+from story_watcher import StoryWatcher  # noqa: E402
+
+
+class ReplayCapture:
+    """
+    แทน CaptureService: คืนเฟรมตามเวลา ข้อความพิมพ์ออกมา chars_per_second ตัว/วินาที แล้วค้างไว้ hold_seconds
+    (เฟรมวาดไว้ก่อนเริ่มวัด ทีละ chars_per_frame ตัวอักษร เพื่อไม่ให้เวลาวาดปนกับ CPU ของ Watcher)
+    """
+
+    def __init__(self, width: int, height: int, chars_per_second: float = 30.0, hold_seconds: float = 2.0,
+                 chars_per_frame: int = 3):
+        self.timeline = []   # (เวลาสิ้นสุดของเฟรม, เฟรม)
+        t = 0.0
+        for line in SAMPLE_LINES:
+            for end in range(chars_per_frame, len(line) + chars_per_frame, chars_per_frame):
+                t += chars_per_frame / chars_per_second
+                self.timeline.append((t, render_text_frame(width, height, [line[:end]], 20)))
+            self.timeline[-1] = (t + hold_seconds, self.timeline[-1][1])
+            t += hold_seconds
+        self.duration = t
+        self.lines = len(SAMPLE_LINES)
+        self._start = None
+
+    def grab(self, monitor):
+        if self._start is None:
+            self._start = time.monotonic()
+        elapsed = (time.monotonic() - self._start) % self.duration
+        for end, frame in self.timeline:
+            if elapsed < end:
+                return frame
+        return self.timeline[-1][1]
+
+    def release_thread(self):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', choices=('replay', 'screen'), default='replay')
+    parser.add_argument('--seconds', type=float, default=0, help="ระยะเวลาวัด (0 = เล่นบทสนทนาครบ 1 รอบ)")
+    parser.add_argument('--width', type=int, default=800)
+    parser.add_argument('--height', type=int, default=160)
+    parser.add_argument('--latency', type=float, default=0.3, help="เวลาที่งาน OCR/แปล จำลองใช้ก่อน release() (วินาที)")
+    parser.add_argument('--budget', type=float, default=5.0, help="CPU สูงสุดที่ยอมรับ (% ของ 1 Core)")
+    args = parser.parse_args()
+
+    monitor = {"top": 0, "left": 0, "width": args.width, "height": args.height}
+    capture = None
+    if args.source == 'replay':
+        capture = ReplayCapture(args.width, args.height)
+        seconds = args.seconds or capture.duration
+    else:
+        seconds = args.seconds or 10.0
+
+    watcher = StoryWatcher(monitor, capture=capture)
+    sent = []
+    in_flight = threading.Semaphore(1)
+    overlapped = []
+
+    def on_frame(img_bytes, thumb):
+        # จำลองงาน Cloud: ตรวจว่าไม่มีงานซ้อน แล้วปลดล็อกเมื่อ "เสร็จ"
+        if not in_flight.acquire(blocking=False):
+            overlapped.append(len(sent))
+        sent.append(len(img_bytes))
+
+        def done():
+            in_flight.release()
+            watcher.release()
+        threading.Timer(args.latency, done).start()
+
+    # DirectConnection: เรียกใน Thread ของ Watcher ทันที (สคริปต์นี้ไม่มี Event Loop ของ Qt)
+    watcher.frame_ready.connect(on_frame, Qt.ConnectionType.DirectConnection)
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    watcher.start()
+    time.sleep(seconds)
+    watcher.stop()
+    cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+    usage = cpu / wall * 100
+    print(f"source={args.source} region={args.width}x{args.height} fps={1 / watcher.interval:.1f} "
+          f"stable_ms={watcher.stable_seconds * 1000:.0f}")
+    print(f"wall {wall:6.2f} s   cpu {cpu * 1000:7.1f} ms   = {usage:5.2f} % of one core (budget {args.budget:.1f} %)")
+    expected = f" (บทสนทนามี {capture.lines} บรรทัด)" if capture is not None else ""
+    print(f"frames sent {len(sent)}{expected}   overlapping requests {len(overlapped)}")
+    return 1 if usage > args.budget or overlapped else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+ชุดภาพตัวอย่างแบบคงที่ (สร้างด้วย QPainter) สำหรับ Benchmark
+ทุกภาพเป็นเฟรม BGRA แบบเดียวกับที่ได้จาก mss พร้อมข้อความเฉลย
+และ LegibilityOcr: แบบจำลองความอ่านออกสำหรับ Mock Server (วัดความแม่นยำ OCR โดยไม่ต้องมี key.json)
+"""
+import os
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+SAMPLE_LINES = [
+    "Welcome back, traveler. The road ahead is dangerous.",
+    "Press any key to continue.",
+    "You obtained: Ancient Key x1",
+    "I never thought I'd see you again after the war ended.",
+    "Quest updated: Find the lighthouse keeper before nightfall.",
+    "HP 120/120   MP 45/60   Gold 1,250",
+]
+
+# (ชื่อ, กว้าง, สูง, จำนวนบรรทัด, ขนาดตัวอักษร)
+SAMPLE_SPECS = [
+    ("dialog_small", 800, 160, 2, 20),
+    ("dialog_hidpi", 1600, 320, 2, 40),
+    ("quest_log", 1200, 700, 6, 28),
+    ("fullscreen_4k", 3840, 2160, 6, 64),
+]
+
+
+_app = None
+
+
+def _ensure_app():
+    # QPainter วาดตัวอักษรได้ต้องมี QGuiApplication (เก็บไว้ไม่ให้ถูกเก็บกวาด)
+    global _app
+    from PyQt6.QtGui import QGuiApplication
+    if QGuiApplication.instance() is None:
+        _app = QGuiApplication([])
+    return QGuiApplication.instance()
+
+
+def render_text_frame(width: int, height: int, lines, font_size: int = 24,
+                      background=(24, 24, 32), foreground=(240, 240, 240)) -> np.ndarray:
+    """วาดข้อความลงภาพ แล้วคืนเป็น array BGRA (h, w, 4)"""
+    from PyQt6.QtCore import Qt, QRect
+    from PyQt6.QtGui import QImage, QPainter, QColor, QFont
+
+    _ensure_app()
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor(*background))
+    painter = QPainter(image)
+    painter.setPen(QColor(*foreground))
+    painter.setFont(QFont("DejaVu Sans", font_size))
+    line_height = height // (len(lines) + 1)
+    for i, line in enumerate(lines):
+        painter.drawText(QRect(font_size, line_height * i + line_height // 2, width, line_height),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, line)
+    painter.end()
+
+    ptr = image.constBits()
+    ptr.setsize(image.sizeInBytes())
+    return np.frombuffer(ptr, dtype=np.uint8).reshape(height, image.bytesPerLine() // 4, 4)[:, :width].copy()
+
+
+def load_samples():
+    """คืน list ของ (ชื่อ, เฟรม BGRA, ข้อความเฉลย)"""
+    samples = []
+    for name, width, height, line_count, font_size in SAMPLE_SPECS:
+        lines = [SAMPLE_LINES[i % len(SAMPLE_LINES)] for i in range(line_count)]
+        samples.append((name, render_text_frame(width, height, lines, font_size), "\n".join(lines)))
+    return samples
+
+
+# แบบจำลองความอ่านออกของ Mock (ความสูงแถวรวมหัว/หางตัวอักษร, ความต่างของค่าเทาจากพื้น)
+MIN_ROW_HEIGHT = 10
+MIN_CONTRAST = 80
+
+
+class LegibilityOcr:
+    """
+    ฟังก์ชัน OCR ของ Mock Server: คืนบรรทัดเฉลย (expected) ของภาพที่กำลังตรวจ เฉพาะบรรทัดที่ยังอ่านออก
+    แต่ละบรรทัดจะถูกอ่านออก ก็ต่อเมื่อภาพยังเห็นเป็นแถวข้อความแยกกันครบทุกบรรทัด
+    สูงอย่างน้อย MIN_ROW_HEIGHT พิกเซล และตัวอักษรต่างจากพื้นอย่างน้อย MIN_CONTRAST
+    ไม่เห็นรายละเอียดระดับตัวอักษร (เช่น Artifact ของ JPEG, ตัวอักษรแตกจาก Binarize) ต้องตรวจกับ Cloud Vision จริง
+    """
+
+    def __init__(self):
+        self.expected = ""
+
+    def __call__(self, data: bytes) -> str:
+        from image_pipeline import decode_image, text_row_spans, to_grayscale
+
+        gray = to_grayscale(decode_image(data))
+        lines = self.expected.split("\n")
+        starts, ends = text_row_spans(gray)
+        if len(starts) != len(lines):
+            # บรรทัดหายไปหรือติดกันจนแยกไม่ออก -> อ่านได้เฉพาะบรรทัดที่ยังจับคู่ตามลำดับได้
+            lines = lines[:len(starts)]
+        background = int(np.median(gray))
+        read = []
+        for line, start, end in zip(lines, starts, ends):
+            contrast = int(np.percentile(np.abs(gray[start:end].astype(np.int16) - background), 99))
+            if end - start >= MIN_ROW_HEIGHT and contrast >= MIN_CONTRAST:
+                read.append(line)
+        return "\n".join(read)
@@ -0,0 +1,93 @@
+import time
+import threading
+
+import mss
+import numpy as np
+
+from frame_tools import frame_to_array
+
+
+class CaptureService:
+    """
+    จุดจับภาพหน้าจอจุดเดียวของโปรแกรม (แทนการเปิด mss.mss() ใหม่ทุกครั้งที่กดคีย์ลัด)
+
+    - แต่ละ Thread ได้ mss Handle ของตัวเองหนึ่งตัว และใช้ซ้ำตลอดอายุโปรแกรม
+      (mss ผูก Display / DC ไว้กับ Thread จึงใช้ Handle ข้าม Thread ไม่ได้)
+      Handle ที่เปิดค้างไว้จะไม่ต้องต่อ Display Server ใหม่ และ mss ใช้ Bitmap ภายใน (DIB / SHM) ซ้ำได้
+      ตราบใดที่ขนาดพื้นที่จับภาพไม่เปลี่ยน
+    - คืนเฟรมเป็น NumPy View (h, w, 4) BGRA ที่ห่อ sct_img.raw โดยไม่คัดลอกเพิ่ม (ไม่ผ่าน .rgb)
+      mss จอง bytearray ใหม่ให้ทุกครั้งที่จับภาพ (คัดลอกออกจาก Bitmap ภายใน 1 ครั้ง) จึงไม่ได้ใช้หน่วยความจำซ้ำ
+      แต่เฟรมที่คืนไปแล้วจะไม่ถูกเขียนทับโดยการจับภาพครั้งถัดไป ส่งต่อให้ Thread อื่น (งาน Cloud) ได้อย่างปลอดภัย
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._handles = []
+        self.grabs = 0
+        self.total_ms = 0.0
+        self.last_ms = 0.0
+
+    def _handle(self):
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            sct = mss.mss()
+            self._local.sct = sct
+            with self._lock:
+                self._handles.append(sct)
+        return sct
+
+    def grab(self, monitor: dict) -> np.ndarray:
+        """
+        จับภาพพื้นที่หนึ่ง
+
+        Args:
+            monitor: dict แบบ mss {"top", "left", "width", "height"} (Physical Pixels)
+
+        Returns:
+            NumPy array (h, w, 4) BGRA แบบ View ของ Buffer ที่ mss จองให้การจับภาพครั้งนี้ (ห้ามแก้ไขค่าในนี้)
+        """
+        start = time.perf_counter()
+        sct_img = self._handle().grab(monitor)
+        frame = frame_to_array(sct_img.raw, sct_img.width, sct_img.height)
+        elapsed = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.grabs += 1
+            self.total_ms += elapsed
+            self.last_ms = elapsed
+        return frame
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'grabs': self.grabs,
+                'handles': len(self._handles),
+                'last_ms': self.last_ms,
+                'mean_ms': self.total_ms / self.grabs if self.grabs else 0.0,
+            }
+
+    def release_thread(self):
+        """ปิด Handle ของ Thread ที่เรียก (เช่น ก่อน Thread ของ StoryWatcher จบ)"""
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            return
+        self._local.sct = None
+        with self._lock:
+            if sct in self._handles:
+                self._handles.remove(sct)
+        sct.close()
+
+    def close(self):
+        """ปิด Handle ทั้งหมด (เรียกตอนปิดโปรแกรม)"""
+        with self._lock:
+            handles, self._handles = self._handles, []
+        for sct in handles:
+            try:
+                sct.close()
+            except Exception as e:
+                print(f"Warning: ปิด mss Handle ไม่สำเร็จ: {e}")
+        self._local = threading.local()
+
+
+# ใช้ร่วมกันทั้งโปรแกรม (SelectionOverlay / Story Mode / StoryWatcher)
+capture_service = CaptureService()
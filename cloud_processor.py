@@ -1,25 +1,36 @@
 import os
-import sys
-import io
-import html
+import re
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
 from google.cloud import vision
 from google.cloud import translate_v2 as translate # ใช้ v2 สำหรับการเรียกแบบง่าย
-from google.api_core.exceptions import GoogleAPICallError
+from google.api_core.exceptions import (GoogleAPICallError, ServiceUnavailable, DeadlineExceeded, ServerError,
+                                        TooManyRequests, ResourceExhausted)
+from google.auth.credentials import AnonymousCredentials
 from google.oauth2 import service_account
-from typing import Optional, Tuple
+from requests.exceptions import ConnectionError as HTTPConnectionError, Timeout as HTTPTimeout
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from settings import get_base_path, get_section
+from api_guard import CloudUnavailableError, create_api_guard
+from translation_cache import create_translation_cache, normalize_text
+from translation_memory import create_translation_memory
+from ocr_backends import create_ocr_backend
+from translate_backends import create_translate_backend
+import tracing
 
 
 # ====================================================================
 # ฟังก์ชันช่วยโหลด Credentials (เพื่อป้องกันหน้าต่างดำเด้ง)
 # ====================================================================
+def get_key_path() -> str:
+    return os.path.join(get_base_path(), 'key.json')
+
+
 def get_credentials():
-    # หา path ของไฟล์ key.json (รองรับทั้งแบบ .py และ .exe)
-    if getattr(sys, 'frozen', False):
-        base_path = os.path.dirname(sys.executable)
-    else:
-        base_path = os.path.dirname(os.path.abspath(__file__))
-    
-    key_path = os.path.join(base_path, 'key.json')
+    key_path = get_key_path()
     
     if os.path.exists(key_path):
         # โหลด Key โดยตรง
@@ -27,12 +38,317 @@ def get_credentials():
     else:
         print("Warning: key.json not found! Trying default environment.")
         return None
-    
+
+
+# ====================================================================
+# ตัวจัดการ Client แบบใช้ซ้ำ (สร้างครั้งเดียว ใช้ร่วมกันทุก Thread)
+# ====================================================================
+# Error ที่แปลว่า Channel/Connection พัง -> ต้องสร้าง Client ใหม่ในครั้งถัดไป
+CHANNEL_BROKEN_ERRORS = (ServiceUnavailable, DeadlineExceeded, ConnectionError, HTTPConnectionError)
+
+# Error ชั่วคราว (5xx / 429 / Timeout / Connection) -> ลองใหม่แบบ Backoff และนับเข้า Circuit Breaker
+TRANSIENT_ERRORS = (ServerError, TooManyRequests, ResourceExhausted, DeadlineExceeded,
+                    ConnectionError, HTTPConnectionError, HTTPTimeout)
+
+
+class CloudClientManager:
+    """
+    เก็บ Vision / Translate Client ไว้ตลอดอายุโปรแกรม แทนการโหลด key.json
+    และเปิด Connection ใหม่ทุกครั้งที่กดคีย์ลัด
+
+    - สร้าง Client แต่ละตัวเพียงครั้งเดียว (thread-safe)
+    - ถ้าไฟล์ key.json ถูกแก้ไข/เปลี่ยน จะสร้าง Client ใหม่ให้อัตโนมัติ
+    - เรียก invalidate() เมื่อ Channel พัง เพื่อให้ครั้งถัดไปสร้างใหม่
+    - prewarm() เปิด Connection ล่วงหน้าใน Background ตอนเปิดโปรแกรม
+
+    Args:
+        key_path: path ของ key.json (None = ใช้ get_key_path())
+        client_options: dict ของ {'vision': {...}, 'translate': {...}} ส่งต่อให้ Client
+            เช่น {'api_endpoint': 'http://127.0.0.1:8080'} สำหรับ Stub ในเครื่อง
+        vision_transport: 'grpc' (ค่าเริ่มต้น) หรือ 'rest'
+        anonymous: ใช้ AnonymousCredentials (สำหรับ Stub ที่ไม่ต้องยืนยันตัวตน)
+    """
+
+    CLIENT_NAMES = ('vision', 'translate')
+
+    def __init__(self, key_path: Optional[str] = None, client_options: Optional[dict] = None,
+                 vision_transport: Optional[str] = None, anonymous: bool = False):
+        self.key_path = key_path
+        self.client_options = client_options or {}
+        self.vision_transport = vision_transport
+        self.anonymous = anonymous
+
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._credentials = None
+        self._key_signature = None
+        self._warm_thread = None
+
+    # --- Credentials ---
+    def _current_key_signature(self):
+        # ใช้ (mtime, size) ของ key.json ตรวจว่าไฟล์ถูกเปลี่ยนหรือไม่ (os.stat ใช้เวลาระดับไมโครวินาที)
+        try:
+            st = os.stat(self.key_path or get_key_path())
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _load_credentials(self):
+        if self.anonymous:
+            return AnonymousCredentials()
+        key_path = self.key_path or get_key_path()
+        if os.path.exists(key_path):
+            return service_account.Credentials.from_service_account_file(key_path)
+        print("Warning: key.json not found! Trying default environment.")
+        return None
+
+    def _build_client(self, name: str):
+        options = self.client_options.get(name)
+        if name == 'vision':
+            kwargs = {'credentials': self._credentials, 'client_options': options}
+            if self.vision_transport:
+                kwargs['transport'] = self.vision_transport
+            return vision.ImageAnnotatorClient(**kwargs)
+        if name == 'translate':
+            return translate.Client(credentials=self._credentials, client_options=options)
+        raise ValueError(f"Unknown client: {name}")
+
+    # --- Public API ---
+    def get_client(self, name: str):
+        """คืน Client ที่สร้างไว้แล้ว (สร้างใหม่ถ้ายังไม่มี หรือ key.json เปลี่ยน)"""
+        signature = self._current_key_signature()
+        with self._lock:
+            if signature != self._key_signature:
+                if self._key_signature is not None or self._clients:
+                    print("Info: key.json changed, rebuilding cloud clients.")
+                self._clients.clear()
+                self._credentials = None
+                self._key_signature = signature
+
+            client = self._clients.get(name)
+            if client is None:
+                if self._credentials is None:
+                    self._credentials = self._load_credentials()
+                client = self._build_client(name)
+                self._clients[name] = client
+            return client
+
+    def get_vision_client(self):
+        return self.get_client('vision')
+
+    def get_translate_client(self):
+        return self.get_client('translate')
+
+    def invalidate(self, name: Optional[str] = None):
+        """ทิ้ง Client (ทั้งหมด หรือเฉพาะชื่อ) เพื่อให้สร้างใหม่ในการเรียกครั้งถัดไป"""
+        with self._lock:
+            if name is None:
+                self._clients.clear()
+                self._credentials = None
+            else:
+                self._clients.pop(name, None)
+
+    def handle_error(self, name: str, error: Exception):
+        """ถ้า Error บ่งบอกว่า Channel พัง ให้ทิ้ง Client ตัวนั้น"""
+        if isinstance(error, CHANNEL_BROKEN_ERRORS):
+            print(f"Info: {name} channel broken ({type(error).__name__}), client will be rebuilt.")
+            self.invalidate(name)
+
+    def warm_up(self):
+        """สร้าง Client และเปิด Connection (TLS + Token) ไว้ล่วงหน้า"""
+        for name in self.CLIENT_NAMES:
+            try:
+                client = self.get_client(name)
+                if name == 'vision':
+                    channel = getattr(client.transport, 'grpc_channel', None)
+                    if channel is not None:
+                        import grpc
+                        grpc.channel_ready_future(channel).result(timeout=10)
+                elif name == 'translate':
+                    # get_languages ไม่คิดค่าอักขระ แต่ทำให้ได้ Token + Connection ที่พร้อมใช้
+                    client.get_languages()
+            except Exception as e:
+                print(f"Warning: warm-up {name} client failed: {e}")
+
+    def prewarm(self) -> threading.Thread:
+        """เรียก warm_up() ใน Background Thread (เรียกซ้ำได้ จะไม่สร้าง Thread ซ้อน)"""
+        with self._lock:
+            if self._warm_thread is None or not self._warm_thread.is_alive():
+                self._warm_thread = threading.Thread(target=self.warm_up, name="CloudPrewarm", daemon=True)
+                self._warm_thread.start()
+            return self._warm_thread
+
+
+# ====================================================================
+# รวม Request ที่เหมือนกันซึ่งกำลังทำงานอยู่ (Single-flight)
+# ====================================================================
+class SingleFlight:
+    """
+    ถ้ามี Request ที่ key เดียวกันกำลังทำงานอยู่ ให้รอผลของตัวนั้นแทนการเรียก API ซ้ำ
+    (เช่น กดคีย์ลัดซ้ำสองครั้ง / แปลเองระหว่างที่ OCR ยังแปลประโยคเดียวกันอยู่ / หลายพื้นที่มีข้อความเดียวกัน)
+    ไม่ใช่ Cache: เมื่องานเสร็จ key จะถูกลบทันที
+
+    key เป็น tuple ที่ขึ้นต้นด้วยชนิดงาน เช่น ('ocr', hash ของภาพ) / ('translate', ข้อความ, source, target)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}            # key -> Future ของงานที่กำลังทำ
+        self.leaders = Counter()    # ชนิดงาน -> จำนวนครั้งที่เรียก API จริง
+        self.shared = Counter()     # ชนิดงาน -> จำนวนครั้งที่ได้ผลจากงานที่กำลังทำอยู่แล้ว
+
+    def begin(self, key) -> Tuple[Future, bool]:
+        """คืน (future, เป็นผู้ทำงานเองหรือไม่) ถ้าเป็นผู้ทำงาน ต้องเรียก finish(key, ...) เสมอ"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.shared[key[0]] += 1
+                return future, False
+            future = self._calls[key] = Future()
+            self.leaders[key[0]] += 1
+            return future, True
+
+    def finish(self, key, result=None, error: BaseException = None):
+        with self._lock:
+            future = self._calls.pop(key)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key, fn):
+        """เรียก fn() ครั้งเดียวต่อ key ที่ซ้อนกัน ผู้ที่มาทีหลังได้ผล (หรือ Exception) เดียวกัน"""
+        future, leader = self.begin(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(key, error=e)
+            raise
+        self.finish(key, result)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'calls': dict(self.leaders),
+                'deduplicated': dict(self.shared),
+                'in_flight': len(self._calls),
+            }
+
+
+def image_key(image_data: bytes) -> tuple:
+    return ('ocr', hashlib.blake2b(image_data, digest_size=16).digest())
+
+
+def text_key(text: str, source_language: str, target_language: str) -> tuple:
+    return ('translate', text, source_language, target_language)
+
+
+# ข้อความแจ้งเตือนที่ process_and_translate คืนกลับมาแทนคำแปล
+OCR_FAILED_MESSAGE = "ไม่สามารถดึงข้อความจากรูปภาพได้"
+TRANSLATE_FAILED_MESSAGE = "ไม่สามารถแปลข้อความได้"
+
+
+def create_client_manager() -> CloudClientManager:
+    """
+    สร้าง CloudClientManager ตามค่าในหมวด cloud_endpoints ของ settings
+    (เช่น ชี้ไปที่ mock_cloud_server.py เพื่อทดสอบโดยไม่ใช้ Network/key.json)
+    """
+    config = get_section('cloud_endpoints')
+    options = {name: {'api_endpoint': config[name]} for name in CloudClientManager.CLIENT_NAMES if config.get(name)}
+    transport = config.get('vision_transport') or None
+    if transport is None and config.get('vision', '').startswith('http://'):
+        # gRPC ใช้กับ Server HTTP ธรรมดาไม่ได้ -> ใช้ REST
+        transport = 'rest'
+    return CloudClientManager(client_options=options, vision_transport=transport,
+                              anonymous=config.get('anonymous', False))
+
+
+# Instance กลางที่ทุก Worker ใช้ร่วมกัน
+client_manager = create_client_manager()
+
+# Rate Limit + Retry + Circuit Breaker แยกตาม API (ใช้ร่วมกันทุก Thread, ตั้งค่าในหมวด api_limits)
+api_guards = {name: create_api_guard(name, TRANSIENT_ERRORS) for name in CloudClientManager.CLIENT_NAMES}
+
+# Request ที่กำลังทำงานอยู่ (ภาพ/ข้อความเดียวกันที่ส่งซ้อนกันจะใช้ผลร่วมกัน)
+inflight = SingleFlight()
+
+# Cache คำแปล (ข้อความซ้ำจะไม่ถูกส่งไป Google อีก)
+translation_cache = create_translation_cache()
+
+# Translation Memory (ประโยคที่ต่างจากที่เคยแปลแค่ความคลาดเคลื่อนของ OCR จะใช้คำแปลเดิม)
+translation_memory = create_translation_memory()
+
+# ตัวอ่านข้อความจากภาพ (Cloud Vision / Tesseract ในเครื่อง / อัตโนมัติ)
+ocr_backend = create_ocr_backend()
+
+# ตัวแปลภาษา (Google v2 / โมเดลในเครื่อง)
+translate_backend = create_translate_backend()
+
 # ====================================================================
 # I. Fuction สำหรับ OCR (Google Cloud Vision API)
 # ====================================================================
 
 def process_image_to_text(image_data: bytes) -> Optional[str]:
+    """
+    ดึงข้อความทั้งหมดจากข้อมูลรูปภาพไบนารี ผ่าน OCR Backend ที่ตั้งค่าไว้
+    (ค่าเริ่มต้นคือ Google Cloud Vision, เลือก 'local' / 'auto' ได้ในหมวด ocr ของ settings)
+
+    Args:
+        image_data: ข้อมูลรูปภาพในรูปแบบไบนารี (bytes) ที่ได้จากการจับภาพหน้าจอ
+
+    Returns:
+        ข้อความที่สแกนได้ทั้งหมดในรูปแบบ string หรือ None หากเกิดข้อผิดพลาด.
+    """
+    return inflight.do(image_key(image_data), lambda: ocr_backend.recognize(image_data).text)
+
+
+def process_images_to_text(images: Sequence[bytes]) -> List[Optional[str]]:
+    """
+    OCR หลายภาพพร้อมกัน (เช่น หลายพื้นที่ Story) Cloud Vision จะรวมเป็น batch_annotate_images ครั้งเดียว
+
+    Returns:
+        ข้อความของแต่ละภาพตามลำดับเดิม (None = ไม่พบข้อความ / ผิดพลาด)
+    """
+    results: List[Optional[str]] = [None] * len(images)
+    owned, waiting = OrderedDict(), {}   # key -> index ทั้งหมดของภาพนั้น (ภาพซ้ำในชุดเดียวกันส่งครั้งเดียว)
+    futures = {}
+    for index, image_data in enumerate(images):
+        key = image_key(image_data)
+        if key in owned or key in waiting:
+            (owned if key in owned else waiting)[key].append(index)
+            continue
+        futures[key], leader = inflight.begin(key)
+        (owned if leader else waiting)[key] = [index]
+
+    texts, error = {}, None
+    try:
+        if owned:
+            recognized = ocr_backend.recognize_many([images[indexes[0]] for indexes in owned.values()])
+            texts = {key: result.text for key, result in zip(owned, recognized)}
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        for key in owned:
+            inflight.finish(key, texts.get(key), error)
+
+    for key, indexes in owned.items():
+        for index in indexes:
+            results[index] = texts.get(key)
+    for key, indexes in waiting.items():
+        try:
+            text = futures[key].result()
+        except Exception:
+            text = None
+        for index in indexes:
+            results[index] = text
+    return results
+
+
+def cloud_vision_ocr(image_data: bytes) -> Optional[str]:
     """
     ดึงข้อความทั้งหมดจากข้อมูลรูปภาพไบนารีโดยใช้ Google Cloud Vision API.
 
@@ -43,18 +359,12 @@ def process_image_to_text(image_data: bytes) -> Optional[str]:
         ข้อความที่สแกนได้ทั้งหมดในรูปแบบ string หรือ None หากเกิดข้อผิดพลาด.
     """
     try:
-        # --- แก้ไขตรงนี้: โหลด Key มาใช้ ---
-        creds = get_credentials()
-        if creds:
-            client = vision.ImageAnnotatorClient(credentials=creds)
-        else:
-            client = vision.ImageAnnotatorClient() # Fallback แบบเดิม
-        # --------------------------------
-        
         image = vision.Image(content=image_data)
 
-        # เรียกใช้ Text Detection
-        response = client.text_detection(image=image)
+        # เรียกใช้ Text Detection ผ่าน ApiGuard (ใช้ Client ที่สร้างไว้แล้ว ไม่ต้องโหลด Key ใหม่ทุกครั้ง)
+        response = api_guards['vision'].call(
+            lambda: client_manager.get_vision_client().text_detection(image=image),
+            on_error=lambda e: client_manager.handle_error('vision', e))
         texts = response.text_annotations
 
         if texts:
@@ -63,6 +373,9 @@ def process_image_to_text(image_data: bytes) -> Optional[str]:
         
         return None
 
+    except CloudUnavailableError:
+        # ไม่ได้เรียก API เลย (Circuit เปิด / ถูกจำกัดอัตรา) -> ส่งต่อให้ Overlay แสดงเหตุผล
+        raise
     except GoogleAPICallError as e:
         print(f"ERROR: การเรียกใช้ Google Vision API ล้มเหลว: {e}")
         return None
@@ -70,44 +383,90 @@ def process_image_to_text(image_data: bytes) -> Optional[str]:
         print(f"ERROR: เกิดข้อผิดพลาดที่ไม่คาดคิดในการทำ OCR: {e}")
         return None
 
+
+# จำนวนภาพสูงสุดต่อ 1 Request ของ images:annotate (ข้อจำกัดของ Vision API)
+VISION_BATCH_LIMIT = 16
+
+
+def cloud_vision_ocr_many(images: Sequence[bytes]) -> List[Optional[str]]:
+    """
+    OCR หลายภาพด้วย Google Cloud Vision ใน Request เดียว (batch_annotate_images, ครั้งละไม่เกิน 16 ภาพ)
+
+    Returns:
+        ข้อความของแต่ละภาพตามลำดับเดิม (None = ไม่พบข้อความ / ผิดพลาด)
+    """
+    results = []
+    try:
+        feature = vision.Feature(type_=vision.Feature.Type.TEXT_DETECTION)
+        for start in range(0, len(images), VISION_BATCH_LIMIT):
+            requests = [vision.AnnotateImageRequest(image=vision.Image(content=data), features=[feature])
+                        for data in images[start:start + VISION_BATCH_LIMIT]]
+            # retry=None: ให้ ApiGuard เป็นชั้นเดียวที่ลองใหม่ (ไม่ซ้อนกับ Retry ในตัว Client)
+            response = api_guards['vision'].call(
+                lambda: client_manager.get_vision_client().batch_annotate_images(requests=requests, retry=None),
+                on_error=lambda e: client_manager.handle_error('vision', e))
+            for item in response.responses:
+                if item.error.message:
+                    print(f"ERROR: Google Vision API ไม่สามารถอ่านภาพได้: {item.error.message}")
+                texts = item.text_annotations
+                results.append(texts[0].description.strip() if texts else None)
+        return results
+
+    except CloudUnavailableError:
+        raise
+    except GoogleAPICallError as e:
+        print(f"ERROR: การเรียกใช้ Google Vision API ล้มเหลว: {e}")
+    except Exception as e:
+        print(f"ERROR: เกิดข้อผิดพลาดที่ไม่คาดคิดในการทำ OCR: {e}")
+    return results + [None] * (len(images) - len(results))
+
 # ====================================================================
 # II. Fuction สำหรับ Translation (Google Cloud Translation API)
 # ====================================================================
 
-def translate_content(text_content: str, target_language: str = 'th', source_language: str = 'en') -> Optional[str]:
+def translate_content(text_content: str, target_language: str = 'th', source_language: str = 'en',
+                      use_cache: bool = True, use_memory: bool = True) -> Optional[str]:
     """
-    แปลข้อความที่กำหนดโดยใช้ Google Cloud Translation API (v2).
+    แปลข้อความที่กำหนดผ่าน Translate Backend ที่ตั้งค่าไว้ (ค่าเริ่มต้นคือ Google Cloud Translation API v2)
 
     Args:
         text_content: ข้อความต้นฉบับที่จะแปล
         target_language: รหัสภาษาปลายทาง (เช่น 'th' สำหรับไทย)
         source_language: รหัสภาษาต้นทาง (เช่น 'en' สำหรับอังกฤษ)
+        use_cache: False = ข้าม Translation Cache และเรียก API เสมอ
+        use_memory: False = ไม่ใช้คำแปลของประโยคที่ "ใกล้เคียง" จาก Translation Memory (ข้อความที่ผู้ใช้พิมพ์เอง
+            ไม่ได้มาจาก OCR ต่างกันตัวเดียวก็ตั้งใจให้ต่าง) แต่ยังจำคำแปลไว้ใช้กับผล OCR ครั้งต่อไป
 
     Returns:
         ข้อความที่แปลแล้วในรูปแบบ string หรือ None หากเกิดข้อผิดพลาด.
     """
     if not text_content:
         return None
+
+    if use_cache:
+        cached = translation_cache.get(text_content, source_language, target_language)
+        if cached is None and use_memory:
+            cached = translation_memory.get(text_content, source_language, target_language)
+        if cached is not None:
+            return cached
     
     try:
-        creds = get_credentials()
-        if creds:
-            client = translate.Client(credentials=creds)
-        else:
-            client = translate.Client() 
+        # ข้อความเดียวกันที่กำลังแปลอยู่ (จาก Thread อื่น) จะรอผลเดียวกัน ไม่ยิง API ซ้ำ
+        translated_text = inflight.do(
+            text_key(text_content, source_language, target_language),
+            lambda: translate_backend.translate_many([text_content], target_language, source_language)[0])
+        if translated_text is None:
+            # รอผลจาก translate_batch ของ Thread อื่นที่แปลไม่สำเร็จ
+            return None
 
-        result = client.translate(
-            text_content,
-            target_language=target_language,
-            source_language=source_language
-        )
-        
-        # --- 2. แก้ไขตรงนี้: เพิ่ม html.unescape() ---
-        # เดิม: translated_text = result['translatedText'].strip()
-        translated_text = html.unescape(result['translatedText'].strip())
+        if use_cache:
+            translation_cache.put(text_content, source_language, target_language, translated_text)
+            translation_memory.put(text_content, source_language, target_language, translated_text)
         
         return translated_text
 
+    except CloudUnavailableError:
+        raise
     except GoogleAPICallError as e:
         print(f"ERROR: การเรียกใช้ Google Translation API ล้มเหลว: {e}")
         return None
@@ -115,32 +474,314 @@ def translate_content(text_content: str, target_language: str = 'th', source_lan
         print(f"ERROR: เกิดข้อผิดพลาดที่ไม่คาดคิดในการแปล: {e}")
         return None
 
+def pack_batches(texts: Sequence[str], max_segments: int, max_chars: int) -> List[List[int]]:
+    """
+    จัดกลุ่ม index ของข้อความให้แต่ละกลุ่มมีไม่เกิน max_segments ข้อความ
+    และรวมกันไม่เกิน max_chars ตัวอักษร (ข้อความที่ยาวเกินเองจะอยู่กลุ่มเดียว)
+    """
+    batches, current, current_chars = [], [], 0
+    for index, text in enumerate(texts):
+        length = len(text)
+        if current and (len(current) >= max_segments or current_chars + length > max_chars):
+            batches.append(current)
+            current, current_chars = [], 0
+        current.append(index)
+        current_chars += length
+    if current:
+        batches.append(current)
+    return batches
+
+
+def translate_batch(segments: Sequence[str], target_language: str = 'th', source_language: str = 'en',
+                    use_cache: bool = True) -> List[Optional[str]]:
+    """
+    แปลหลายข้อความโดยรวมเป็น Request ให้น้อยที่สุดเท่าที่ข้อจำกัดของ API อนุญาต
+
+    - ข้อความซ้ำกันจะถูกส่งแค่ครั้งเดียว และข้อความที่อยู่ใน Cache จะไม่ถูกส่งเลย
+    - ผลลัพธ์เรียงตามลำดับ segments เดิมเสมอ
+
+    Args:
+        segments: รายการข้อความ (เช่น แต่ละบรรทัด/ย่อหน้าของผล OCR)
+        target_language, source_language, use_cache: เหมือน translate_content
+
+    Returns:
+        list คำแปล ยาวเท่ากับ segments (None = แปลช่องนั้นไม่สำเร็จ, ข้อความว่างคืน "")
+    """
+    config = get_section('translate_batch')
+    max_segments = config.get('max_segments', 128)
+    max_chars = config.get('max_chars', 5000)
+
+    results: List[Optional[str]] = [None] * len(segments)
+    pending = {}   # ข้อความที่ต้องส่ง -> index ทั้งหมดที่ใช้ข้อความนี้
+    for index, text in enumerate(segments):
+        if not text or not text.strip():
+            results[index] = ""
+            continue
+        if use_cache and text not in pending:
+            cached = translation_cache.get(text, source_language, target_language)
+            if cached is None:
+                cached = translation_memory.get(text, source_language, target_language)
+            if cached is not None:
+                results[index] = cached
+                continue
+        pending.setdefault(text, []).append(index)
+
+    if not pending:
+        return results
+
+    # ข้อความที่ Thread อื่นกำลังแปลอยู่ -> รอผลของตัวนั้น ที่เหลือเป็นของเราที่ต้องส่งเอง
+    unique_texts, waiting = [], {}
+    for text in pending:
+        future, leader = inflight.begin(text_key(text, source_language, target_language))
+        if leader:
+            unique_texts.append(text)
+        else:
+            waiting[text] = future
+
+    translated_texts = {}
+    try:
+        for batch in pack_batches(unique_texts, max_segments, max_chars):
+            texts = [unique_texts[i] for i in batch]
+            try:
+                response = translate_backend.translate_many(texts, target_language, source_language)
+            except CloudUnavailableError:
+                raise
+            except Exception as e:
+                print(f"ERROR: การแปลแบบกลุ่ม ({len(texts)} ข้อความ) ล้มเหลว: {e}")
+                continue
+
+            for text, translated in zip(texts, response):
+                translated_texts[text] = translated
+                if use_cache:
+                    translation_cache.put(text, source_language, target_language, translated)
+            if use_cache:
+                translation_memory.put_many((text, source_language, target_language, translated)
+                                            for text, translated in zip(texts, response))
+    finally:
+        # ปล่อยผู้ที่รอข้อความของเราเสมอ (None = แปลไม่สำเร็จ)
+        for text in unique_texts:
+            inflight.finish(text_key(text, source_language, target_language), translated_texts.get(text))
+
+    for text, future in waiting.items():
+        try:
+            translated_texts[text] = future.result()
+        except Exception:
+            pass
+
+    for text, indexes in pending.items():
+        for index in indexes:
+            results[index] = translated_texts.get(text)
+    return results
+
+
+# ====================================================================
+# II-b. แปลแบบทีละประโยค (แปลเฉพาะประโยคที่ยังไม่เคยเห็น)
+# ====================================================================
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?…。！？])\s+')
+_SENTENCE_TERMINALS = '.!?…。！？:"\')]'
+
+
+def split_segments(text: str) -> List[Tuple[str, str]]:
+    """
+    แบ่งผล OCR เป็นประโยค/บรรทัด พร้อมตัวคั่นที่ต้องใช้ตอนประกอบกลับ
+
+    บรรทัดที่ถูกตัดกลางประโยค (ไม่จบด้วยเครื่องหมายจบประโยค และบรรทัดถัดไปขึ้นต้นด้วยตัวพิมพ์เล็ก)
+    จะถูกต่อกันก่อน จากนั้นแต่ละย่อหน้าจะถูกแบ่งเป็นประโยค
+
+    Returns:
+        list ของ (ประโยคที่ normalize แล้ว, ตัวคั่นหลังประโยค ' ' หรือ '\n')
+    """
+    blocks, current = [], []
+    for line in (normalize_text(line) for line in text.splitlines()):
+        if not line:
+            if current:
+                blocks.append(' '.join(current))
+                current = []
+            continue
+        if current and (current[-1][-1] in _SENTENCE_TERMINALS or not line[0].islower()):
+            blocks.append(' '.join(current))
+            current = []
+        current.append(line)
+    if current:
+        blocks.append(' '.join(current))
+
+    pieces = []
+    for block in blocks:
+        sentences = [sentence for sentence in _SENTENCE_SPLIT_RE.split(block) if sentence]
+        for i, sentence in enumerate(sentences):
+            pieces.append((sentence, ' ' if i < len(sentences) - 1 else '\n'))
+    return pieces
+
+
+class SegmentTranslator:
+    """
+    จำคำแปลรายประโยคไว้ในหน่วยความจำ เมื่อกล่องข้อความ/Log มีประโยคใหม่เพิ่มมา
+    จะส่งแปลเฉพาะประโยคใหม่ (รวมเป็น Request เดียวผ่าน translate_batch)
+    แล้วประกอบคำแปลทั้งหมดกลับตามลำดับเดิม
+
+    Args:
+        max_segments: จำนวนประโยคที่จำไว้ (LRU)
+    """
+
+    def __init__(self, max_segments: int = 2000):
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+        self._segments = OrderedDict()   # (ประโยค, source, target) -> คำแปล
+        self.reused = 0
+        self.translated = 0
+
+    def translate(self, text: str, target_language: str = 'th', source_language: str = 'en',
+                  use_cache: bool = True) -> Optional[str]:
+        return self.translate_many([text], target_language, source_language, use_cache)[0]
+
+    def translate_many(self, texts: Sequence[str], target_language: str = 'th', source_language: str = 'en',
+                       use_cache: bool = True) -> List[Optional[str]]:
+        """
+        แปลหลายข้อความ (เช่น หลายพื้นที่ Story) โดยรวมประโยคใหม่ของทุกข้อความเป็น translate_batch ครั้งเดียว
+        use_cache: False = ไม่ใช้/ไม่จำคำแปลรายประโยคในหน่วยความจำ และข้าม Translation Cache (แปลทุกประโยคใหม่)
+
+        Returns:
+            คำแปลตามลำดับ texts (None = ข้อความนั้นว่างหรือแปลไม่สำเร็จ)
+        """
+        all_pieces = [split_segments(text) if text else [] for text in texts]
+
+        translations, missing = {}, []
+        with self._lock:
+            for pieces in all_pieces:
+                for sentence, _ in pieces:
+                    key = (sentence, source_language, target_language)
+                    if sentence in translations:
+                        continue
+                    if use_cache and key in self._segments:
+                        self._segments.move_to_end(key)
+                        translations[sentence] = self._segments[key]
+                        self.reused += 1
+                    elif sentence not in missing:
+                        missing.append(sentence)
+
+        if missing:
+            translated_missing = translate_batch(missing, target_language, source_language, use_cache=use_cache)
+            done = [(sentence, translated) for sentence, translated in zip(missing, translated_missing)
+                    if translated is not None]
+            translations.update(done)
+            with self._lock:
+                self.translated += len(done)
+                if use_cache:
+                    for sentence, translated in done:
+                        self._segments[(sentence, source_language, target_language)] = translated
+                    while len(self._segments) > self.max_segments:
+                        self._segments.popitem(last=False)
+
+        results = []
+        for pieces in all_pieces:
+            if not pieces or any(sentence not in translations for sentence, _ in pieces):
+                results.append(None)
+            else:
+                results.append(''.join(translations[sentence] + separator
+                                       for sentence, separator in pieces).strip())
+        return results
+
+    def clear(self):
+        with self._lock:
+            self._segments.clear()
+            self.reused = self.translated = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'reused': self.reused, 'translated': self.translated, 'segments': len(self._segments)}
+
+
+segment_translator = SegmentTranslator(get_section('incremental_translate').get('max_segments', 2000))
+
+
+def translate_incremental(text_content: str, target_language: str = 'th', source_language: str = 'en',
+                          use_cache: bool = True) -> Optional[str]:
+    """
+    แปลแบบทีละประโยค (ถ้าปิดใน settings จะแปลทั้งก้อนด้วย translate_content แบบเดิม)
+    use_cache: False = ข้ามทั้งคำแปลรายประโยคที่จำไว้และ Translation Cache (เรียก API เสมอ)
+    """
+    if not text_content:
+        return None
+    if not get_section('incremental_translate').get('enabled', True):
+        return translate_content(text_content, target_language, source_language, use_cache)
+    return segment_translator.translate(text_content, target_language, source_language, use_cache)
+
+
+def translate_incremental_many(texts: Sequence[str], target_language: str = 'th', source_language: str = 'en',
+                               use_cache: bool = True) -> List[Optional[str]]:
+    """แปลหลายข้อความด้วยการเรียกแปลครั้งเดียว (ทีละประโยค ถ้าเปิด incremental_translate)"""
+    if not get_section('incremental_translate').get('enabled', True):
+        return translate_batch([text or '' for text in texts], target_language, source_language, use_cache)
+    return segment_translator.translate_many(texts, target_language, source_language, use_cache)
+
+
 # ====================================================================
 # III. ฟังก์ชันรวม (Main Processing)
 # ====================================================================
 
-def process_and_translate(image_data: bytes) -> Tuple[Optional[str], Optional[str]]:
+def process_and_translate(image_data: bytes, on_ocr: Optional[Callable[[str], None]] = None
+                          ) -> Tuple[Optional[str], Optional[str]]:
     """
     ฟังก์ชันหลักที่รวมการทำ OCR และการแปลภาษาเข้าด้วยกัน
-    
+
+    Args:
+        on_ocr: เรียกด้วยข้อความต้นฉบับทันทีที่ OCR เสร็จ ก่อนเริ่มแปล (เช่น แสดงต้นฉบับบน Overlay ไปก่อน)
+
     Returns:
         tuple (ข้อความต้นฉบับ, ข้อความที่แปลแล้ว)
     """
     # 1. ทำ OCR เพื่อดึงข้อความ
-    original_text = process_image_to_text(image_data)
+    with tracing.span('ocr', bytes=len(image_data)) as info:
+        original_text = process_image_to_text(image_data)
+        info['chars'] = len(original_text or '')
     
     if not original_text:
-        return None, "ไม่สามารถดึงข้อความจากรูปภาพได้"
+        return None, OCR_FAILED_MESSAGE
+    if on_ocr:
+        on_ocr(original_text)
 
-    # 2. ทำ Translation
-    translated_text = translate_content(original_text)
+    # 2. ทำ Translation (แปลเฉพาะประโยคที่ยังไม่เคยแปล)
+    with tracing.span('translate', chars=len(original_text)):
+        translated_text = translate_incremental(original_text)
     
     if not translated_text:
-        return original_text, "ไม่สามารถแปลข้อความได้"
+        return original_text, TRANSLATE_FAILED_MESSAGE
 
     return original_text, translated_text
 
 
+def process_and_translate_many(images: Sequence[bytes], on_ocr: Optional[Callable[[List[Optional[str]]], None]] = None
+                               ) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    OCR + แปล หลายภาพ (หลายพื้นที่ Story) ด้วย Vision 1 Request และ Translate 1 Request
+    on_ocr: เรียกด้วย list ข้อความต้นฉบับ (ตามลำดับภาพ) เมื่อ OCR เสร็จและพบข้อความอย่างน้อย 1 ภาพ
+
+    Returns:
+        list ของ (ข้อความต้นฉบับ, ข้อความที่แปลแล้ว) ตามลำดับภาพ
+        ภาพที่ไม่พบข้อความจะได้ (None, OCR_FAILED_MESSAGE)
+    """
+    with tracing.span('ocr', bytes=sum(len(data) for data in images), images=len(images)) as info:
+        originals = process_images_to_text(images)
+        info['chars'] = sum(len(text or '') for text in originals)
+
+    found = [i for i, text in enumerate(originals) if text]
+    translated = [None] * len(images)
+    if found and on_ocr:
+        on_ocr(originals)
+    if found:
+        with tracing.span('translate', chars=info['chars'], texts=len(found)):
+            for i, text in zip(found, translate_incremental_many([originals[i] for i in found])):
+                translated[i] = text
+
+    results = []
+    for original, text in zip(originals, translated):
+        if not original:
+            results.append((None, OCR_FAILED_MESSAGE))
+        else:
+            results.append((original, text or TRANSLATE_FAILED_MESSAGE))
+    return results
+
+
 # ====================================================================
 # IV. ตัวอย่างการใช้งานและทดสอบ
 # ====================================================================
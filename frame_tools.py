@@ -0,0 +1,215 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+
+from settings import get_section
+
+
+# ====================================================================
+# I. เครื่องมือจัดการเฟรมดิบจาก mss (BGRA)
+# ====================================================================
+def frame_to_array(raw, width: int, height: int) -> np.ndarray:
+    """
+    ห่อ Buffer BGRA ของ mss เป็น NumPy array (h, w, 4) โดยไม่คัดลอกข้อมูล
+
+    Args:
+        raw: bytes / bytearray / memoryview ของพิกเซล BGRA (เช่น sct_img.raw)
+        width, height: ขนาดภาพ
+    """
+    return np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4)
+
+
+def _bin_edges(length: int, bins: int) -> np.ndarray:
+    bins = max(1, min(bins, length))
+    return np.linspace(0, length, bins + 1).astype(np.intp)[:-1]
+
+
+def frame_thumbnail(frame: np.ndarray, grid_width: int = 64, grid_height: int = 24) -> np.ndarray:
+    """
+    ย่อภาพเป็น Grid สีเทาขนาดเล็ก (เฉลี่ยพื้นที่แต่ละช่อง) ใช้เป็นลายนิ้วมือของเฟรม
+
+    Args:
+        frame: เฟรม BGRA (h, w, 4) หรือภาพช่องเดียว (h, w) เช่น ภาพขาวดำ / Mask ของตัวอักษร
+
+    Returns:
+        array float32 ขนาด (grid_height, grid_width) ค่า 0-255
+    """
+    # ภาพใหญ่มาก: สุ่มพิกเซลแบบเว้นช่วงก่อน (ยังเหลือ >= 4 พิกเซลต่อช่อง) เพื่อลดงาน
+    step = max(1, min(frame.shape[0] // (grid_height * 4), frame.shape[1] // (grid_width * 4)))
+    if step > 1:
+        frame = frame[::step, ::step]
+
+    h, w = frame.shape[:2]
+    row_edges = _bin_edges(h, grid_height)
+    col_edges = _bin_edges(w, grid_width)
+
+    # รวมพิกเซลทีละแกน (ใช้ uint32 กันล้น) แล้วหารด้วยจำนวนพิกเซลต่อช่อง
+    summed = np.add.reduceat(frame if frame.ndim == 2 else frame[:, :, :3], row_edges, axis=0, dtype=np.uint32)
+    summed = np.add.reduceat(summed, col_edges, axis=1, dtype=np.uint32)
+    row_counts = np.diff(np.append(row_edges, h))
+    col_counts = np.diff(np.append(col_edges, w))
+    if frame.ndim == 2:
+        return (summed / (row_counts[:, None] * col_counts[None, :])).astype(np.float32)
+    means = summed / (row_counts[:, None, None] * col_counts[None, :, None])
+
+    # BGRA -> Gray (ITU-R BT.601)
+    gray = means[:, :, 0] * 0.114 + means[:, :, 1] * 0.587 + means[:, :, 2] * 0.299
+    return gray.astype(np.float32)
+
+
+def thumbnail_diff_ratio(a: np.ndarray, b: np.ndarray, pixel_tolerance: float = 12.0) -> float:
+    """สัดส่วนช่องใน Grid ที่ต่างกันเกิน pixel_tolerance (0.0 = เหมือนกันทุกช่อง)"""
+    if a.shape != b.shape:
+        return 1.0
+    return float(np.count_nonzero(np.abs(a - b) > pixel_tolerance)) / a.size
+
+
+def ink_cells(thumbnail: np.ndarray, background: float, pixel_tolerance: float = 12.0) -> np.ndarray:
+    """ช่องที่มีตัวอักษร: ค่าเทาต่างจากสีพื้น (background) เกิน pixel_tolerance"""
+    return np.abs(thumbnail - background) > pixel_tolerance
+
+
+def ink_diff_ratio(a: np.ndarray, b: np.ndarray, pixel_tolerance: float = 12.0) -> float:
+    """
+    สัดส่วนช่องที่ต่างกัน เทียบกับช่องที่มีตัวอักษร (ไม่ใช่ทั้ง Grid)
+    ข้อความสั้นๆ หรือคำเดียวที่เปลี่ยน (Yes -> No, 10 -> 12) กินพื้นที่ไม่ถึง 1% ของ Grid
+    แต่เป็นสัดส่วนที่เห็นชัดของช่องที่มีตัวอักษร (สีพื้น = ค่ากลางของ Grid)
+    """
+    if a.shape != b.shape:
+        return 1.0
+    changed = np.count_nonzero(np.abs(a - b) > pixel_tolerance)
+    if not changed:
+        return 0.0
+    background = float(np.median(a))
+    ink = np.count_nonzero(ink_cells(a, background, pixel_tolerance) | ink_cells(b, background, pixel_tolerance))
+    return float(changed) / max(1, ink)
+
+
+def cursor_change(a: np.ndarray, b: np.ndarray, changed: np.ndarray, pixel_tolerance: float = 12.0,
+                  max_cells: int = 8) -> bool:
+    """
+    ความต่างเป็นแค่เคอร์เซอร์กระพริบ / ลูกศร "ถัดไป" หรือไม่: กลุ่มช่องที่ต่าง (changed) ต้องเล็ก
+    (ไม่เกิน max_cells ช่อง) อยู่รวมกัน และทุกช่องเป็นสีพื้นในภาพใดภาพหนึ่ง (ตัวอักษร "โผล่ / หายไป")
+    ถ้าเป็นช่องที่มีตัวอักษรทั้งสองภาพแต่ต่างกัน เช่น 10 -> 12 จะไม่นับเป็นเคอร์เซอร์
+    """
+    count = np.count_nonzero(changed)
+    if not max_cells or not count or count > max_cells:
+        return False
+    rows, cols = np.nonzero(changed)
+    if (rows.max() - rows.min() + 1) * (cols.max() - cols.min() + 1) > max_cells:
+        return False
+    background = float(np.median(a))
+    both = ink_cells(a, background, pixel_tolerance) & ink_cells(b, background, pixel_tolerance)
+    return not np.any(both & changed)
+
+
+# ====================================================================
+# II. Cache ผล OCR ตามลายนิ้วมือภาพ (ข้ามการเรียก Cloud Vision)
+# ====================================================================
+class OcrResultCache:
+    """
+    จับคู่ลายนิ้วมือของเฟรม -> (ข้อความต้นฉบับ, คำแปล) แบบจำกัดขนาด
+
+    ต้องเหมือนกันเกือบทุกช่อง: สัดส่วนช่องที่ต่างกันเทียบกับช่องที่มีตัวอักษร (ink_diff_ratio)
+    ต้องไม่เกิน max_diff_ratio (ค่าเริ่มต้น 0 = ต้องตรงกัน) เพราะคำเดียวหรือตัวเลขตัวเดียวที่เปลี่ยน
+    ก็ทำให้ความหมายเปลี่ยน ยกเว้นความต่างแบบเคอร์เซอร์กระพริบ / ลูกศร "ถัดไป":
+    กลุ่มช่องเล็กๆ ที่อยู่ติดกันไม่เกิน cursor_cells ช่อง และเป็นจุดที่ตัวอักษร "โผล่ / หายไป" บนสีพื้น
+    (ถ้าเป็นช่องที่มีตัวอักษรทั้งสองภาพแต่ต่างกัน เช่น 10 -> 12 จะไม่นับเป็นเคอร์เซอร์)
+
+    Args:
+        max_entries: จำนวนเฟรมที่จำไว้ (ตัดตัวที่ใช้ล่าสุดนานที่สุดออก)
+        grid_width, grid_height: ขนาด Grid ของลายนิ้วมือ
+        pixel_tolerance: ความต่างของค่าเทา (0-255) ที่ยังถือว่าช่องนั้นเหมือนเดิม
+        max_diff_ratio: สัดส่วนช่องที่ต่างได้สูงสุด เทียบกับช่องที่มีตัวอักษร
+        cursor_cells: ขนาดกลุ่มช่องที่ยอมให้ต่างได้แบบเคอร์เซอร์ (0 = ไม่ยอม)
+    """
+
+    def __init__(self, max_entries: int = 32, grid_width: int = 64, grid_height: int = 24,
+                 pixel_tolerance: float = 4.0, max_diff_ratio: float = 0.0, cursor_cells: int = 8,
+                 enabled: bool = True):
+        self.max_entries = max_entries
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.pixel_tolerance = pixel_tolerance
+        self.max_diff_ratio = max_diff_ratio
+        self.cursor_cells = cursor_cells
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # id -> (thumbnail, original, translated)
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, frame: np.ndarray) -> np.ndarray:
+        return frame_thumbnail(frame, self.grid_width, self.grid_height)
+
+    def _difference(self, a: np.ndarray, b: np.ndarray) -> Optional[float]:
+        """ค่าความต่าง (ยิ่งน้อยยิ่งเหมือน) ถ้าถือว่าเป็นเฟรมเดียวกัน ไม่งั้นคืน None"""
+        if a.shape != b.shape:
+            return None
+        changed = np.abs(a - b) > self.pixel_tolerance
+        if not changed.any():
+            return 0.0
+        ratio = ink_diff_ratio(a, b, self.pixel_tolerance)
+        if ratio <= self.max_diff_ratio or cursor_change(a, b, changed, self.pixel_tolerance, self.cursor_cells):
+            return ratio
+        return None
+
+    def lookup(self, thumbnail: np.ndarray) -> Optional[Tuple[str, str]]:
+        """คืน (original, translated) ของเฟรมที่คล้ายที่สุด หรือ None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            best_id, best_ratio = None, None
+            for entry_id, (thumb, _, _) in self._entries.items():
+                ratio = self._difference(thumbnail, thumb)
+                if ratio is not None and (best_ratio is None or ratio < best_ratio):
+                    best_id, best_ratio = entry_id, ratio
+            if best_id is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            _, original, translated = self._entries[best_id]
+            return original, translated
+
+    def store(self, thumbnail: np.ndarray, original: str, translated: str):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[self._next_id] = (thumbnail, original, translated)
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+            }
+
+
+def create_ocr_cache() -> OcrResultCache:
+    """สร้าง Cache ตามค่าใน settings (หมวด ocr_cache)"""
+    config = get_section('ocr_cache')
+    return OcrResultCache(
+        max_entries=config.get('max_entries', 32),
+        grid_width=config.get('grid_width', 64),
+        grid_height=config.get('grid_height', 24),
+        pixel_tolerance=config.get('pixel_tolerance', 4.0),
+        max_diff_ratio=config.get('max_diff_ratio', 0.0),
+        cursor_cells=config.get('cursor_cells', 8),
+        enabled=config.get('enabled', True),
+    )
@@ -1,27 +1,125 @@
+import time
+import threading
+
 from PyQt6.QtCore import QThread, pyqtSignal
-from pynput import keyboard
+
+from settings import get_section
+
+
+def describe_keys(keys: str) -> str:
+    """'<ctrl>+<alt>+t' -> 'Ctrl+Alt+T' (สำหรับแสดงบนหน้าจอ)"""
+    return '+'.join(part.strip('<>').capitalize() for part in keys.split('+'))
+
+
+class HotkeyGate:
+    """
+    กรองการกดคีย์ลัดรัวๆ ให้เหลือการทำงานครั้งเดียว (กดค้าง / กดซ้ำเร็วๆ จะไม่จับภาพ + เรียก Cloud ซ้ำ)
+
+    - throttle_ms: ทำงานทันทีที่กดครั้งแรก แล้วไม่สนใจการกดซ้ำภายในช่วงเวลานี้
+    - debounce_ms: รอจนไม่มีการกดเพิ่มนานเท่านี้ แล้วค่อยทำงานครั้งเดียว (ถ้าตั้งไว้จะใช้แทน throttle)
+
+    Args:
+        fire: ฟังก์ชันที่เรียกเมื่อผ่านเกณฑ์ (อาจถูกเรียกจาก Thread ของ Timer)
+    """
+
+    def __init__(self, fire, debounce_ms: int = 0, throttle_ms: int = 0):
+        self.fire = fire
+        self.debounce = max(0, debounce_ms) / 1000.0
+        self.throttle = max(0, throttle_ms) / 1000.0
+        self._lock = threading.Lock()
+        self._last_fire = float('-inf')
+        self._timer = None
+        self.presses = 0
+        self.fired = 0
+
+    def press(self):
+        with self._lock:
+            self.presses += 1
+            if self.debounce:
+                if self._timer is not None:
+                    self._timer.cancel()
+                self._timer = threading.Timer(self.debounce, self._fire_debounced)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+            now = time.monotonic()
+            if now - self._last_fire < self.throttle:
+                return
+            self._last_fire = now
+            self.fired += 1
+        self.fire()
+
+    def _fire_debounced(self):
+        with self._lock:
+            self._timer = None
+            self.fired += 1
+        self.fire()
+
+    def cancel(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'presses': self.presses, 'fired': self.fired, 'coalesced': self.presses - self.fired}
+
 
 class HotkeyListener(QThread):
     # Signal เดิม (Ctrl+Alt+T)
     on_trigger = pyqtSignal()
-    
+
     # Signal ใหม่สำหรับ Story Mode
     on_trigger_region_set = pyqtSignal()   # Ctrl+Alt+R (ตั้งค่าขอบ)
     on_trigger_story_translate = pyqtSignal() # Ctrl+Alt+E (เริ่มแปล)
+    on_trigger_story_watch = pyqtSignal()     # Ctrl+Alt+W (เปิด/ปิด โหมดเฝ้าดู)
+    on_trigger_region_add = pyqtSignal()      # Ctrl+Alt+A (เพิ่มพื้นที่ Story อีกจุด)
+
+    # ชื่อคำสั่งในหมวด hotkeys ของ settings -> (ชื่อเมธอดที่ส่ง Signal, คำอธิบาย)
+    ACTIONS = {
+        'capture': ('emit_signal', "Auto Capture & Translate"),
+        'region_set': ('emit_region_set', "Set Story Region"),
+        'story_translate': ('emit_story_translate', "Translate Story Region"),
+        'story_watch': ('emit_story_watch', "Toggle Story Watch"),
+        'region_add': ('emit_region_add', "Add Story Region"),
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.config = get_section('hotkeys')
+        self.gates = {}
+        for action, (method, _) in self.ACTIONS.items():
+            config = self.config.get(action, {})
+            self.gates[action] = HotkeyGate(getattr(self, method), config.get('debounce_ms', 0),
+                                            config.get('throttle_ms', 0))
+
+    def bindings(self) -> dict:
+        """คีย์ลัดจาก settings -> ฟังก์ชันที่รับการกด (ข้ามรายการที่รูปแบบคีย์ไม่ถูกต้อง)"""
+        from pynput import keyboard   # import ตอนใช้: pynput ต่อ Display ทันทีที่ import
+        bindings = {}
+        for i, (action, (_, label)) in enumerate(self.ACTIONS.items(), start=1):
+            keys = self.config.get(action, {}).get('keys')
+            if not keys:
+                continue
+            try:
+                keyboard.HotKey.parse(keys)
+            except ValueError as e:
+                print(f"Warning: คีย์ลัด '{keys}' ของ {action} ไม่ถูกต้อง: {e}")
+                continue
+            print(f"{i}. {keys} : {label}")
+            bindings[keys] = self.gates[action].press
+        return bindings
 
     def run(self):
+        from pynput import keyboard
         print("--- Hotkey Listener Started ---")
-        print("1. Ctrl+Alt+T : Auto Capture & Translate")
-        print("2. Ctrl+Alt+R : Set Story Region")
-        print("3. Ctrl+Alt+E : Translate Story Region")
-        
-        with keyboard.GlobalHotKeys({
-            '<ctrl>+<alt>+t': self.emit_signal,
-            '<ctrl>+<alt>+r': self.emit_region_set,
-            '<ctrl>+<alt>+e': self.emit_story_translate
-        }) as h:
+        with keyboard.GlobalHotKeys(self.bindings()) as h:
             h.join()
 
+    def stats(self) -> dict:
+        return {action: gate.stats() for action, gate in self.gates.items()}
+
     def emit_signal(self):
         print(">>> Hotkey: Standard Translate (T) <<<")
         self.on_trigger.emit()
@@ -32,4 +130,12 @@ class HotkeyListener(QThread):
 
     def emit_story_translate(self):
         print(">>> Hotkey: Story Translate (E) <<<")
-        self.on_trigger_story_translate.emit()
\ No newline at end of file
+        self.on_trigger_story_translate.emit()
+
+    def emit_story_watch(self):
+        print(">>> Hotkey: Story Watch (W) <<<")
+        self.on_trigger_story_watch.emit()
+
+    def emit_region_add(self):
+        print(">>> Hotkey: Add Region (A) <<<")
+        self.on_trigger_region_add.emit()
@@ -0,0 +1,357 @@
+import zlib
+import struct
+
+import numpy as np
+
+from settings import get_section
+
+
+# ====================================================================
+# I. Encoder: แปลงเฟรม BGRA ดิบจาก mss เป็นไฟล์ภาพสำหรับส่ง Cloud Vision
+# ====================================================================
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+
+
+def _png_from_rows(rows: np.ndarray, width: int, height: int, color_type: int, level: int) -> bytes:
+    # rows = array (h, 1 + w*channels) ที่คอลัมน์แรกเป็น Filter Byte (0 = None)
+    header = struct.pack(">2I5B", width, height, 8, color_type, 0, 0, 0)
+    return b"".join((
+        b"\x89PNG\r\n\x1a\n",
+        _png_chunk(b"IHDR", header),
+        _png_chunk(b"IDAT", zlib.compress(rows, level)),
+        _png_chunk(b"IEND", b""),
+    ))
+
+
+def encode_png(frame: np.ndarray, level: int = 1) -> bytes:
+    """
+    PNG สี (RGB) จากเฟรม BGRA โดยเขียนช่องสีลง Buffer ของ PNG โดยตรง (คัดลอกครั้งเดียว)
+
+    Args:
+        frame: array (h, w, 4) แบบ BGRA
+        level: ระดับการบีบอัด zlib (0-9) ค่าต่ำ = เร็วแต่ไฟล์ใหญ่
+    """
+    h, w = frame.shape[:2]
+    rows = np.zeros((h, 1 + w * 3), dtype=np.uint8)
+    pixels = rows[:, 1:].reshape(h, w, 3)
+    pixels[:, :, 0] = frame[:, :, 2]
+    pixels[:, :, 1] = frame[:, :, 1]
+    pixels[:, :, 2] = frame[:, :, 0]
+    return _png_from_rows(rows, w, h, 2, level)
+
+
+def to_grayscale(frame: np.ndarray) -> np.ndarray:
+    """BGRA -> Gray uint8 (ITU-R BT.601) ด้วยเลขจำนวนเต็ม"""
+    # แปลงเป็น uint16 ก่อนคูณ (29 + 150 + 77 = 256 -> สูงสุด 65280 ไม่ล้น) ไม่พึ่งกฎ Type Promotion ของ NumPy แต่ละรุ่น
+    gray = frame[:, :, 0].astype(np.uint16)
+    gray *= 29
+    gray += frame[:, :, 1].astype(np.uint16) * 150
+    gray += frame[:, :, 2].astype(np.uint16) * 77
+    return (gray >> 8).astype(np.uint8)
+
+
+def encode_gray_png(frame: np.ndarray, level: int = 1) -> bytes:
+    """PNG ขาวดำ 8 บิต (ข้อมูลน้อยกว่า RGB 3 เท่าก่อนบีบอัด)"""
+    gray = frame if frame.ndim == 2 else to_grayscale(frame)
+    h, w = gray.shape
+    rows = np.zeros((h, 1 + w), dtype=np.uint8)
+    rows[:, 1:] = gray
+    return _png_from_rows(rows, w, h, 0, level)
+
+
+def encode_jpeg(frame: np.ndarray, quality: int = 90) -> bytes:
+    """
+    JPEG ผ่าน QImage ของ Qt (ห่อ Buffer BGRA เดิมโดยไม่คัดลอก)
+
+    Args:
+        quality: คุณภาพ JPEG (1-100)
+    """
+    from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
+    from PyQt6.QtGui import QImage
+
+    frame = np.ascontiguousarray(frame)
+    if frame.ndim == 2:
+        h, w = frame.shape
+        image = QImage(frame.data, w, h, frame.strides[0], QImage.Format.Format_Grayscale8)
+    else:
+        h, w = frame.shape[:2]
+        # BGRA ในหน่วยความจำ (Little Endian) ตรงกับ Format_RGB32 ของ Qt
+        image = QImage(frame.data, w, h, frame.strides[0], QImage.Format.Format_RGB32)
+
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    if not image.save(buffer, "JPG", quality):
+        raise RuntimeError("ไม่สามารถเข้ารหัส JPEG ได้ (ไม่พบ Plugin qjpeg ของ Qt)")
+    buffer.close()
+    return bytes(data)
+
+
+def decode_image(data: bytes) -> np.ndarray:
+    """
+    ถอดรหัสไฟล์ภาพ (PNG / JPEG / BMP ฯลฯ ที่ Qt รองรับ) เป็นเฟรม BGRA แบบเดียวกับที่ได้จาก mss
+
+    Raises:
+        ValueError: ไฟล์เสีย หรือเป็นรูปแบบที่ Qt ไม่รองรับ
+    """
+    from PyQt6.QtGui import QImage
+
+    image = QImage.fromData(data)
+    if image.isNull():
+        raise ValueError("ไม่สามารถอ่านไฟล์ภาพได้ (ไฟล์เสีย หรือไม่รองรับรูปแบบนี้)")
+    image = image.convertToFormat(QImage.Format.Format_RGB32)
+    w, h = image.width(), image.height()
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    rows = np.frombuffer(bits, dtype=np.uint8).reshape(h, image.bytesPerLine())
+    return rows[:, :w * 4].reshape(h, w, 4).copy()
+
+
+class ImageEncoder:
+    """
+    เลือกรูปแบบไฟล์ที่ส่งให้ Cloud Vision
+
+    Args:
+        format: 'png' | 'png_gray' | 'jpeg'
+        png_level: ระดับการบีบอัด PNG (0-9)
+        jpeg_quality: คุณภาพ JPEG (1-100)
+    """
+
+    FORMATS = ('png', 'png_gray', 'jpeg')
+
+    def __init__(self, format: str = 'png', png_level: int = 1, jpeg_quality: int = 90):
+        if format not in self.FORMATS:
+            raise ValueError(f"Unknown image format: {format} (ใช้ได้: {', '.join(self.FORMATS)})")
+        self.format = format
+        self.png_level = png_level
+        self.jpeg_quality = jpeg_quality
+
+    def encode(self, frame: np.ndarray) -> bytes:
+        if self.format == 'jpeg':
+            return encode_jpeg(frame, self.jpeg_quality)
+        if self.format == 'png_gray':
+            return encode_gray_png(frame, self.png_level)
+        if frame.ndim == 2:
+            return encode_gray_png(frame, self.png_level)
+        return encode_png(frame, self.png_level)
+
+
+# ====================================================================
+# II. Preprocess: ลดขนาดภาพก่อนส่ง OCR (NumPy ล้วน)
+# ====================================================================
+def content_bounds(gray: np.ndarray, tolerance: int = 10, margin: int = 4):
+    """
+    หาขอบเขตของเนื้อหา โดยถือว่าสีที่มุมซ้ายบนเป็นสีพื้น (เช่น พื้นหลังกล่องข้อความ)
+
+    Args:
+        gray: ภาพสีเทา (h, w)
+        tolerance: ความต่างของค่าเทาที่ยังถือว่าเป็นพื้น
+        margin: เว้นขอบไว้รอบเนื้อหา (พิกเซล) เพื่อไม่ให้ตัวอักษรชิดขอบเกินไป
+
+    Returns:
+        (top, bottom, left, right) สำหรับ Slice ภาพ (ทั้งภาพถ้าไม่พบเนื้อหา)
+    """
+    background = gray[0, 0]
+    # |gray - background| แบบ uint8 โดยไม่ต้องแปลงชนิดข้อมูลทั้งภาพ
+    content = (np.maximum(gray, background) - np.minimum(gray, background)) > tolerance
+
+    rows = np.flatnonzero(content.any(axis=1))
+    cols = np.flatnonzero(content.any(axis=0))
+    h, w = gray.shape
+    if rows.size == 0 or cols.size == 0:
+        return 0, h, 0, w
+    return (max(0, rows[0] - margin), min(h, rows[-1] + 1 + margin),
+            max(0, cols[0] - margin), min(w, cols[-1] + 1 + margin))
+
+
+def trim_borders(image: np.ndarray, tolerance: int = 10, margin: int = 4) -> np.ndarray:
+    """ตัดขอบสีพื้นรอบข้อความออก (รับได้ทั้ง BGRA และ Gray)"""
+    gray = to_grayscale(image) if image.ndim == 3 else image
+    top, bottom, left, right = content_bounds(gray, tolerance, margin)
+    return image[top:bottom, left:right]
+
+
+def text_row_spans(gray: np.ndarray, tolerance: int = 30):
+    """
+    หาช่วงแถวที่มีหมึกต่อกันจาก Projection แนวนอน (1 ช่วง = 1 บรรทัดข้อความโดยประมาณ)
+
+    Returns:
+        (starts, ends) array ของแถวเริ่ม / แถวจบ (ไม่รวม) ของแต่ละช่วง
+    """
+    background = np.median(gray[:, :: max(1, gray.shape[1] // 64)])
+    ink_rows = (np.abs(gray.astype(np.int16) - int(background)) > tolerance).any(axis=1)
+    # หาจุดเริ่ม/จบของแต่ละช่วงแถวที่มีหมึก
+    edges = np.diff(np.concatenate(([0], ink_rows.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def estimate_text_height(gray: np.ndarray, tolerance: int = 30) -> int:
+    """
+    ประมาณความสูงของบรรทัดข้อความจาก Projection แนวนอน
+
+    Returns:
+        ความสูงบรรทัด (ค่ากลาง) หน่วยพิกเซล หรือ 0 ถ้าหาไม่เจอ
+    """
+    starts, ends = text_row_spans(gray, tolerance)
+    if starts.size == 0:
+        return 0
+    return int(np.median(ends - starts))
+
+
+def _box_shrink(image: np.ndarray, k: int) -> np.ndarray:
+    # ย่อลง k เท่าแบบเฉลี่ยช่อง k x k (บวกทีละ Slice ซึ่งเร็วกว่า reduceat มาก)
+    h, w = image.shape[0] // k, image.shape[1] // k
+    acc = np.zeros((h, w) + image.shape[2:], dtype=np.uint16)
+    for dy in range(k):
+        for dx in range(k):
+            acc += image[dy:h * k:k, dx:w * k:k]
+    acc //= k * k
+    return acc.astype(np.uint8)
+
+
+def _linear_resize_axis(image: np.ndarray, new_size: int, axis: int) -> np.ndarray:
+    size = image.shape[axis]
+    pos = np.clip((np.arange(new_size) + 0.5) * (size / new_size) - 0.5, 0, size - 1)
+    lo = pos.astype(np.intp)
+    hi = np.minimum(lo + 1, size - 1)
+    weight = (pos - lo).astype(np.float32)
+    shape = [1] * image.ndim
+    shape[axis] = new_size
+    weight = weight.reshape(shape)
+    a = np.take(image, lo, axis=axis).astype(np.float32)
+    b = np.take(image, hi, axis=axis).astype(np.float32)
+    return a + (b - a) * weight
+
+
+def downscale(image: np.ndarray, factor: float) -> np.ndarray:
+    """
+    ย่อภาพ (factor < 1) ใช้ได้ทั้ง Gray และ BGRA
+    ส่วนที่เป็นจำนวนเท่าใช้การเฉลี่ยช่อง (กัน Aliasing) ส่วนที่เหลือใช้ Bilinear
+    """
+    k = int(1.0 / factor)
+    if k >= 2:
+        image = _box_shrink(image, k)
+        factor *= k
+    if factor < 0.999:
+        h, w = image.shape[:2]
+        resized = _linear_resize_axis(image, max(1, int(round(h * factor))), 0)
+        resized = _linear_resize_axis(resized, max(1, int(round(w * factor))), 1)
+        image = np.clip(resized + 0.5, 0, 255).astype(np.uint8)
+    return image
+
+
+def stretch_contrast(gray: np.ndarray, low_percentile: float = 2, high_percentile: float = 98) -> np.ndarray:
+    """ยืดช่วงค่าเทาให้เต็ม 0-255 (ช่วยฟอนต์เกมที่สีจางบนพื้นหลังใกล้เคียงกัน)"""
+    low, high = np.percentile(gray, (low_percentile, high_percentile))
+    if high - low < 1:
+        return gray
+    stretched = (gray.astype(np.float32) - low) * (255.0 / (high - low))
+    return np.clip(stretched, 0, 255).astype(np.uint8)
+
+
+def binarize(gray: np.ndarray) -> np.ndarray:
+    """แปลงเป็นขาว-ดำด้วย Otsu threshold ให้ตัวหนังสือเป็นสีดำบนพื้นขาวเสมอ"""
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    weights = np.cumsum(hist)
+    means = np.cumsum(hist * np.arange(256))
+    total_weight, total_mean = weights[-1], means[-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        between = (total_mean * weights - means * total_weight) ** 2 / (weights * (total_weight - weights))
+    threshold = int(np.nanargmax(between))
+    binary = np.where(gray > threshold, np.uint8(255), np.uint8(0))
+    # พื้นหลังส่วนใหญ่ควรเป็นสีขาว ถ้าไม่ใช่ (ตัวหนังสือสว่างบนพื้นมืด) ให้กลับสี
+    if np.count_nonzero(binary) < binary.size // 2:
+        binary = 255 - binary
+    return binary
+
+
+class ImagePreprocessor:
+    """
+    ขั้นตอนเตรียมภาพก่อนส่ง OCR (เปิด/ปิดได้ทีละขั้น)
+
+    1. trim_borders  - ตัดขอบสีพื้นรอบข้อความ
+    2. grayscale     - เหลือช่องเดียว (ข้อมูลลดลง 3 เท่า)
+    3. downscale     - ย่อให้ตัวหนังสือสูงประมาณ target_text_height (ย่อเท่านั้น ไม่ขยาย)
+    4. contrast      - ยืด Contrast
+    5. binarize      - ขาว-ดำ (Otsu)
+    """
+
+    def __init__(self, enabled: bool = True, trim_borders: bool = True, border_tolerance: int = 10,
+                 grayscale: bool = True, target_text_height: int = 0, contrast: bool = False,
+                 binarize: bool = False):
+        self.enabled = enabled
+        self.trim_borders = trim_borders
+        self.border_tolerance = border_tolerance
+        self.grayscale = grayscale
+        self.target_text_height = target_text_height
+        self.contrast = contrast
+        self.binarize = binarize
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        """คืนภาพที่ผ่านการเตรียมแล้ว (BGRA หรือ Gray 2 มิติ)"""
+        if not self.enabled:
+            return frame
+        # แปลงเป็นสีเทาครั้งเดียว ใช้ทั้งหาขอบ ประเมินขนาดตัวอักษร และเป็นผลลัพธ์
+        gray = to_grayscale(frame) if frame.ndim == 3 else frame
+        image = gray if (self.grayscale or self.contrast or self.binarize) else frame
+
+        if self.trim_borders:
+            top, bottom, left, right = content_bounds(gray, self.border_tolerance)
+            gray = gray[top:bottom, left:right]
+            image = image[top:bottom, left:right]
+
+        if self.target_text_height:
+            text_height = estimate_text_height(gray)
+            if text_height > self.target_text_height:
+                # จำกัดการย่อไม่เกิน 4 เท่า กันกรณีหลายบรรทัดติดกันจนประเมินความสูงเกินจริง
+                image = downscale(image, max(0.25, self.target_text_height / text_height))
+
+        if image.ndim == 2:
+            if self.contrast:
+                image = stretch_contrast(image)
+            if self.binarize:
+                image = binarize(image)
+        return image
+
+
+class ImagePipeline:
+    """Preprocess + Encode: รับเฟรม BGRA ดิบ คืนไฟล์ภาพพร้อมส่ง Cloud Vision"""
+
+    def __init__(self, preprocessor: ImagePreprocessor = None, encoder: ImageEncoder = None):
+        self.preprocessor = preprocessor or ImagePreprocessor(enabled=False)
+        self.encoder = encoder or ImageEncoder()
+
+    def run(self, frame: np.ndarray) -> bytes:
+        return self.encoder.encode(self.preprocessor.process(frame))
+
+
+# ====================================================================
+# III. สร้างจาก settings
+# ====================================================================
+def create_image_encoder() -> ImageEncoder:
+    """สร้าง Encoder ตามค่าใน settings (หมวด image_encoding)"""
+    config = get_section('image_encoding')
+    return ImageEncoder(
+        format=config.get('format', 'png'),
+        png_level=config.get('png_level', 1),
+        jpeg_quality=config.get('jpeg_quality', 90),
+    )
+
+
+def create_image_preprocessor() -> ImagePreprocessor:
+    """สร้าง Preprocessor ตามค่าใน settings (หมวด preprocess)"""
+    config = get_section('preprocess')
+    return ImagePreprocessor(
+        enabled=config.get('enabled', True),
+        trim_borders=config.get('trim_borders', True),
+        border_tolerance=config.get('border_tolerance', 10),
+        grayscale=config.get('grayscale', True),
+        target_text_height=config.get('target_text_height', 0),
+        contrast=config.get('contrast', False),
+        binarize=config.get('binarize', False),
+    )
+
+
+def create_image_pipeline() -> ImagePipeline:
+    return ImagePipeline(create_image_preprocessor(), create_image_encoder())
@@ -0,0 +1,178 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from settings import get_section
+
+# งานที่กำลังทำใน Thread นี้: (pool, job_id, channel, context) สำหรับ report_progress
+_local = threading.local()
+
+EVICTED_MESSAGE = "งานถูกยกเลิกเพราะมีงานอื่นรอคิวมากเกินไป"
+
+
+def report_progress(value):
+    """
+    ส่งผลบางส่วนของงานที่กำลังทำอยู่ใน Thread นี้ (เช่น ข้อความ OCR ก่อนได้คำแปล) ออกทาง job_progress
+    เรียกนอกงานของ Pool จะไม่ทำอะไร
+    """
+    job = getattr(_local, 'job', None)
+    if job is not None:
+        pool, job_id, channel, context = job
+        pool._progress(job_id, channel, value, context)
+
+
+def progress_reporter():
+    """
+    คืนฟังก์ชันแบบ report_progress ที่ผูกกับงานปัจจุบันของ Thread นี้ไว้แล้ว
+    ใช้ส่งต่อให้โค้ดที่เรียก Callback จาก Thread อื่น (เช่น Event Loop ของ async_engine)
+    """
+    job = getattr(_local, 'job', None)
+    if job is None:
+        return lambda value: None
+    pool, job_id, channel, context = job
+    return lambda value: pool._progress(job_id, channel, value, context)
+
+
+class CloudJobPool(QObject):
+    """
+    Thread Pool ขนาดจำกัดสำหรับงานที่เรียก Cloud (แทนการสร้าง QThread ใหม่ทุกครั้ง)
+
+    งานแต่ละชิ้นมี job_id และอยู่ใน "ช่อง" (channel) เช่น 'overlay', 'manual', 'watch'
+    - งานใหม่ในช่องเดียวกันจะแทนที่งานเก่า (latest-wins):
+        งานเก่าที่ยังไม่เริ่มจะถูกยกเลิก งานเก่าที่กำลังทำอยู่จะถูกทิ้งผลลัพธ์
+    - คิวรวมของงานที่ยังไม่เริ่มยาวได้ไม่เกิน max_pending (ตัดงานเก่าสุดทิ้ง)
+        งานที่ถูกตัดทิ้งจะได้ job_failed พร้อม EVICTED_MESSAGE เพื่อให้ผู้ส่งคืนสถานะ (เช่น ปลดล็อก Watcher / ปุ่ม)
+
+    Signal ถูกส่งจาก Thread ของ Pool แต่ Qt จะส่งต่อเข้า GUI Thread ให้อัตโนมัติ (Queued Connection)
+    """
+    # (job_id, channel, ผลลัพธ์ของฟังก์ชัน, context ที่ส่งมาตอน submit)
+    job_finished = pyqtSignal(int, str, object, object)
+    # (job_id, channel, ข้อความ Error, context)
+    job_failed = pyqtSignal(int, str, str, object)
+    # (job_id, channel, ผลบางส่วนจาก report_progress, context) ส่งก่อน job_finished ได้หลายครั้ง
+    job_progress = pyqtSignal(int, str, object, object)
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 2, parent=None):
+        super().__init__(parent)
+        self.max_pending = max(1, max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="CloudJob")
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._latest = {}               # channel -> job_id ล่าสุด
+        self._pending = OrderedDict()   # job_id -> (channel, future, context) ที่ยังไม่เริ่มทำงาน
+        self.submitted = 0
+        self.cancelled = 0
+        self.dropped = 0
+        self.completed = 0
+
+    def _new_id(self) -> int:
+        job_id = self._next_id
+        self._next_id += 1
+        return job_id
+
+    def _cancel_pending(self, channel: str = None):
+        for job_id, (job_channel, future, _) in list(self._pending.items()):
+            if channel is None or job_channel == channel:
+                del self._pending[job_id]
+                if future.cancel():
+                    self.cancelled += 1
+
+    def submit(self, channel: str, fn, *args, context=None) -> int:
+        """
+        ส่งงานเข้า Pool
+
+        Args:
+            channel: ชื่อช่อง งานใหม่จะแทนที่งานเก่าในช่องเดียวกัน
+            fn: ฟังก์ชันที่รันใน Thread ของ Pool (raise Exception = ล้มเหลว)
+            context: ข้อมูลใดๆ ที่จะส่งกลับมาพร้อมผลลัพธ์
+
+        Returns:
+            job_id ของงานนี้
+        """
+        evicted = []
+        with self._lock:
+            job_id = self._new_id()
+            self._latest[channel] = job_id
+            self._cancel_pending(channel)
+            while len(self._pending) >= self.max_pending:
+                old_id, (old_channel, future, old_context) = self._pending.popitem(last=False)
+                if future.cancel():
+                    self.cancelled += 1
+                    evicted.append((old_id, old_channel, old_context))
+            future = self._executor.submit(self._run, job_id, channel, fn, args, context)
+            self._pending[job_id] = (channel, future, context)
+            self.submitted += 1
+        # ส่งนอก Lock: ผู้รับใน GUI Thread อาจถูกเรียกทันที (Direct Connection) แล้วเรียก Pool ต่อ
+        for old_id, old_channel, old_context in evicted:
+            self.job_failed.emit(old_id, old_channel, EVICTED_MESSAGE, old_context)
+        return job_id
+
+    def cancel(self, channel: str):
+        """ยกเลิก/ทิ้งผลของทุกงานในช่องนี้"""
+        with self._lock:
+            self._latest[channel] = self._new_id()
+            self._cancel_pending(channel)
+
+    def is_current(self, channel: str, job_id: int) -> bool:
+        with self._lock:
+            return self._latest.get(channel) == job_id
+
+    def _run(self, job_id: int, channel: str, fn, args, context):
+        with self._lock:
+            self._pending.pop(job_id, None)
+        if not self.is_current(channel, job_id):
+            with self._lock:
+                self.dropped += 1
+            return
+
+        error = None
+        _local.job = (self, job_id, channel, context)
+        try:
+            result = fn(*args)
+        except Exception as e:
+            result, error = None, str(e) or type(e).__name__
+        finally:
+            _local.job = None
+
+        # มีงานใหม่กว่าในช่องเดียวกันแล้ว -> ทิ้งผลลัพธ์ (ไม่ให้ผลเก่าทับผลใหม่)
+        with self._lock:
+            if self._latest.get(channel) != job_id:
+                self.dropped += 1
+                return
+            self.completed += 1
+        if error is None:
+            self.job_finished.emit(job_id, channel, result, context)
+        else:
+            self.job_failed.emit(job_id, channel, error, context)
+
+    def _progress(self, job_id: int, channel: str, value, context):
+        # งานที่ถูกแทนที่แล้วไม่ต้องแสดงผลบางส่วน
+        if self.is_current(channel, job_id):
+            self.job_progress.emit(job_id, channel, value, context)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'cancelled': self.cancelled,
+                'dropped': self.dropped,
+                'pending': len(self._pending),
+            }
+
+    def shutdown(self):
+        with self._lock:
+            self._cancel_pending()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def create_cloud_pool(parent=None) -> CloudJobPool:
+    """สร้าง Pool ตามค่าใน settings (หมวด cloud_pool)"""
+    config = get_section('cloud_pool')
+    return CloudJobPool(
+        max_workers=config.get('max_workers', 2),
+        max_pending=config.get('max_pending', 2),
+        parent=parent,
+    )
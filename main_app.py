@@ -1,62 +1,137 @@
 import os
 import sys
+from collections import OrderedDict
 os.environ["QT_ENABLE_HIGHDPI_SCALING"] = "1"
 os.environ["QT_AUTO_SCREEN_SCALE_FACTOR"] = "1"
-import mss
-import mss.tools
-from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QLabel, 
+from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QLabel, QInputDialog,
                              QVBoxLayout, QTextEdit, QPushButton, QFrame, QHBoxLayout)
-from PyQt6.QtCore import Qt, QRect, QPoint, QThread, pyqtSignal
+from PyQt6.QtCore import Qt, QRect, QPoint, QTimer, pyqtSignal
 from PyQt6.QtGui import QPainter, QPen, QColor, QCursor, QFont
 
 # Import โมดูลของคุณ (ตรวจสอบว่าไฟล์เหล่านี้อยู่ครบ)
-from hotkey_listener import HotkeyListener
-from cloud_processor import process_and_translate, translate_content
+from hotkey_listener import HotkeyListener, describe_keys
+from job_pool import create_cloud_pool, progress_reporter, report_progress
+from settings import get_section
+from story_watcher import StoryWatcher
+from capture_service import capture_service
+from frame_tools import create_ocr_cache
+from image_pipeline import create_image_pipeline
+from tiled_ocr import create_tiled_ocr
+from warmup import Warmup
+import tracing
+
+# AsyncCloudEngine (ถ้าเปิดใน settings) สร้างใน load_cloud_processor ใช้ได้หลัง cloud_warmup.result()
+async_engine = None
+
+
+def load_cloud_processor():
+    # cloud_processor ดึง google.cloud.vision / translate_v2 / grpc / protobuf มาด้วย (หลายร้อย ms)
+    # จึงไม่ import ตอนเปิดโปรแกรม แต่โหลดใน Background หลังหน้าต่างหลักขึ้นแล้ว
+    global async_engine
+    import cloud_processor
+    # เปิด Connection ไปยัง Google ล่วงหน้า เพื่อให้การกดคีย์ลัดครั้งแรกไม่ต้องรอ TLS
+    cloud_processor.client_manager.prewarm()
+    cloud_processor.translation_memory.preload()
+    # ถ้าเปิด async_engine ใน settings งาน OCR + แปลทั้งหมดจะวิ่งบน Event Loop เดียว
+    # (สร้างที่นี่ ไม่ใช่ตอน import: async_engine import cloud_processor ซึ่งโหลดช้า)
+    if get_section('async_engine').get('enabled'):
+        from async_engine import create_async_engine
+        async_engine = create_async_engine().start()
+    return cloud_processor
+
+
+# งาน Cloud เรียก cloud_warmup.result() ก่อนใช้ (รอเฉพาะกรณีที่ยังโหลดไม่เสร็จ)
+cloud_warmup = Warmup(load_cloud_processor, name="CloudWarmup")
+
+# เตรียม + เข้ารหัสภาพหน้าจอก่อนส่ง Cloud (ปรับได้ในหมวด preprocess / image_encoding ของ settings.json)
+upload_pipeline = create_image_pipeline()
+# พื้นที่ Story ขนาดใหญ่: OCR ใหม่เฉพาะแถบบรรทัดที่เปลี่ยน (หมวด tiled_ocr)
+tiled_ocr = create_tiled_ocr(upload_pipeline)
 
 # ====================================================================
-# 1. Worker Thread (Logic เดิม ไม่มีการแก้ไข)
+# 1. Cloud Jobs (รันใน CloudJobPool แทนการสร้าง QThread ทุกครั้ง)
 # ====================================================================
-class CloudWorker(QThread):
-    finished = pyqtSignal(str, str)
-    error = pyqtSignal(str)
-
-    def __init__(self, image_data):
-        super().__init__()
-        self.image_data = image_data
-
-    def run(self):
-        try:
-            original, translated = process_and_translate(self.image_data)
-            if original:
-                self.finished.emit(original, translated)
-            else:
-                self.error.emit("ไม่พบข้อความ หรือ เกิดข้อผิดพลาด")
-        except Exception as e:
-            self.error.emit(str(e))
-
-class ManualTranslateWorker(QThread):
-    finished = pyqtSignal(str)
-    error = pyqtSignal(str)
-
-    def __init__(self, text):
-        super().__init__()
-        self.text = text
-
-    def run(self):
-        try:
-            translated = translate_content(self.text)
-            if translated:
-                self.finished.emit(translated)
-            else:
-                self.error.emit("ไม่สามารถแปลข้อความได้")
-        except Exception as e:
-            self.error.emit(str(e))
+class CloudJobError(Exception):
+    pass
+
+
+
+
+def ocr_translate_job(image_data):
+    """
+    งาน OCR + แปล คืน (original, translated) หรือ raise CloudJobError
+    ส่งข้อความต้นฉบับออกทาง job_progress ทันทีที่ OCR เสร็จ (Overlay แสดงต้นฉบับระหว่างรอคำแปล)
+    """
+    cloud = cloud_warmup.result()
+    if async_engine is not None:
+        # Callback ถูกเรียกบน Thread ของ Event Loop -> ผูกกับงานนี้ไว้ก่อน
+        original, translated = async_engine.process_and_translate_sync(image_data, on_ocr=progress_reporter())
+    else:
+        original, translated = cloud.process_and_translate(image_data, on_ocr=report_progress)
+    if not original:
+        raise CloudJobError("ไม่พบข้อความ หรือ เกิดข้อผิดพลาด")
+    return original, translated
+
+
+def ocr_translate_tiled_job(frame):
+    """งาน OCR แบบแบ่งแถบ (ส่งเฉพาะแถบที่เปลี่ยน) + แปลทีละประโยค รับเฟรมดิบแทนไฟล์ภาพ"""
+    cloud = cloud_warmup.result()
+    original = tiled_ocr.recognize(frame)
+    if not original:
+        raise CloudJobError("ไม่พบข้อความ หรือ เกิดข้อผิดพลาด")
+    report_progress(original)
+    with tracing.span('translate', chars=len(original)):
+        translated = cloud.translate_incremental(original)
+    return original, translated or cloud.TRANSLATE_FAILED_MESSAGE
+
+
+def label_regions(names, texts):
+    """รวมข้อความของหลายพื้นที่ โดยขึ้นต้นแต่ละส่วนด้วยชื่อพื้นที่ (ข้ามพื้นที่ที่ไม่มีข้อความ)"""
+    return "\n\n".join(f"[{name}] {text}" for name, text in zip(names, texts) if text)
+
+
+def ocr_translate_regions_job(names, images, cached=None, remember=None):
+    """
+    งาน OCR + แปล หลายพื้นที่ Story พร้อมกัน (Vision 1 Request + Translate 1 Request)
+    คืน (original, translated) ที่รวมผลทุกพื้นที่ โดยขึ้นต้นแต่ละส่วนด้วยชื่อพื้นที่
+
+    cached: ผล (original, translated) ของแต่ละพื้นที่ที่ได้จาก OCR Cache ตามลำดับ names (None = ต้อง OCR)
+        images มีเฉพาะภาพของพื้นที่ที่ต้อง OCR ตามลำดับเดียวกัน
+    remember: เรียก remember(index, original, translated) เมื่อพื้นที่ใดได้ผลใหม่ (จำลง OCR Cache ของพื้นที่นั้น)
+    """
+    cached = cached or [None] * len(names)
+    pending = [i for i, hit in enumerate(cached) if hit is None]
+    originals = [hit[0] if hit else None for hit in cached]
+    translations = [hit[1] if hit else None for hit in cached]
+
+    def on_ocr(texts):
+        for i, text in zip(pending, texts):
+            originals[i] = text
+        report_progress(label_regions(names, originals))
+
+    results = cloud_warmup.result().process_and_translate_many(images, on_ocr=on_ocr)
+    for i, (original, translated) in zip(pending, results):
+        originals[i] = original
+        translations[i] = translated if original else None
+        if original and remember is not None:
+            remember(i, original, translated)
+    if not any(originals):
+        raise CloudJobError("ไม่พบข้อความ หรือ เกิดข้อผิดพลาด")
+    return label_regions(names, originals), label_regions(names, translations)
+
+
+def manual_translate_job(text):
+    # ข้อความที่พิมพ์เองไม่มีความคลาดเคลื่อนจาก OCR -> ไม่ใช้คำแปลของประโยคที่แค่ "ใกล้เคียง"
+    translated = cloud_warmup.result().translate_content(text, use_memory=False)
+    if not translated:
+        raise CloudJobError("ไม่สามารถแปลข้อความได้")
+    return translated
 
 # ====================================================================
 # 2. หน้าต่างสำหรับลากคลุมพื้นที่ (Logic เดิม ไม่มีการแก้ไข)
 # ====================================================================
 class SelectionOverlay(QWidget):
-    on_selected = pyqtSignal(bytes)
+    on_selected = pyqtSignal(bytes, object)  # (ภาพ, Trace)
 
     def __init__(self):
         super().__init__()
@@ -135,17 +210,21 @@ class SelectionOverlay(QWidget):
         y = int(y * scale_factor)
         w = int(w * scale_factor)
         h = int(h * scale_factor)
-        with mss.mss() as sct:
+        trace = tracing.start_trace('selection')
+        with tracing.activate(trace):
             monitor = {"top": y, "left": x, "width": w, "height": h}
-            sct_img = sct.grab(monitor)
-            img_bytes = mss.tools.to_png(sct_img.rgb, sct_img.size)
-            self.on_selected.emit(img_bytes)
+            with tracing.span('capture', width=w, height=h):
+                frame = capture_service.grab(monitor)
+            with tracing.span('encode') as info:
+                img_bytes = upload_pipeline.run(frame)
+                info['bytes'] = len(img_bytes)
+            self.on_selected.emit(img_bytes, trace)
 
 # ====================================================================
 # 3. หน้าต่าง Manual Translate (ปรับปรุง UI)
 # ====================================================================
 class TranslateWindow(QWidget):
-    def __init__(self):
+    def __init__(self, cloud_pool):
         super().__init__()
         self.setWindowTitle("Torslate - Manual Translate")
         self.resize(900, 600)
@@ -253,7 +332,10 @@ class TranslateWindow(QWidget):
         main_layout.addWidget(self.th_edit)
         main_layout.addLayout(th_bottom_layout)
 
-        self.manual_worker = None
+        # งานแปลใช้ Pool เดียวกับหน้าต่างหลัก (ช่อง 'manual' กดซ้ำ = ใช้ผลล่าสุดเท่านั้น)
+        self.cloud_pool = cloud_pool
+        self.cloud_pool.job_finished.connect(self.on_job_finished)
+        self.cloud_pool.job_failed.connect(self.on_job_failed)
 
     def set_ocr_result(self, original: str, translated: str):
         self.en_edit.setPlainText(original)
@@ -267,10 +349,15 @@ class TranslateWindow(QWidget):
         self.enter_btn.setText("Working...")
         self.th_edit.clear()
 
-        self.manual_worker = ManualTranslateWorker(text)
-        self.manual_worker.finished.connect(self.on_manual_finished)
-        self.manual_worker.error.connect(self.on_manual_error)
-        self.manual_worker.start()
+        self.cloud_pool.submit('manual', manual_translate_job, text)
+
+    def on_job_finished(self, job_id, channel, result, context):
+        if channel == 'manual':
+            self.on_manual_finished(result)
+
+    def on_job_failed(self, job_id, channel, error_msg, context):
+        if channel == 'manual':
+            self.on_manual_error(error_msg)
 
     def on_manual_finished(self, translated: str):
         self.th_edit.setPlainText(translated)
@@ -341,6 +428,20 @@ class OverlayResultWindow(QWidget):
         
         frame_layout.addWidget(self.text_display)
 
+        # แสดงระหว่างที่มีแต่ต้นฉบับ (OCR เสร็จแล้ว กำลังรอคำแปล)
+        self.pending_label = QLabel("กำลังแปล...")
+        self.pending_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.pending_label.setStyleSheet("font-size: 12px; font-weight: normal; color: rgba(255, 255, 255, 160);")
+        self.pending_label.hide()
+        frame_layout.addWidget(self.pending_label)
+
+        # เวลาที่ใช้ของ Request ล่าสุด (เปิดได้ที่ tracing.overlay_readout)
+        self.latency_label = QLabel()
+        self.latency_label.setAlignment(Qt.AlignmentFlag.AlignRight)
+        self.latency_label.setStyleSheet("font-size: 11px; font-weight: normal; color: rgba(255, 255, 255, 140);")
+        self.latency_label.hide()
+        frame_layout.addWidget(self.latency_label)
+
         # --- Header Container (Floating Layer บนสุด) ---
         # หมายเหตุ: เราสร้าง Header ให้เป็นลูกของ self แต่ *ไม่ได้* addWidget เข้า layout
         # เพื่อให้มันลอยอยู่เหนือ content โดยไม่ดันข้อความลงมา
@@ -427,6 +528,23 @@ class OverlayResultWindow(QWidget):
         self.is_showing_translated = True
         self.text_display.setText(translated)
         self.btn_swap.setText("Show Original (Eng)")
+        self.btn_swap.setEnabled(True)
+        self.pending_label.hide()
+
+    def set_pending(self, original):
+        """แสดงต้นฉบับไปก่อน พร้อมบอกว่ากำลังแปล (set_content จะสลับเป็นคำแปลเมื่อได้ผล)"""
+        self.original_text = original
+        self.translated_text = ""
+
+        self.is_showing_translated = False
+        self.text_display.setText(original)
+        self.btn_swap.setText("Show Translated (Thai)")
+        self.btn_swap.setEnabled(False)
+        self.pending_label.show()
+
+    def set_latency(self, text):
+        self.latency_label.setText(text)
+        self.latency_label.setVisible(bool(text))
 
     def toggle_view(self):
         if self.is_showing_translated:
@@ -458,7 +576,11 @@ class MainController(QMainWindow):
         title.setStyleSheet("font-size: 30px; color: #00e5ff; font-weight: bold;")
         layout.addWidget(title)
         
-        info = QLabel("Ctrl+Alt+T: Normal Mode\nCtrl+Alt+R: Set Region\nCtrl+Alt+E: Translate Region")
+        hotkeys = get_section('hotkeys')
+        labels = [('capture', "Normal Mode"), ('region_set', "Set Region"), ('story_translate', "Translate Region"),
+                  ('story_watch', "Watch Region (Auto)"), ('region_add', "Add Another Region")]
+        info = QLabel("\n".join(f"{describe_keys(hotkeys[action]['keys'])}: {label}"
+                                for action, label in labels if hotkeys.get(action, {}).get('keys')))
         info.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(info)
         
@@ -469,18 +591,29 @@ class MainController(QMainWindow):
         self.hotkey_thread.on_trigger.connect(self.start_selection)           # T (เดิม)
         self.hotkey_thread.on_trigger_region_set.connect(self.start_region_set)       # R (ใหม่)
         self.hotkey_thread.on_trigger_story_translate.connect(self.start_story_translate) # E (ใหม่)
+        self.hotkey_thread.on_trigger_story_watch.connect(self.toggle_story_watch)        # W (เฝ้าดูอัตโนมัติ)
+        self.hotkey_thread.on_trigger_region_add.connect(self.start_region_add)           # A (เพิ่มพื้นที่)
         self.hotkey_thread.start()
 
         self.selection_window = None
         self.region_selector = None      # ตัวลากเส้นใหม่
         self.story_indicator = None      # กรอบขาวค้างหน้าจอ
         self.saved_story_rect = None     # เก็บพิกัด QRect
+        self.story_regions = OrderedDict()  # ชื่อ -> QRect (แปลพร้อมกันเมื่อมีมากกว่า 1 พื้นที่)
+        self.region_indicators = []      # กรอบของพื้นที่ที่เพิ่มด้วย Ctrl+Alt+A
+        self.story_watcher = None        # Thread เฝ้าดูพื้นที่ Story (Ctrl+Alt+W)
         
-        self.worker = None
+        # Pool สำหรับงาน Cloud ทั้งหมด (จำกัดจำนวน Thread, งานใหม่แทนที่งานเก่า)
+        self.cloud_pool = create_cloud_pool(self)
+        self.cloud_pool.job_finished.connect(self.on_cloud_job_finished)
+        self.cloud_pool.job_failed.connect(self.on_cloud_job_failed)
+        self.cloud_pool.job_progress.connect(self.on_cloud_job_progress)
+        self.ocr_cache = create_ocr_cache() # จำผล OCR ของภาพที่เคยแปลแล้ว (Story Mode)
         self.translate_window = None     
         self.overlay_result_window = None
         
         self.last_result_pos = None      # จำตำแหน่งหน้าต่างผลลัพธ์
+        self.load_story_regions()
 
     # ==========================================
     # Logic เดิม (Ctrl + Alt + T)
@@ -493,11 +626,57 @@ class MainController(QMainWindow):
         self.selection_window.activateWindow()
         self.selection_window.raise_()
 
-    def process_image(self, image_data):
-        self.worker = CloudWorker(image_data)
-        self.worker.finished.connect(self.show_ocr_result)
-        self.worker.error.connect(self.show_ocr_error)
-        self.worker.start()
+    def process_image(self, image_data, trace=None, fingerprint=None):
+        # ช่อง 'overlay': กด T/E รัวๆ จะเหลือเฉพาะงานล่าสุด ผลเก่าไม่ทับผลใหม่
+        self.cloud_pool.submit('overlay', tracing.bind(trace, ocr_translate_job), image_data,
+                               context=(fingerprint, trace))
+
+    def on_cloud_job_progress(self, job_id, channel, original, context):
+        """OCR เสร็จแล้ว: แสดงต้นฉบับบน Overlay ทันที ระหว่างรอคำแปล"""
+        if channel not in ('overlay', 'watch'):
+            return
+        fingerprint, trace = context
+        with tracing.activate(trace), tracing.span('render_pending'):
+            self.show_ocr_result(original, None, activate=(channel == 'overlay'))
+        if trace is not None:
+            trace.attrs['first_paint_ms'] = round(trace.elapsed_ms(), 3)
+
+    def on_cloud_job_finished(self, job_id, channel, result, context):
+        if channel not in ('overlay', 'watch'):
+            return
+        fingerprint, trace = context
+        original, translated = result
+        with tracing.activate(trace), tracing.span('render'):
+            self.show_ocr_result(original, translated, activate=(channel == 'overlay'))
+        self.finish_trace(trace, channel=channel)
+        if fingerprint is not None:
+            # จำผลลัพธ์ไว้คู่กับลายนิ้วมือภาพ เพื่อข้าม Cloud ในครั้งถัดไป
+            self.remember_ocr_result(fingerprint, original, translated)
+        if channel == 'watch' and self.story_watcher:
+            self.story_watcher.release()
+
+    def on_cloud_job_failed(self, job_id, channel, error_msg, context):
+        if channel not in ('overlay', 'watch'):
+            return
+        fingerprint, trace = context
+        self.finish_trace(trace, channel=channel, error=error_msg)
+        if channel == 'overlay':
+            self.show_ocr_error(error_msg)
+        elif channel == 'watch' and self.story_watcher:
+            # โหมดเฝ้าดูไม่แสดง Error (เช่น กล่องข้อความหายไป) แค่รอเฟรมถัดไป
+            self.story_watcher.release()
+
+    def finish_trace(self, trace, **attrs):
+        """เขียนเวลาของ Request ลง Timing Log และแสดงบน Overlay (ถ้าเปิดไว้)"""
+        if trace is None:
+            return
+        trace.finish(**attrs)
+        if self.overlay_result_window and get_section('tracing').get('overlay_readout'):
+            self.overlay_result_window.set_latency(trace.summary())
+
+    def remember_ocr_result(self, fingerprint, original, translated):
+        if translated and translated != cloud_warmup.result().TRANSLATE_FAILED_MESSAGE:
+            self.ocr_cache.store(fingerprint, original, translated)
 
     # ==========================================
     # Logic ใหม่ (Story Mode)
@@ -505,11 +684,7 @@ class MainController(QMainWindow):
     def start_region_set(self):
         """Ctrl+Alt+R: เปิดตัวลากเพื่อจำพิกัด"""
         print(">>> Mode: Set Story Region")
-        # ปิดตัวเก่าถ้ามี
-        if self.story_indicator:
-            self.story_indicator.close()
-            self.story_indicator = None
-            
+        # ยังไม่ลบพื้นที่เดิม (ถ้ายกเลิกการลาก พื้นที่เดิมต้องยังอยู่) จะแทนที่ใน set_story_region
         self.region_selector = RegionSelector()
         self.region_selector.on_region_selected.connect(self.set_story_region)
         self.region_selector.show()
@@ -517,14 +692,79 @@ class MainController(QMainWindow):
         self.region_selector.raise_()
 
     def set_story_region(self, rect):
-        """บันทึกพิกัด และสร้างกรอบขาว"""
+        """บันทึกพิกัด (แทนที่พื้นที่เดิมทั้งหมด) และสร้างกรอบขาว"""
+        # ปิดตัวเก่าถ้ามี (รวมถึงพื้นที่เพิ่มเติมทั้งหมด)
+        if self.story_indicator:
+            self.story_indicator.close()
+            self.story_indicator = None
+        self.clear_extra_regions()
+
         self.saved_story_rect = rect
+        self.story_regions = OrderedDict([("Story", rect)])
         print(f"Region Saved: {rect}")
         
         # สร้างกรอบขาวค้างไว้ (คลิกทะลุได้)
         self.story_indicator = StoryRegionIndicator(rect)
         self.story_indicator.show()
 
+        # ถ้ากำลังเฝ้าดูอยู่ ให้ย้ายไปเฝ้าพื้นที่ใหม่
+        if self.story_watcher:
+            self.story_watcher.set_region(self.story_monitor())
+
+    def start_region_add(self):
+        """Ctrl+Alt+A: เพิ่มพื้นที่ Story อีกจุด (เช่น ชื่อผู้พูด / ตัวเลือก) ที่จะแปลพร้อมกันด้วย Ctrl+Alt+E"""
+        print(">>> Mode: Add Story Region")
+        self.region_selector = RegionSelector()
+        self.region_selector.on_region_selected.connect(self.add_story_region)
+        self.region_selector.show()
+        self.region_selector.activateWindow()
+        self.region_selector.raise_()
+
+    def add_story_region(self, rect, name=None):
+        if name is None:
+            default = f"Region {len(self.story_regions) + 1}"
+            name, ok = QInputDialog.getText(self, "Torslate", "ชื่อพื้นที่:", text=default)
+            if not ok:
+                return
+            name = name.strip() or default
+        if self.saved_story_rect is None:
+            # พื้นที่แรกเป็นพื้นที่หลัก (ใช้กับโหมดเฝ้าดู Ctrl+Alt+W)
+            self.saved_story_rect = rect
+        self.story_regions[name] = rect
+        print(f"Region Added: {name} {rect} (รวม {len(self.story_regions)} พื้นที่)")
+
+        indicator = StoryRegionIndicator(rect, name)
+        indicator.show()
+        self.region_indicators.append(indicator)
+
+    def clear_extra_regions(self):
+        for indicator in self.region_indicators:
+            indicator.close()
+        self.region_indicators = []
+        self.story_regions.clear()
+        self.saved_story_rect = None
+
+    def load_story_regions(self):
+        """โหลดพื้นที่ Story ที่ตั้งชื่อไว้ใน settings (หมวด story_regions)"""
+        for region in get_section('story_regions').get('regions', []):
+            try:
+                x, y, w, h = region['rect']
+                name = str(region.get('name') or f"Region {len(self.story_regions) + 1}")
+                self.add_story_region(QRect(x, y, w, h), name)
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Warning: ข้ามพื้นที่ Story ที่ตั้งค่าไม่ถูกต้อง {region}: {e}")
+
+    def story_monitor(self, rect=None):
+        """แปลง QRect (ค่าเริ่มต้น saved_story_rect) เป็นพิกัด Physical Pixels สำหรับ mss"""
+        scale = QApplication.primaryScreen().devicePixelRatio()
+        rect = rect or self.saved_story_rect
+        return {
+            "top": int(rect.y() * scale),
+            "left": int(rect.x() * scale),
+            "width": int(rect.width() * scale),
+            "height": int(rect.height() * scale),
+        }
+
     def start_story_translate(self):
         """Ctrl+Alt+E: แปลจากพิกัดเดิมทันที"""
         if not self.saved_story_rect:
@@ -533,40 +773,156 @@ class MainController(QMainWindow):
             self.show_ocr_error("กรุณากด Ctrl+Alt+R เพื่อกำหนดขอบเขตก่อน")
             return
 
+        if len(self.story_regions) > 1:
+            self.start_regions_translate()
+            return
+
         print(">>> Mode: Story Translate (Fixed Region)")
         
         # คำนวณ Physical Pixels สำหรับ mss
-        screen = QApplication.primaryScreen()
-        scale = screen.devicePixelRatio()
-        
-        rect = self.saved_story_rect
-        x = int(rect.x() * scale)
-        y = int(rect.y() * scale)
-        w = int(rect.width() * scale)
-        h = int(rect.height() * scale)
+        monitor = self.story_monitor()
 
         # จับภาพทันที (ไม่ต้องลาก)
+        trace = tracing.start_trace('story')
         try:
-            with mss.mss() as sct:
-                monitor = {"top": y, "left": x, "width": w, "height": h}
-                sct_img = sct.grab(monitor)
-                img_bytes = mss.tools.to_png(sct_img.rgb, sct_img.size)
+            with tracing.activate(trace):
+                with tracing.span('capture', width=monitor['width'], height=monitor['height']):
+                    frame = capture_service.grab(monitor)
+
+                if tiled_ocr.accepts(frame):
+                    # พื้นที่ใหญ่: ส่งเฟรมดิบไปแบ่งแถบใน Pool (encode เฉพาะแถบที่เปลี่ยน)
+                    # ไม่ใช้ OCR Cache ทั้งเฟรม TiledOcr จำข้อความด้วย Hash ของแต่ละแถบเองอยู่แล้ว
+                    self.cloud_pool.submit('overlay', tracing.bind(trace, ocr_translate_tiled_job), frame,
+                                           context=(None, trace))
+                    return
+
+                # ถ้าภาพแทบไม่เปลี่ยนจากที่เคยแปล ใช้ผลเดิมได้เลย (ไม่ต้องเรียก Cloud)
+                with tracing.span('fingerprint'):
+                    fingerprint = self.ocr_cache.fingerprint(frame)
+                    cached = self.ocr_cache.lookup(fingerprint)
+                stats = self.ocr_cache.stats()
+                print(f"OCR Cache {'Hit' if cached else 'Miss'} "
+                      f"(hit rate {stats['hit_rate']:.0%}, {stats['hits']}/{stats['hits'] + stats['misses']})")
+                if cached:
+                    # ผลนี้ใหม่กว่างาน Overlay ที่ยังค้างอยู่ ทิ้งงานเก่าไม่ให้มาทับทีหลัง (latest-wins)
+                    self.cloud_pool.cancel('overlay')
+                    with tracing.span('render'):
+                        self.show_ocr_result(*cached)
+                    self.finish_trace(trace, channel='overlay', ocr_cache_hit=True)
+                    return
+
+                with tracing.span('encode') as info:
+                    img_bytes = upload_pipeline.run(frame)
+                    info['bytes'] = len(img_bytes)
                 
                 # ส่งไปแปล (ใช้ Logic เดียวกับ process_image)
-                self.process_image(img_bytes)
+                self.process_image(img_bytes, trace, fingerprint)
+        except Exception as e:
+            print(f"Capture Error: {e}")
+
+    def start_regions_translate(self):
+        """แปลทุกพื้นที่ Story จากการจับภาพครั้งเดียว แล้วส่ง OCR / แปล รวมเป็นงานเดียว"""
+        print(f">>> Mode: Story Translate ({len(self.story_regions)} Regions)")
+        names = list(self.story_regions)
+        monitors = [self.story_monitor(self.story_regions[name]) for name in names]
+
+        # จับภาพครั้งเดียวครอบทุกพื้นที่ แล้วตัดแต่ละพื้นที่เป็น View (ไม่คัดลอก)
+        top = min(m['top'] for m in monitors)
+        left = min(m['left'] for m in monitors)
+        bounds = {
+            "top": top,
+            "left": left,
+            "width": max(m['left'] + m['width'] for m in monitors) - left,
+            "height": max(m['top'] + m['height'] for m in monitors) - top,
+        }
+
+        trace = tracing.start_trace('regions')
+        try:
+            with tracing.activate(trace):
+                with tracing.span('capture', width=bounds['width'], height=bounds['height'], regions=len(names)):
+                    frame = capture_service.grab(bounds)
+
+                crops = [frame[m['top'] - top:m['top'] - top + m['height'],
+                               m['left'] - left:m['left'] - left + m['width']] for m in monitors]
+
+                # จำผลแยกตามพื้นที่: พื้นที่ที่ภาพไม่เปลี่ยน (เช่น ชื่อผู้พูด) ใช้ผลเดิม ส่ง OCR เฉพาะพื้นที่ที่เปลี่ยน
+                with tracing.span('fingerprint'):
+                    fingerprints = [self.ocr_cache.fingerprint(crop) for crop in crops]
+                    cached = [self.ocr_cache.lookup(fingerprint) for fingerprint in fingerprints]
+                if all(cached):
+                    self.cloud_pool.cancel('overlay')   # latest-wins เหมือนกรณีพื้นที่เดียว
+                    with tracing.span('render'):
+                        self.show_ocr_result(label_regions(names, [hit[0] for hit in cached]),
+                                             label_regions(names, [hit[1] for hit in cached]))
+                    self.finish_trace(trace, channel='overlay', ocr_cache_hit=True)
+                    return
+
+                with tracing.span('encode') as info:
+                    images = [upload_pipeline.run(crop) for crop, hit in zip(crops, cached) if hit is None]
+                    info['bytes'] = sum(len(data) for data in images)
+
+            def remember(index, original, translated):
+                # เรียกจาก Thread ของ Pool (OcrResultCache มี Lock ของตัวเอง)
+                self.remember_ocr_result(fingerprints[index], original, translated)
+
+            self.cloud_pool.submit('overlay', tracing.bind(trace, ocr_translate_regions_job), names, images,
+                                   cached, remember, context=(None, trace))
         except Exception as e:
             print(f"Capture Error: {e}")
 
+    def toggle_story_watch(self):
+        """Ctrl+Alt+W: เปิด/ปิด การเฝ้าดูพื้นที่ Story และแปลอัตโนมัติเมื่อข้อความเปลี่ยน"""
+        if self.story_watcher:
+            print(">>> Mode: Story Watch OFF")
+            self.story_watcher.stop()
+            self.story_watcher = None
+            self.cloud_pool.cancel('watch')
+            return
+
+        if not self.saved_story_rect:
+            print("Error: No region set! Press Ctrl+Alt+R first.")
+            self.show_ocr_error("กรุณากด Ctrl+Alt+R เพื่อกำหนดขอบเขตก่อน")
+            return
+
+        print(">>> Mode: Story Watch ON")
+        self.story_watcher = StoryWatcher(self.story_monitor(), fingerprint=self.ocr_cache.fingerprint,
+                                          pipeline=upload_pipeline)
+        self.story_watcher.frame_ready.connect(self.process_watch_frame)
+        self.story_watcher.start()
+
+    def process_watch_frame(self, img_bytes, fingerprint):
+        watcher = self.story_watcher
+        if watcher is None:
+            return
+
+        cached = self.ocr_cache.lookup(fingerprint)
+        if cached:
+            self.show_ocr_result(*cached, activate=False)
+            watcher.release()
+            return
+
+        # Watcher จะไม่ส่งเฟรมใหม่จนกว่างานนี้จะเสร็จ (ค้างได้สูงสุด 1 Request)
+        # (จับภาพ + encode เกิดใน Thread ของ Watcher จึงเริ่มจับเวลาตั้งแต่ส่งงาน)
+        trace = tracing.start_trace('watch')
+        if trace is not None:
+            trace.attrs['bytes'] = len(img_bytes)
+        self.cloud_pool.submit('watch', tracing.bind(trace, ocr_translate_job), img_bytes,
+                               context=(fingerprint, trace))
+
     # ==========================================
     # Shared Logic (การแสดงผล)
     # ==========================================
-    def show_ocr_result(self, original, translated):
+    def show_ocr_result(self, original, translated, activate=True):
+        """translated เป็น None = ยังไม่ได้คำแปล (แสดงต้นฉบับพร้อมสถานะกำลังแปล)"""
         if self.overlay_result_window is None:
             self.overlay_result_window = OverlayResultWindow()
             # ดักจับ Event การเคลื่อนย้ายเพื่อจำตำแหน่ง
             self.overlay_result_window.moveEvent = self.save_window_pos
         
-        self.overlay_result_window.set_content(original, translated)
+        if translated is None:
+            self.overlay_result_window.set_pending(original)
+        else:
+            self.overlay_result_window.set_content(original, translated)
         
         # ถ้ามีตำแหน่งจำไว้ ให้ใช้ตำแหน่งเดิม
         if self.last_result_pos:
@@ -578,7 +934,9 @@ class MainController(QMainWindow):
         
         self.overlay_result_window.show()
         self.overlay_result_window.raise_()
-        self.overlay_result_window.activateWindow()
+        if activate:
+            # โหมดเฝ้าดูจะไม่แย่ง Focus จากเกม
+            self.overlay_result_window.activateWindow()
 
     def save_window_pos(self, event):
         # ฟังก์ชันนี้จะถูกเรียกเมื่อหน้าต่าง Overlay ถูกลาก
@@ -595,7 +953,7 @@ class MainController(QMainWindow):
         
     def open_translate_window(self):
         if self.translate_window is None:
-            self.translate_window = TranslateWindow()
+            self.translate_window = TranslateWindow(self.cloud_pool)
         self.translate_window.show()
 
 
@@ -658,8 +1016,9 @@ class RegionSelector(QWidget):
 # 7. (NEW) กรอบขาวแสดงพื้นที่ Story Mode (Indicator)
 # ====================================================================
 class StoryRegionIndicator(QWidget):
-    def __init__(self, rect):
+    def __init__(self, rect, name=None):
         super().__init__()
+        self.name = name  # ชื่อพื้นที่ (แสดงที่มุมซ้ายบน ถ้ามี)
         # ตั้งค่าให้เป็น Overlay ที่คลิกทะลุได้ (TransparentForMouseEvents)
         self.setWindowFlags(
             Qt.WindowType.FramelessWindowHint | 
@@ -679,10 +1038,17 @@ class StoryRegionIndicator(QWidget):
         painter.setPen(QPen(QColor(255, 255, 255, 128), 1, Qt.PenStyle.DashLine))
         painter.setBrush(Qt.BrushStyle.NoBrush)
         painter.drawRect(0, 0, self.width()-1, self.height()-1)
+        if self.name:
+            painter.setFont(QFont("Segoe UI", 8))
+            painter.drawText(4, 12, self.name)
 
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     controller = MainController()
+    app.aboutToQuit.connect(controller.cloud_pool.shutdown)
+    app.aboutToQuit.connect(capture_service.close)
     controller.show()
+    # เริ่มโหลด Google Cloud หลังหน้าต่างแรกวาดเสร็จ (ไม่แย่ง GIL ระหว่างวาดหน้าต่าง)
+    QTimer.singleShot(0, cloud_warmup.start)
     sys.exit(app.exec())
\ No newline at end of file
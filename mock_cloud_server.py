@@ -0,0 +1,240 @@
+"""
+Mock Server ในเครื่องที่เลียนแบบ REST API ของ Google Cloud Vision (v1 images:annotate)
+และ Translation (v2) ใช้ทดสอบ/วัดประสิทธิภาพโดยไม่ต้องมี Network หรือ key.json
+
+ปรับพฤติกรรมได้: Latency, Error แบบสุ่ม, Rate Limit (ตอบ 429) และสั่งให้พังครั้งถัดไปได้
+
+วิธีใช้ (รันแยก แล้วชี้ settings.json ไปที่ Mock):
+    python mock_cloud_server.py --port 8765 --latency 0.1 --error-rate 0.05 --rate-limit 20
+
+    settings.json:
+    {"cloud_endpoints": {"vision": "http://127.0.0.1:8765", "translate": "http://127.0.0.1:8765",
+                         "anonymous": true}}
+"""
+import json
+import time
+import random
+import base64
+import argparse
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TRANSLATE_PATH = "/language/translate/v2"
+VISION_PATH = "/v1/images:annotate"
+
+# HTTP status -> status ของ Google API
+_ERROR_STATUS = {
+    400: "INVALID_ARGUMENT",
+    429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL",
+    503: "UNAVAILABLE",
+}
+
+
+def default_translator(text: str, target: str, source: str) -> str:
+    return f"[{target}] {text}"
+
+
+def default_ocr(image_data: bytes) -> str:
+    # ภาพที่เป็นข้อความ UTF-8 ล้วน (เช่น b"Hello") จะถูก "อ่าน" ออกมาตรงๆ ใช้สร้างภาพปลอมใน Benchmark ได้ง่าย
+    try:
+        text = image_data.decode('utf-8')
+        if text.isprintable() or '\n' in text:
+            return text
+    except UnicodeDecodeError:
+        pass
+    return "Hello, traveler."
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    # ใช้ HTTP/1.1 เพื่อให้ Client ใช้ Keep-Alive ได้ (เหมือน Connection จริง)
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload: dict, status: int = 200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str):
+        self._send_json({"error": {
+            "code": status,
+            "message": message,
+            "status": _ERROR_STATUS.get(status, "UNKNOWN"),
+            "errors": [{"message": message, "domain": "global", "reason": "mock"}],
+        }}, status)
+
+    def do_GET(self):
+        if self.path.startswith(TRANSLATE_PATH + "/languages"):
+            self.server.mock.count("languages")
+            self._send_json({"data": {"languages": [{"language": "en"}, {"language": "th"}]}})
+        else:
+            self._send_error(404, "not found")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        mock = self.server.mock
+
+        if self.path.startswith(TRANSLATE_PATH):
+            kind = "translate"
+        elif self.path.startswith(VISION_PATH):
+            kind = "vision"
+        else:
+            self._send_error(404, "not found")
+            return
+
+        mock.count(kind)
+        fault = mock.next_fault(kind)
+        delay = mock.latency + (random.uniform(0, mock.jitter) if mock.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        if fault:
+            mock.count(f"{kind}_error_{fault}")
+            self._send_error(fault, f"Mock {kind} error {fault}")
+            return
+
+        try:
+            request = json.loads(raw or b"{}")
+        except ValueError:
+            self._send_error(400, "invalid JSON")
+            return
+
+        if kind == "translate":
+            texts = request.get("q", [])
+            if isinstance(texts, str):
+                texts = [texts]
+            mock.count("translate_chars", sum(len(t) for t in texts))
+            target, source = request.get("target", "th"), request.get("source", "")
+            translations = [{"translatedText": mock.translator(t, target, source)} for t in texts]
+            self._send_json({"data": {"translations": translations}})
+        else:
+            responses = []
+            for item in request.get("requests", []):
+                content = base64.b64decode(item.get("image", {}).get("content", "") or b"")
+                text = mock.ocr(content)
+                responses.append({"textAnnotations": [{"description": text}]} if text else {})
+            self._send_json({"responses": responses})
+
+
+class MockCloudServer:
+    """
+    เปิด Mock Server ใน Background Thread (ใช้แบบ with ... as server:)
+
+    Args:
+        port: 0 = สุ่ม Port ว่าง
+        latency: เวลาหน่วงต่อ Request (วินาที)
+        jitter: เวลาหน่วงสุ่มเพิ่ม 0 - jitter (วินาที)
+        error_rate: โอกาสตอบ 503 แบบสุ่ม (0.0 - 1.0)
+        rate_limit: จำนวน Request ต่อวินาทีต่อ API (เกินแล้วตอบ 429), None = ไม่จำกัด
+        translator: ฟังก์ชัน (text, target, source) -> คำแปล
+        ocr: ฟังก์ชัน (image bytes) -> ข้อความ หรือ None
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 rate_limit: float = None, translator=default_translator, ocr=default_ocr, host: str = "127.0.0.1"):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.translator = translator
+        self.ocr = ocr
+        self.counts = Counter()
+
+        self._lock = threading.Lock()
+        self._scripted_faults = {"vision": [], "translate": []}
+        self._buckets = {kind: _TokenBucket(rate_limit, rate_limit) for kind in ("vision", "translate")} \
+            if rate_limit else {}
+
+        self.httpd = ThreadingHTTPServer((host, port), _MockHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="MockCloudServer", daemon=True)
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.counts[key] += amount
+
+    def fail_next(self, kind: str, count: int = 1, status: int = 503):
+        """สั่งให้ Request ถัดไปของ API นั้น (kind = 'vision' / 'translate') ตอบ Error count ครั้ง"""
+        with self._lock:
+            self._scripted_faults[kind].extend([status] * count)
+
+    def next_fault(self, kind: str):
+        with self._lock:
+            if self._scripted_faults[kind]:
+                return self._scripted_faults[kind].pop(0)
+        bucket = self._buckets.get(kind)
+        if bucket is not None and not bucket.take():
+            return 429
+        if self.error_rate and random.random() < self.error_rate:
+            return 503
+        return None
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=float, default=None)
+    args = parser.parse_args()
+
+    server = MockCloudServer(args.port, args.latency, args.jitter, args.error_rate, args.rate_limit)
+    print(f"Mock Cloud Server: {server.endpoint} (Ctrl+C เพื่อหยุด)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(dict(server.counts))
+
+
+if __name__ == '__main__':
+    main()
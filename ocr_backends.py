@@ -0,0 +1,176 @@
+import io
+import threading
+from typing import List, NamedTuple, Optional
+
+from settings import get_section
+
+
+class OcrResult(NamedTuple):
+    text: Optional[str]
+    confidence: float   # 0.0 - 1.0
+    backend: str
+
+
+# ====================================================================
+# I. Interface
+# ====================================================================
+class OcrBackend:
+    """ตัวอ่านข้อความจากภาพ (รับไฟล์ภาพเป็น bytes คืน OcrResult)"""
+    name = "base"
+
+    def recognize(self, image_data: bytes) -> OcrResult:
+        raise NotImplementedError
+
+    def recognize_many(self, images: List[bytes]) -> List[OcrResult]:
+        """อ่านหลายภาพ (ค่าเริ่มต้นคือทีละภาพ Backend ที่รวม Request ได้ควร Override)"""
+        return [self.recognize(image_data) for image_data in images]
+
+
+# ====================================================================
+# II. Google Cloud Vision
+# ====================================================================
+class CloudVisionBackend(OcrBackend):
+    """OCR ผ่าน Google Cloud Vision (ใช้ Client ร่วมกันจาก cloud_processor.client_manager)"""
+    name = "cloud"
+
+    def recognize(self, image_data: bytes) -> OcrResult:
+        # import ตอนใช้งาน: cloud_processor import โมดูลนี้อยู่แล้ว
+        from cloud_processor import cloud_vision_ocr
+        text = cloud_vision_ocr(image_data)
+        return OcrResult(text, 1.0 if text else 0.0, self.name)
+
+    def recognize_many(self, images: List[bytes]) -> List[OcrResult]:
+        from cloud_processor import cloud_vision_ocr_many
+        return [OcrResult(text, 1.0 if text else 0.0, self.name) for text in cloud_vision_ocr_many(images)]
+
+
+# ====================================================================
+# III. Tesseract (ทำงานในเครื่อง ไม่ต้องใช้ Network)
+# ====================================================================
+class TesseractBackend(OcrBackend):
+    """
+    OCR ในเครื่องด้วย Tesseract ผ่าน pytesseract (ต้องติดตั้ง Tesseract และ pip install pytesseract pillow)
+
+    Args:
+        lang: ภาษาของ Tesseract เช่น 'eng'
+        tesseract_cmd: path ของ tesseract.exe (ว่าง = หาใน PATH)
+        config: ตัวเลือกเพิ่มเติมของ Tesseract เช่น '--psm 6'
+    """
+    name = "local"
+
+    def __init__(self, lang: str = 'eng', tesseract_cmd: str = '', config: str = ''):
+        self.lang = lang
+        self.tesseract_cmd = tesseract_cmd
+        self.config = config
+
+    def recognize(self, image_data: bytes) -> OcrResult:
+        try:
+            import pytesseract
+            from PIL import Image
+        except ImportError as e:
+            print(f"ERROR: ใช้ OCR ในเครื่องไม่ได้ (ยังไม่ได้ติดตั้ง pytesseract/pillow): {e}")
+            return OcrResult(None, 0.0, self.name)
+
+        if self.tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = self.tesseract_cmd
+        try:
+            image = Image.open(io.BytesIO(image_data))
+            data = pytesseract.image_to_data(image, lang=self.lang, config=self.config,
+                                             output_type=pytesseract.Output.DICT)
+        except Exception as e:
+            print(f"ERROR: Tesseract OCR ล้มเหลว: {e}")
+            return OcrResult(None, 0.0, self.name)
+
+        # ประกอบคำเป็นบรรทัด ตามลำดับ (block, paragraph, line) ของ Tesseract
+        lines, confidences = {}, []
+        for i, word in enumerate(data['text']):
+            word = word.strip()
+            confidence = float(data['conf'][i])
+            if not word or confidence < 0:
+                continue
+            key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            lines.setdefault(key, []).append(word)
+            confidences.append(confidence)
+
+        if not confidences:
+            return OcrResult(None, 0.0, self.name)
+        text = "\n".join(" ".join(words) for _, words in sorted(lines.items()))
+        return OcrResult(text, sum(confidences) / len(confidences) / 100.0, self.name)
+
+
+# ====================================================================
+# IV. Routing: ลองในเครื่องก่อน ถ้าไม่มั่นใจค่อยใช้ Cloud
+# ====================================================================
+class RoutingOcrBackend(OcrBackend):
+    """
+    ลอง Backend ตามลำดับ ใช้ผลแรกที่ "ผ่านเกณฑ์" (มีข้อความอย่างน้อย min_chars ตัว
+    และความมั่นใจ >= min_confidence) ถ้าไม่มีตัวไหนผ่าน จะคืนผลของตัวสุดท้าย
+
+    Args:
+        backends: เช่น [TesseractBackend(), CloudVisionBackend()]
+        min_confidence: ความมั่นใจขั้นต่ำ (0.0 - 1.0)
+        min_chars: จำนวนตัวอักษรขั้นต่ำ
+    """
+    name = "auto"
+
+    def __init__(self, backends: List[OcrBackend], min_confidence: float = 0.7, min_chars: int = 2):
+        self.backends = backends
+        self.min_confidence = min_confidence
+        self.min_chars = min_chars
+        self._lock = threading.Lock()
+        self.used = {backend.name: 0 for backend in backends}
+
+    def accepts(self, result: OcrResult) -> bool:
+        return (bool(result.text) and len(result.text.strip()) >= self.min_chars
+                and result.confidence >= self.min_confidence)
+
+    def recognize(self, image_data: bytes) -> OcrResult:
+        return self.recognize_many([image_data])[0]
+
+    def recognize_many(self, images: List[bytes]) -> List[OcrResult]:
+        # ส่งเฉพาะภาพที่ยังไม่ผ่านเกณฑ์ต่อไปยัง Backend ถัดไป (รวมเป็นชุดเดียว)
+        results = [OcrResult(None, 0.0, self.name)] * len(images)
+        pending = list(range(len(images)))
+        for backend in self.backends:
+            if not pending:
+                break
+            try:
+                batch = backend.recognize_many([images[i] for i in pending])
+            except Exception:
+                # Backend ถัดไปใช้ไม่ได้ (เช่น Cloud ถูกพักไว้) -> ใช้ผลเท่าที่มี ถ้ายังไม่มีเลยให้แจ้ง Error
+                if backend is self.backends[0]:
+                    raise
+                break
+            retry = []
+            for i, result in zip(pending, batch):
+                results[i] = result
+                if not self.accepts(result):
+                    retry.append(i)
+            pending = retry
+        with self._lock:
+            for result in results:
+                self.used[result.backend] = self.used.get(result.backend, 0) + 1
+        return results
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.used)
+
+
+def create_ocr_backend() -> OcrBackend:
+    """สร้าง Backend ตามค่าใน settings (หมวด ocr: 'cloud' | 'local' | 'auto')"""
+    config = get_section('ocr')
+    mode = config.get('backend', 'cloud')
+    cloud = CloudVisionBackend()
+    if mode == 'cloud':
+        return cloud
+    local = TesseractBackend(
+        lang=config.get('tesseract_lang', 'eng'),
+        tesseract_cmd=config.get('tesseract_cmd', ''),
+        config=config.get('tesseract_config', ''),
+    )
+    if mode == 'local':
+        return local
+    if mode == 'auto':
+        return RoutingOcrBackend([local, cloud], config.get('min_confidence', 0.7), config.get('min_chars', 2))
+    raise ValueError(f"Unknown OCR backend: {mode} (ใช้ได้: cloud, local, auto)")
@@ -0,0 +1,218 @@
+import os
+import sys
+import json
+import copy
+
+
+# ====================================================================
+# ค่าตั้งต้นของโปรแกรม (แก้ไขได้ผ่านไฟล์ settings.json วางคู่กับ key.json)
+# ====================================================================
+DEFAULT_SETTINGS = {
+    # ปลายทางของ Google API (ว่าง = ใช้ของ Google จริง) ชี้ไปที่ mock_cloud_server.py ได้
+    "cloud_endpoints": {
+        "vision": "",              # เช่น "http://127.0.0.1:8765"
+        "translate": "",
+        "vision_transport": "",    # "grpc" | "rest" (ว่าง = อัตโนมัติ)
+        "anonymous": False,        # True = ไม่ใช้ key.json (สำหรับ Mock Server)
+    },
+    # คีย์ลัด (รูปแบบของ pynput) และการกรองการกดรัวๆ ต่อคีย์
+    #   throttle_ms: ทำงานทันที แล้วไม่สนใจการกดซ้ำในช่วงนี้ / debounce_ms: รอให้หยุดกดก่อนแล้วทำงานครั้งเดียว
+    "hotkeys": {
+        "capture": {"keys": "<ctrl>+<alt>+t", "throttle_ms": 300, "debounce_ms": 0},
+        "region_set": {"keys": "<ctrl>+<alt>+r", "throttle_ms": 500, "debounce_ms": 0},
+        "story_translate": {"keys": "<ctrl>+<alt>+e", "throttle_ms": 250, "debounce_ms": 0},
+        "story_watch": {"keys": "<ctrl>+<alt>+w", "throttle_ms": 500, "debounce_ms": 0},
+        "region_add": {"keys": "<ctrl>+<alt>+a", "throttle_ms": 500, "debounce_ms": 0},
+    },
+    # ป้องกันโควตา Google API: จำกัดอัตรา / ลองใหม่เมื่อ Error ชั่วคราว / หยุดเรียกชั่วคราวเมื่อ Backend ล่ม
+    "api_limits": {
+        "vision": {"rate": 5, "burst": 5},       # Request ต่อวินาที / ยิงติดกันได้สูงสุด (rate 0 = ไม่จำกัด)
+        "translate": {"rate": 10, "burst": 10},
+        "max_wait": 2.0,           # รอคิว Rate Limit ได้นานสุด (วินาที) เกินแล้วแจ้ง Error
+        "max_attempts": 3,         # จำนวนครั้งที่ลองทั้งหมดเมื่อเจอ Error ชั่วคราว (503 / 429 / Timeout)
+        "base_delay": 0.2,         # Backoff เริ่มต้น (วินาที) เพิ่มเป็น 2 เท่าทุกครั้ง + สุ่ม
+        "max_delay": 2.0,
+        "failure_threshold": 5,    # ล้มเหลวติดกันกี่ครั้งจึงหยุดเรียกชั่วคราว (Circuit Breaker)
+        "reset_seconds": 30,       # หยุดเรียกนานเท่าไรก่อนลองใหม่
+    },
+    # Thread Pool สำหรับงาน Cloud (OCR / แปล)
+    "cloud_pool": {
+        "max_workers": 2,          # จำนวนงานที่เรียก Google พร้อมกันได้สูงสุด
+        "max_pending": 2,          # จำนวนงานที่รอคิวได้สูงสุด (เกินแล้วทิ้งงานเก่าสุด)
+    },
+    # Engine แบบ asyncio (REST ผ่าน aiohttp) ใช้แทน Client แบบ Blocking
+    "async_engine": {
+        # ต้องติดตั้ง aiohttp เพิ่ม ใช้กับงาน OCR + แปลแบบภาพเดียว (ocr_translate_job)
+        # ไม่ผ่าน ApiGuard (Rate Limit / Retry / Circuit Breaker), SingleFlight และการแปลทีละประโยค
+        "enabled": False,
+        "max_concurrency": 8,
+        "timeout": 15.0,
+        "vision_endpoint": "",     # ว่าง = ใช้ของหมวด cloud_endpoints (ถ้าว่างอีกจะใช้ Google)
+        "translate_endpoint": "",
+    },
+    # การแปลแบบกลุ่ม (translate_batch) ตามข้อจำกัดของ Translation API v2
+    "translate_batch": {
+        "max_segments": 128,       # จำนวนข้อความสูงสุดต่อ Request
+        "max_chars": 5000,         # จำนวนตัวอักษรรวมสูงสุดต่อ Request (แนะนำโดย Google)
+    },
+    # แปลผล OCR ทีละประโยค (ประโยคที่เคยแปลแล้วไม่ต้องส่งซ้ำ)
+    "incremental_translate": {
+        "enabled": True,
+        "max_segments": 2000,      # จำนวนประโยคที่จำไว้ในหน่วยความจำ
+    },
+    # ตัวอ่านข้อความจากภาพ
+    "ocr": {
+        "backend": "cloud",        # "cloud" | "local" (Tesseract) | "auto" (ลองในเครื่องก่อน ไม่มั่นใจค่อยใช้ Cloud)
+        "tesseract_cmd": "",       # path ของ tesseract.exe (ว่าง = หาใน PATH)
+        "tesseract_lang": "eng",
+        "tesseract_config": "",
+        "min_confidence": 0.7,     # โหมด auto: ความมั่นใจขั้นต่ำของผลในเครื่อง (0.0 - 1.0)
+        "min_chars": 2,
+    },
+    # ตัวแปลภาษา
+    "translate": {
+        "backend": "google",       # "google" | "local_model" (Argos Translate ในเครื่อง)
+    },
+    # Cache คำแปล (SQLite + LRU ในหน่วยความจำ)
+    "translation_cache": {
+        "enabled": True,
+        "max_entries": 50000,      # จำนวนแถวสูงสุดในไฟล์ (เกินแล้วลบตัวที่ใช้ล่าสุดนานที่สุด)
+        "max_age_days": 30,        # อายุสูงสุดของคำแปลแต่ละรายการ
+        "memory_entries": 1024,    # ขนาด LRU ในหน่วยความจำ
+        "file_name": "translation_cache.sqlite3",
+    },
+    # Translation Memory: ใช้คำแปลเดิมกับประโยคที่ต่างกันแค่ความคลาดเคลื่อนของ OCR (เช่น l/I, จุด, ช่องว่าง)
+    "translation_memory": {
+        "enabled": True,
+        "threshold": 0.9,          # ความเหมือนขั้นต่ำ (0.0 - 1.0) หลังตัดช่องว่าง/เครื่องหมายวรรคตอน
+        "min_chars": 8,            # ประโยคที่สั้นกว่านี้ต้องตรงกันเท่านั้น
+        "max_entries": 50000,
+        "num_perm": 32,            # ขนาดลายเซ็น MinHash (ต้องหารด้วย bands ลงตัว)
+        "bands": 8,
+        "file_name": "translation_memory.sqlite3",
+    },
+    # Cache ผล OCR ตามลายนิ้วมือภาพ (Story Mode)
+    "ocr_cache": {
+        "enabled": True,
+        "max_entries": 32,
+        "grid_width": 64,          # ขนาด Grid ของลายนิ้วมือ
+        "grid_height": 24,
+        "pixel_tolerance": 4,      # ความต่างของค่าเทาที่ยังถือว่าเหมือนเดิม (0-255)
+        "max_diff_ratio": 0.0,     # สัดส่วนช่องที่ต่างได้ เทียบกับช่องที่มีตัวอักษร (0 = ต้องตรงกัน)
+        "cursor_cells": 8,         # ยอมให้ต่างได้เฉพาะจุดเล็กๆ ที่โผล่ / หายไป เช่น เคอร์เซอร์กระพริบ (0 = ไม่ยอม)
+    },
+    # เตรียมภาพก่อนส่ง OCR (ลดขนาด Payload โดยเฉพาะจอ HiDPI)
+    "preprocess": {
+        "enabled": True,
+        "trim_borders": True,      # ตัดขอบสีพื้นรอบข้อความ
+        "border_tolerance": 10,
+        "grayscale": True,         # แปลงเป็นขาวดำ (ข้อมูลลดลง 3 เท่า)
+        "target_text_height": 32,  # ย่อให้ตัวหนังสือสูงประมาณนี้ (0 = ไม่ย่อ)
+        "contrast": False,         # ยืด Contrast สำหรับฟอนต์เกมสีจาง
+        "binarize": False,         # แปลงเป็นขาว-ดำล้วน (Otsu)
+    },
+    # รูปแบบไฟล์ภาพที่ส่งให้ Cloud Vision
+    "image_encoding": {
+        "format": "png",           # "png" | "png_gray" | "jpeg"
+        "png_level": 1,            # ระดับการบีบอัด PNG (0-9) ค่าต่ำ = เร็ว
+        "jpeg_quality": 90,        # คุณภาพ JPEG (1-100)
+    },
+    # โหมดเฝ้าดูพื้นที่ Story อัตโนมัติ (Ctrl+Alt+W)
+    "story_watch": {
+        "fps": 4,                  # จำนวนครั้งที่จับภาพต่อวินาที
+        "stable_ms": 400,          # ภาพต้องนิ่งนานเท่านี้ก่อนส่ง OCR (รอข้อความพิมพ์จบ)
+        "change_ratio": 0.0,       # สัดส่วนช่องที่ต่างเทียบกับช่องที่มีตัวอักษร เกินนี้ = ภาพเปลี่ยน
+        "pixel_tolerance": 8,      # ความต่างของค่าเทา (0-255) ที่ยังถือว่าช่องนั้นเหมือนเดิม
+        "cursor_cells": 8,         # ไม่นับเคอร์เซอร์กระพริบ / ลูกศร "ถัดไป" ที่เล็กกว่านี้ (ช่อง) เป็นการเปลี่ยน
+    },
+    # พื้นที่ใหญ่ (Quest Log / แชท): แบ่งเป็นแถบตามบรรทัด และ OCR ใหม่เฉพาะแถบที่เปลี่ยน
+    "tiled_ocr": {
+        "enabled": True,
+        "min_height": 400,         # พื้นที่สูงตั้งแต่นี้ (Physical Pixels) จึงแบ่งแถบ
+        "band_height": 120,        # ความสูงเป้าหมายของแต่ละแถบ
+        "ink_tolerance": 30,       # ความต่างจากสีพื้นที่ถือว่าเป็นตัวอักษร (0-255)
+        "max_entries": 512,        # จำนวนแถบที่จำข้อความไว้
+    },
+    # พื้นที่ Story หลายจุดที่แปลพร้อมกันด้วย Ctrl+Alt+E (เพิ่มระหว่างใช้งานได้ด้วย Ctrl+Alt+A)
+    "story_regions": {
+        # เช่น [{"name": "ชื่อผู้พูด", "rect": [100, 600, 300, 40]}, {"name": "บทพูด", "rect": [100, 650, 1200, 150]}]
+        # rect = [x, y, กว้าง, สูง] หน่วยเดียวกับหน้าจอของ Qt (Logical Pixels)
+        "regions": [],
+    },
+    # แปลภาพหน้าจอทีละมากๆ แบบไม่เปิดหน้าต่าง (batch_translate.py) ค่าเหล่านี้เป็นค่าเริ่มต้นของ Argument
+    "batch": {
+        "workers": 4,
+        "executor": "thread",      # "thread" (ใช้ Cache / Rate Limit ร่วมกัน) | "process"
+        "max_pending": 0,          # งานที่ส่งเข้า Pool ค้างไว้ได้สูงสุด (0 = workers x 2)
+        "output": "translations.jsonl",
+    },
+    # ดึงคำบรรยายจากไฟล์วิดีโอแล้วแปลเป็น SRT / VTT (video_subtitles.py)
+    "video_subtitles": {
+        "decoder": "auto",         # "auto" | "ffmpeg" | "opencv"
+        "ffmpeg": "",              # path ของ ffmpeg (ว่าง = หาใน PATH)
+        "fps": 5,                  # จำนวนเฟรมต่อวินาทีที่ตรวจ (เวลาคำบรรยายคลาดได้ไม่เกิน 1/fps วินาที)
+        "region": [],              # [x, y, กว้าง, สูง] Pixel ของวิดีโอ (ว่าง = แถบล่างตาม bottom_fraction)
+        "bottom_fraction": 0.25,
+        "stable_ms": 200,          # คำบรรยายใหม่ต้องนิ่งนานเท่านี้ก่อนส่ง OCR
+        "text_brightness": 200,    # ค่าเทาของตัวอักษรคำบรรยาย (0 = เทียบทั้งภาพ เหมาะกับกล่องข้อความทึบ)
+        "change_ratio": 0.2,       # สัดส่วนช่องที่มีตัวอักษรที่ต่างเกินนี้ = คำบรรยายเปลี่ยน (text_brightness 0: ใช้ 0.01)
+        "pixel_tolerance": 40,     # (text_brightness 0: ใช้ 12)
+        "min_ink": 0.05,           # ตัวอักษรน้อยกว่านี้ = ไม่มีคำบรรยาย (ไม่ต้อง OCR)
+        "merge_gap_ms": 250,       # ข้อความเดิมที่ห่างกันไม่เกินนี้รวมเป็นช่วงเดียว
+        "workers": 4,
+        "max_pending": 0,          # งาน OCR ที่ค้างได้สูงสุด (0 = workers x 2)
+    },
+    # บันทึกเวลาแต่ละขั้น (capture / encode / ocr / translate / render) เป็น JSON Lines
+    "tracing": {
+        "enabled": True,
+        "log_file": "torslate_timing.jsonl",
+        "max_bytes": 1000000,      # ขนาดไฟล์ก่อนหมุนเป็นไฟล์ใหม่
+        "backup_count": 3,
+        "overlay_readout": False,  # แสดงเวลาที่ใช้บนหน้าต่างผลลัพธ์
+    },
+}
+
+
+def get_base_path() -> str:
+    # หา path ของโฟลเดอร์โปรแกรม (รองรับทั้งแบบ .py และ .exe)
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def _merge(base: dict, override: dict) -> dict:
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+
+def load_settings(path: str = None) -> dict:
+    """
+    โหลดค่าตั้งต้น แล้วทับด้วยค่าจาก settings.json (ถ้ามี)
+
+    Args:
+        path: path ของไฟล์ settings (None = settings.json ในโฟลเดอร์โปรแกรม)
+
+    Returns:
+        dict ของค่าตั้งค่าทั้งหมด แบ่งตามหมวด
+    """
+    result = copy.deepcopy(DEFAULT_SETTINGS)
+    path = path or os.path.join(get_base_path(), 'settings.json')
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                _merge(result, json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"Warning: อ่าน settings.json ไม่ได้ ใช้ค่าเริ่มต้นแทน: {e}")
+    return result
+
+
+# ค่าตั้งค่าที่ใช้ร่วมกันทั้งโปรแกรม
+settings = load_settings()
+
+
+def get_section(name: str) -> dict:
+    return settings.get(name, {})
@@ -0,0 +1,116 @@
+import time
+import threading
+
+import numpy as np
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from capture_service import CaptureService, capture_service
+from frame_tools import cursor_change, frame_thumbnail, ink_diff_ratio
+from image_pipeline import ImagePipeline
+from settings import get_section
+
+
+class StoryWatcher(QThread):
+    """
+    โหมดเฝ้าดูพื้นที่ Story อัตโนมัติ (ไม่ต้องกด Ctrl+Alt+E ทุกบรรทัด)
+
+    จับภาพพื้นที่เดิมซ้ำๆ ผ่าน CaptureService (mss Handle ของ Thread นี้ตัวเดียวตลอดการทำงาน) แล้วเทียบกับเฟรมก่อนหน้า
+    ด้วยลายนิ้วมือ NumPy (ถูกมาก) จะส่งเฟรมไป OCR ก็ต่อเมื่อ
+      1. ภาพต่างจากเฟรมที่ส่งไปครั้งล่าสุด (เทียบกับช่องที่มีตัวอักษร ไม่ใช่ทั้ง Grid คำเดียวที่เปลี่ยน
+         เช่น Yes -> No ก็นับ ยกเว้นเคอร์เซอร์กระพริบ) และ
+      2. ภาพนิ่งมาแล้วอย่างน้อย stable_ms (ข้อความพิมพ์ออกมาครบแล้ว) และ
+      3. ไม่มีงาน Cloud ของ Watcher ค้างอยู่ (ส่งได้ทีละ 1 งานเท่านั้น)
+
+    เมื่องานเสร็จ (สำเร็จหรือไม่ก็ตาม) ฝั่ง UI ต้องเรียก release() เพื่อปลดล็อก
+
+    Args:
+        monitor: พื้นที่ที่เฝ้าดู (dict แบบ mss, Physical Pixels)
+        fingerprint: ฟังก์ชันคำนวณลายนิ้วมือ (ควรใช้ตัวเดียวกับ OcrResultCache)
+        pipeline: ImagePipeline ที่ใช้เตรียม/แปลงเฟรมก่อนส่ง OCR
+        capture: CaptureService ที่ใช้จับภาพ (ค่าเริ่มต้นคือตัวกลางของโปรแกรม)
+    """
+    # (ไฟล์ภาพที่เข้ารหัสแล้ว, ลายนิ้วมือของเฟรม)
+    frame_ready = pyqtSignal(bytes, object)
+
+    def __init__(self, monitor: dict, fingerprint=frame_thumbnail, pipeline: ImagePipeline = None,
+                 capture: CaptureService = None):
+        super().__init__()
+        self.capture = capture or capture_service
+        self.fingerprint = fingerprint
+        self.pipeline = pipeline or ImagePipeline()
+        config = get_section('story_watch')
+        self.interval = 1.0 / max(0.1, config.get('fps', 4))
+        self.stable_seconds = config.get('stable_ms', 400) / 1000.0
+        self.change_ratio = config.get('change_ratio', 0.0)
+        self.pixel_tolerance = config.get('pixel_tolerance', 8)
+        self.cursor_cells = config.get('cursor_cells', 8)
+
+        self._monitor = monitor
+        self._running = True
+        self._busy = threading.Event()
+
+    def set_region(self, monitor: dict):
+        """เปลี่ยนพื้นที่ที่เฝ้าดู (พิกัด Physical Pixels แบบ mss)"""
+        self._monitor = monitor
+
+    def release(self):
+        """เรียกเมื่องาน OCR/แปล ของเฟรมล่าสุดเสร็จแล้ว"""
+        self._busy.clear()
+
+    def stop(self):
+        self._running = False
+        self.wait()
+
+    def _changed(self, a, b) -> bool:
+        if b is None or a.shape != b.shape:
+            return True
+        changed = np.abs(a - b) > self.pixel_tolerance
+        if not changed.any():
+            return False
+        return (ink_diff_ratio(a, b, self.pixel_tolerance) > self.change_ratio
+                and not cursor_change(a, b, changed, self.pixel_tolerance, self.cursor_cells))
+
+    def run(self):
+        print("--- Story Watch Started ---")
+        previous = None       # ลายนิ้วมือของเฟรมก่อนหน้า
+        last_sent = None      # ลายนิ้วมือของเฟรมที่ส่งไปแปลล่าสุด
+        stable_since = time.monotonic()
+
+        try:
+            while self._running:
+                started = time.monotonic()
+                monitor = self._monitor
+                try:
+                    frame = self.capture.grab(monitor)
+                except Exception as e:
+                    print(f"Watch Capture Error: {e}")
+                    self.msleep(int(self.interval * 1000))
+                    continue
+
+                thumb = self.fingerprint(frame)
+
+                if self._changed(thumb, previous):
+                    # ภาพยังขยับอยู่ (เช่น ข้อความกำลังพิมพ์ออกมา) -> เริ่มนับเวลานิ่งใหม่
+                    stable_since = started
+                previous = thumb
+
+                is_stable = started - stable_since >= self.stable_seconds
+                if is_stable and not self._busy.is_set() and self._changed(thumb, last_sent):
+                    self._busy.set()
+                    try:
+                        img_bytes = self.pipeline.run(frame)
+                        self.frame_ready.emit(img_bytes, thumb)
+                        last_sent = thumb
+                    except Exception as e:
+                        # ไม่มีงานแปลค้าง -> ปลดล็อกให้รอบถัดไปลองส่งใหม่
+                        print(f"Watch Encode Error: {e}")
+                        self._busy.clear()
+
+                # หลับให้ครบรอบ (ใช้ CPU เฉพาะช่วงจับภาพ)
+                elapsed = time.monotonic() - started
+                self.msleep(max(1, int((self.interval - elapsed) * 1000)))
+        finally:
+            # Handle ของ Thread นี้ใช้ต่อจาก Thread อื่นไม่ได้ ปิดทิ้งเมื่อเลิกเฝ้าดู
+            self.capture.release_thread()
+
+        print("--- Story Watch Stopped ---")
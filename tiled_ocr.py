@@ -0,0 +1,179 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import tracing
+from image_pipeline import ImagePipeline, text_row_spans, to_grayscale
+from settings import get_section
+
+
+class TiledOcr:
+    """
+    OCR พื้นที่ใหญ่ (เช่น Quest Log / ช่องแชท) แบบแบ่งเป็นแถบแนวนอนตามบรรทัดข้อความ
+
+    - ตัดแถบที่ช่องว่างระหว่างบรรทัด (ไม่ตัดผ่านตัวอักษร) แต่ละแถบสูงประมาณ band_height
+    - จำข้อความของแต่ละแถบไว้ตาม Hash ของพิกเซล แถบที่ไม่เปลี่ยน (หรือแค่เลื่อนตำแหน่ง
+      เช่น แชทเลื่อนขึ้น) จะไม่ถูกส่ง OCR ซ้ำ ส่งเฉพาะแถบที่เปลี่ยนรวมเป็น Batch เดียว
+    - ประกอบข้อความทั้งหมดกลับจากบนลงล่าง ถ้าแถบที่ส่ง OCR แถบใดไม่ได้ข้อความกลับมา ถือว่าทั้งพื้นที่ล้มเหลว
+      (ไม่คืนข้อความที่ขาดบางบรรทัดเป็นผลสำเร็จ) แถบที่ว่างในชุดที่แถบอื่นอ่านได้ แล้วว่างซ้ำอีกครั้ง
+      จะถูกจำว่า "ไม่มีข้อความ" (เช่น เส้นคั่น/ไอคอน) เพื่อไม่ให้ล้มเหลวทุกครั้ง
+
+    Args:
+        pipeline: ImagePipeline ที่ใช้เตรียม/แปลงแต่ละแถบก่อนส่ง OCR
+        recognize_many: ฟังก์ชัน list ของภาพ -> list ของข้อความ (เช่น process_images_to_text)
+        min_height: พื้นที่ที่สูงตั้งแต่นี้ (Physical Pixels) จึงแบ่งแถบ
+        band_height: ความสูงเป้าหมายของแต่ละแถบ
+        ink_tolerance: ความต่างจากสีพื้นที่ถือว่าเป็นหมึก (0-255)
+        max_entries: จำนวนแถบที่จำข้อความไว้ (LRU)
+    """
+
+    def __init__(self, pipeline: ImagePipeline, recognize_many: Callable[[Sequence[bytes]], List[Optional[str]]],
+                 min_height: int = 400, band_height: int = 120, ink_tolerance: int = 30,
+                 max_entries: int = 512, enabled: bool = True):
+        self.pipeline = pipeline
+        self.recognize_many = recognize_many
+        self.min_height = min_height
+        self.band_height = max(1, band_height)
+        self.ink_tolerance = ink_tolerance
+        self.max_entries = max_entries
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._texts = OrderedDict()   # hash ของพิกเซลแถบ -> ข้อความ ("" = ยืนยันแล้วว่าไม่มีข้อความ)
+        self._empty = OrderedDict()   # hash ของแถบที่ว่างมาแล้วหนึ่งครั้งใน Request ที่สำเร็จ (รอยืนยัน)
+        self.tiles = 0
+        self.reused = 0
+        self.recognized = 0
+        self.failed = 0
+        self.bytes_sent = 0
+
+    def accepts(self, frame: np.ndarray) -> bool:
+        return self.enabled and frame.shape[0] >= self.min_height
+
+    def plan_tiles(self, frame: np.ndarray) -> List[Tuple[int, int]]:
+        """แบ่งเฟรมเป็นแถบ (top, bottom) ตามบรรทัดข้อความ (list ว่าง = ไม่มีข้อความ)"""
+        return self._plan(to_grayscale(frame) if frame.ndim == 3 else frame)
+
+    def _plan(self, gray: np.ndarray) -> List[Tuple[int, int]]:
+        starts, ends = text_row_spans(gray, self.ink_tolerance)
+        if starts.size == 0:
+            return []
+
+        # รวมบรรทัดที่อยู่ติดกันเป็นแถบ จนกว่าจะสูงเกิน band_height
+        bands = []
+        band_start, band_end = int(starts[0]), int(ends[0])
+        for start, end in zip(starts[1:], ends[1:]):
+            if end - band_start <= self.band_height:
+                band_end = int(end)
+            else:
+                bands.append((band_start, band_end))
+                band_start, band_end = int(start), int(end)
+        bands.append((band_start, band_end))
+
+        # เว้นขอบแถบเข้าไปในช่องว่างเล็กน้อย (ไม่เกินครึ่งช่องว่าง) ให้ตัวอักษรไม่ชิดขอบ
+        h = gray.shape[0]
+        tiles = []
+        for i, (top, bottom) in enumerate(bands):
+            gap_above = top - bands[i - 1][1] if i > 0 else top
+            gap_below = bands[i + 1][0] - bottom if i + 1 < len(bands) else h - bottom
+            tiles.append((max(0, top - min(4, gap_above // 2)), min(h, bottom + min(4, gap_below // 2))))
+        return tiles
+
+    @staticmethod
+    def _tile_key(gray_tile: np.ndarray) -> bytes:
+        # Hash จากภาพสีเทา (ข้อมูลน้อยกว่า BGRA 4 เท่า) พอสำหรับแยกว่าข้อความในแถบเปลี่ยนหรือไม่
+        return hashlib.blake2b(np.ascontiguousarray(gray_tile), digest_size=16).digest()
+
+    def recognize(self, frame: np.ndarray) -> Optional[str]:
+        """OCR เฉพาะแถบที่เปลี่ยน แล้วคืนข้อความของทั้งพื้นที่ (None = ไม่พบข้อความ หรือมีแถบที่อ่านไม่สำเร็จ)"""
+        with tracing.span('tiles') as info:
+            gray = to_grayscale(frame)
+            bands = self._plan(gray)
+            tiles = [frame[top:bottom] for top, bottom in bands]
+            keys = [self._tile_key(gray[top:bottom]) for top, bottom in bands]
+
+            texts, dirty = {}, OrderedDict()   # dirty: key -> แถบที่ต้อง OCR (แถบซ้ำกันส่งครั้งเดียว)
+            with self._lock:
+                for key, tile in zip(keys, tiles):
+                    if key in self._texts:
+                        self._texts.move_to_end(key)
+                        texts[key] = self._texts[key]
+                    elif key not in dirty:
+                        dirty[key] = tile
+            info.update(tiles=len(tiles), dirty=len(dirty))
+
+        missing = []
+        if dirty:
+            with tracing.span('encode') as info:
+                images = [self.pipeline.run(tile) for tile in dirty.values()]
+                sent = info['bytes'] = sum(len(data) for data in images)
+            results = self.recognize_many(images)
+            # ผลว่างแยกไม่ได้ว่า Network ล่มหรือไม่มีข้อความจริง จะยืนยันว่า "ไม่มีข้อความ" ได้ก็ต่อเมื่อ
+            # แถบเดิมเคยว่างในชุดที่แถบอื่นอ่านได้ (แปลว่า Request สำเร็จ) แล้วว่างซ้ำอีกครั้ง
+            request_ok = any(results)
+            with self._lock:
+                for key, text in zip(dirty, results):
+                    if text:
+                        texts[key] = self._texts[key] = text
+                    elif self._empty.pop(key, False):
+                        texts[key] = self._texts[key] = ""
+                    else:
+                        missing.append(key)
+                        if request_ok:
+                            self._empty[key] = True
+                while len(self._texts) > self.max_entries:
+                    self._texts.popitem(last=False)
+                while len(self._empty) > self.max_entries:
+                    self._empty.popitem(last=False)
+                self.bytes_sent += sent
+                self.failed += len(missing)
+
+        with self._lock:
+            self.tiles += len(tiles)
+            self.recognized += len(dirty)
+            self.reused += len(tiles) - len(dirty)
+
+        if missing:
+            print(f"WARNING: OCR แถบข้อความไม่สำเร็จ {len(missing)} จาก {len(dirty)} แถบ")
+            return None
+        lines = [texts[key] for key in keys if texts.get(key)]
+        return "\n".join(lines) if lines else None
+
+    def clear(self):
+        with self._lock:
+            self._texts.clear()
+            self._empty.clear()
+            self.tiles = self.reused = self.recognized = self.failed = self.bytes_sent = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'tiles': self.tiles,
+                'reused': self.reused,
+                'recognized': self.recognized,
+                'failed': self.failed,
+                'bytes_sent': self.bytes_sent,
+                'entries': len(self._texts),
+            }
+
+
+def create_tiled_ocr(pipeline: ImagePipeline) -> TiledOcr:
+    """สร้าง TiledOcr ตามค่าใน settings (หมวด tiled_ocr) ใช้ OCR Backend เดียวกับ cloud_processor"""
+    def recognize_many(images):
+        # import ตอนใช้ครั้งแรก: cloud_processor โหลด Google Client ซึ่งช้า (ถ้ากำลังโหลดใน Background อยู่จะรอจนเสร็จ)
+        from cloud_processor import process_images_to_text
+        return process_images_to_text(images)
+
+    config = get_section('tiled_ocr')
+    return TiledOcr(
+        pipeline,
+        recognize_many,
+        min_height=config.get('min_height', 400),
+        band_height=config.get('band_height', 120),
+        ink_tolerance=config.get('ink_tolerance', 30),
+        max_entries=config.get('max_entries', 512),
+        enabled=config.get('enabled', True),
+    )
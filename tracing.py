@@ -0,0 +1,157 @@
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Optional
+
+from settings import get_base_path, get_section
+
+
+# ====================================================================
+# I. Trace / Span: จับเวลาทีละขั้นของ 1 Request (capture -> encode -> ocr -> translate -> render)
+# ====================================================================
+class Trace:
+    """
+    เก็บเวลาของแต่ละขั้นใน 1 Request พร้อม trace_id
+
+    ขั้นตอนต่างๆ เกิดคนละ Thread (GUI / Cloud Pool) จึงต้องส่ง Trace ไปด้วยเอง
+    แล้วเรียก activate() ใน Thread นั้น เพื่อให้ span() ที่อยู่ลึกลงไปบันทึกเข้า Trace นี้
+    """
+
+    def __init__(self, kind: str):
+        self.trace_id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.spans = []
+        self.attrs = {}
+        self.finished = False
+
+    def add_span(self, stage: str, duration_ms: float, **attrs):
+        self.spans.append({'stage': stage, 'ms': round(duration_ms, 3), **attrs})
+
+    def stage_ms(self, stage: str) -> float:
+        return sum(span['ms'] for span in self.spans if span['stage'] == stage)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def to_record(self) -> dict:
+        stages = {}
+        for span in self.spans:
+            stages[span['stage']] = round(stages.get(span['stage'], 0.0) + span['ms'], 3)
+        return {
+            'trace_id': self.trace_id,
+            'kind': self.kind,
+            'time': datetime.fromtimestamp(self.started_at).isoformat(timespec='milliseconds'),
+            'total_ms': round(self.elapsed_ms(), 3),
+            'stages': stages,
+            'spans': self.spans,
+            **self.attrs,
+        }
+
+    def finish(self, **attrs) -> Optional[dict]:
+        """ปิด Trace และเขียนลง Log (เรียกซ้ำได้ จะเขียนแค่ครั้งแรก)"""
+        if self.finished:
+            return None
+        self.finished = True
+        self.attrs.update(attrs)
+        record = self.to_record()
+        _write(record)
+        return record
+
+    def summary(self) -> str:
+        """ข้อความสั้นสำหรับแสดงบน Overlay"""
+        parts = [f"{span['stage']} {span['ms']:.0f}" for span in self.spans]
+        return f"{self.elapsed_ms():.0f} ms ({' / '.join(parts)})"
+
+
+_local = threading.local()
+
+
+def start_trace(kind: str) -> Optional[Trace]:
+    """เริ่ม Trace ใหม่ (คืน None ถ้าปิด tracing ใน settings)"""
+    if not get_section('tracing').get('enabled', True):
+        return None
+    return Trace(kind)
+
+
+def current_trace() -> Optional[Trace]:
+    return getattr(_local, 'trace', None)
+
+
+@contextmanager
+def activate(trace: Optional[Trace]):
+    """ตั้ง Trace ปัจจุบันของ Thread นี้ ระหว่างอยู่ใน with"""
+    previous = current_trace()
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+
+
+def bind(trace: Optional[Trace], fn):
+    """ห่อฟังก์ชันให้ทำงานภายใต้ Trace นี้ (ใช้ส่งงานเข้า Thread Pool)"""
+    if trace is None:
+        return fn
+
+    def bound(*args, **kwargs):
+        with activate(trace):
+            return fn(*args, **kwargs)
+    return bound
+
+
+@contextmanager
+def span(stage: str, **attrs):
+    """
+    จับเวลาขั้นตอนหนึ่งลง Trace ปัจจุบัน (ถ้าไม่มี Trace จะไม่ทำอะไร)
+    yield dict ที่ใส่ข้อมูลเพิ่มได้ระหว่างทำงาน เช่น info['bytes'] = len(payload)
+    """
+    trace = current_trace()
+    info = dict(attrs)
+    if trace is None:
+        yield info
+        return
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        trace.add_span(stage, (time.perf_counter() - start) * 1000, **info)
+
+
+# ====================================================================
+# II. Log แบบ JSON Lines (หมุนไฟล์อัตโนมัติ)
+# ====================================================================
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def _get_logger() -> logging.Logger:
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            config = get_section('tracing')
+            logger = logging.getLogger('torslate.timing')
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            path = os.path.join(get_base_path(), config.get('log_file', 'torslate_timing.jsonl'))
+            try:
+                handler = RotatingFileHandler(path, maxBytes=config.get('max_bytes', 1_000_000),
+                                              backupCount=config.get('backup_count', 3), encoding='utf-8')
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                logger.addHandler(handler)
+            except OSError as e:
+                print(f"Warning: เปิดไฟล์ Timing Log ไม่ได้: {e}")
+                logger.addHandler(logging.NullHandler())
+            _logger = logger
+        return _logger
+
+
+def _write(record: dict):
+    _get_logger().info(json.dumps(record, ensure_ascii=False))
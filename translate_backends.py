@@ -0,0 +1,81 @@
+import html
+from typing import List, Sequence
+
+from settings import get_section
+
+
+# ====================================================================
+# I. Interface
+# ====================================================================
+class TranslateBackend:
+    """ตัวแปลภาษา: รับหลายข้อความ คืนคำแปลตามลำดับเดิม (raise Exception เมื่อล้มเหลว)"""
+    name = "base"
+
+    def translate_many(self, texts: Sequence[str], target_language: str, source_language: str) -> List[str]:
+        raise NotImplementedError
+
+
+# ====================================================================
+# II. Google Cloud Translation v2 (หรือ Mock Server ที่ตั้งไว้ในหมวด cloud_endpoints)
+# ====================================================================
+class GoogleTranslateBackend(TranslateBackend):
+    """
+    แปลผ่าน translate_v2.Client จาก CloudClientManager
+
+    Args:
+        manager: CloudClientManager ที่จะใช้ (None = cloud_processor.client_manager ณ ตอนเรียก)
+    """
+    name = "google"
+
+    def __init__(self, manager=None):
+        self.manager = manager
+
+    def _manager(self):
+        if self.manager is not None:
+            return self.manager
+        import cloud_processor
+        return cloud_processor.client_manager
+
+    def translate_many(self, texts: Sequence[str], target_language: str, source_language: str) -> List[str]:
+        import cloud_processor
+        manager = self._manager()
+        # ผ่าน ApiGuard ของ 'translate' (Rate Limit / Retry / Circuit Breaker ร่วมกับทั้งโปรแกรม)
+        response = cloud_processor.api_guards['translate'].call(
+            lambda: manager.get_translate_client().translate(list(texts), target_language=target_language,
+                                                             source_language=source_language),
+            on_error=lambda e: manager.handle_error('translate', e))
+        # Google ส่งกลับมาเป็น HTML Entity (เช่น &#39;) ต้อง unescape
+        return [html.unescape(item['translatedText'].strip()) for item in response]
+
+
+# ====================================================================
+# III. โมเดลแปลภาษาในเครื่อง (Offline)
+# ====================================================================
+class LocalModelBackend(TranslateBackend):
+    """
+    แปลด้วย Argos Translate ในเครื่อง (pip install argostranslate แล้วติดตั้งแพ็กเกจภาษา en -> th)
+    ไม่มี Latency ของ Network และไม่เสียโควตา เหมาะกับข้อความสั้นที่แปลซ้ำบ่อย
+    """
+    name = "local_model"
+
+    def __init__(self):
+        self._translate = None
+
+    def translate_many(self, texts: Sequence[str], target_language: str, source_language: str) -> List[str]:
+        if self._translate is None:
+            try:
+                from argostranslate.translate import translate
+            except ImportError as e:
+                raise RuntimeError("ยังไม่ได้ติดตั้ง argostranslate (pip install argostranslate)") from e
+            self._translate = translate
+        return [self._translate(text, source_language, target_language) for text in texts]
+
+
+def create_translate_backend() -> TranslateBackend:
+    """สร้าง Backend ตามค่าใน settings (หมวด translate: 'google' | 'local_model')"""
+    mode = get_section('translate').get('backend', 'google')
+    if mode == 'google':
+        return GoogleTranslateBackend()
+    if mode == 'local_model':
+        return LocalModelBackend()
+    raise ValueError(f"Unknown translate backend: {mode} (ใช้ได้: google, local_model)")
@@ -0,0 +1,212 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from settings import get_base_path, get_section
+
+
+# ====================================================================
+# Cache คำแปลแบบถาวร (SQLite) + LRU ในหน่วยความจำ
+# ====================================================================
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """ทำให้ข้อความที่ต่างกันแค่ช่องว่าง/การขึ้นบรรทัด ได้ Key เดียวกัน"""
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+class TranslationCache:
+    """
+    เก็บคำแปลตาม Key (ข้อความที่ normalize แล้ว, ภาษาต้นทาง, ภาษาปลายทาง)
+
+    - ชั้นแรกเป็น LRU ใน RAM (ตอบกลับระดับไมโครวินาที)
+    - ชั้นที่สองเป็นไฟล์ SQLite (อยู่รอดข้ามการเปิดโปรแกรม)
+    - จำกัดทั้งจำนวนรายการ (max_entries) และอายุ (max_age_seconds)
+
+    Args:
+        db_path: path ของไฟล์ SQLite (':memory:' สำหรับไม่เขียนไฟล์)
+        max_entries: จำนวนแถวสูงสุดในไฟล์
+        max_age_seconds: อายุสูงสุดของแต่ละรายการ (None = ไม่หมดอายุ)
+        memory_entries: จำนวนรายการใน LRU
+        enabled: False = ข้าม Cache ทั้งหมด
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 50000, max_age_seconds: Optional[float] = None,
+                 memory_entries: int = 1024, enabled: bool = True):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self.memory_entries = memory_entries
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._conn = None
+        self._disk_count = 0
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+
+    # --- SQLite ---
+    def _connect(self) -> sqlite3.Connection:
+        # เปิดไฟล์ตอนใช้งานครั้งแรก (ไม่ถ่วงการเปิดโปรแกรม)
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS translations (
+                    source_text TEXT NOT NULL,
+                    source_lang TEXT NOT NULL,
+                    target_lang TEXT NOT NULL,
+                    translated TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL,
+                    PRIMARY KEY (source_text, source_lang, target_lang)
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON translations(last_used_at)")
+            self._purge_expired()
+            self._disk_count = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            self._conn.commit()
+        return self._conn
+
+    def _purge_expired(self):
+        if self.max_age_seconds is not None:
+            self._conn.execute("DELETE FROM translations WHERE created_at < ?",
+                               (time.time() - self.max_age_seconds,))
+
+    def _evict_overflow(self):
+        overflow = self._disk_count - self.max_entries
+        if overflow > 0:
+            self._conn.execute("""
+                DELETE FROM translations WHERE rowid IN (
+                    SELECT rowid FROM translations ORDER BY last_used_at ASC LIMIT ?
+                )
+            """, (overflow,))
+            self._disk_count = self.max_entries
+
+    # --- LRU ในหน่วยความจำ ---
+    def _remember(self, key, translated: str, created_at: float):
+        self._memory[key] = (translated, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _is_expired(self, created_at: float) -> bool:
+        return self.max_age_seconds is not None and time.time() - created_at > self.max_age_seconds
+
+    # --- Public API ---
+    def get(self, text: str, source_language: str, target_language: str) -> Optional[str]:
+        """คืนคำแปลที่เคยเก็บไว้ หรือ None ถ้าไม่มี/หมดอายุ"""
+        if not self.enabled:
+            return None
+        key = (normalize_text(text), source_language, target_language)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and not self._is_expired(entry[1]):
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return entry[0]
+            self._memory.pop(key, None)
+
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT translated, created_at FROM translations "
+                    "WHERE source_text = ? AND source_lang = ? AND target_lang = ?", key
+                ).fetchone()
+                if row is not None and self._is_expired(row[1]):
+                    conn.execute("DELETE FROM translations WHERE source_text = ? AND source_lang = ? "
+                                 "AND target_lang = ?", key)
+                    self._disk_count -= 1
+                    row = None
+                if row is not None:
+                    conn.execute("UPDATE translations SET last_used_at = ? WHERE source_text = ? "
+                                 "AND source_lang = ? AND target_lang = ?", (time.time(),) + key)
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: อ่าน Translation Cache ไม่ได้: {e}")
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, row[0], row[1])
+            return row[0]
+
+    def put(self, text: str, source_language: str, target_language: str, translated: str):
+        """บันทึกคำแปลลงทั้ง RAM และไฟล์"""
+        if not self.enabled or not translated:
+            return
+        key = (normalize_text(text), source_language, target_language)
+        now = time.time()
+        with self._lock:
+            self._remember(key, translated, now)
+            try:
+                conn = self._connect()
+                exists = conn.execute(
+                    "SELECT 1 FROM translations WHERE source_text = ? AND source_lang = ? AND target_lang = ?", key
+                ).fetchone() is not None
+                conn.execute("""
+                    INSERT OR REPLACE INTO translations
+                        (source_text, source_lang, target_lang, translated, created_at, last_used_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, key + (translated, now, now))
+                if not exists:
+                    self._disk_count += 1
+                self._evict_overflow()
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: เขียน Translation Cache ไม่ได้: {e}")
+
+    def clear(self):
+        """ล้าง Cache ทั้ง RAM และไฟล์ และรีเซ็ตตัวนับ"""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.memory_hits = self.misses = 0
+            try:
+                conn = self._connect()
+                conn.execute("DELETE FROM translations")
+                conn.commit()
+                self._disk_count = 0
+            except sqlite3.Error as e:
+                print(f"Warning: ล้าง Translation Cache ไม่ได้: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'memory_hits': self.memory_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'disk_entries': self._disk_count,
+            }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def create_translation_cache() -> TranslationCache:
+    """สร้าง Cache ตามค่าใน settings (หมวด translation_cache)"""
+    config = get_section('translation_cache')
+    max_age_days = config.get('max_age_days')
+    return TranslationCache(
+        db_path=os.path.join(get_base_path(), config.get('file_name', 'translation_cache.sqlite3')),
+        max_entries=config.get('max_entries', 50000),
+        max_age_seconds=max_age_days * 86400 if max_age_days else None,
+        memory_entries=config.get('memory_entries', 1024),
+        enabled=config.get('enabled', True),
+    )
@@ -0,0 +1,494 @@
+import os
+import re
+import csv
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from settings import get_base_path, get_section
+from translation_cache import normalize_text
+
+
+# ====================================================================
+# I. ทำข้อความให้เป็นรูปแบบกลาง (ลบความต่างที่มาจาก OCR)
+# ====================================================================
+# ตัวอักษรที่ OCR มักสับสนกัน -> ตัวแทนเดียวกัน (แปลงก่อนทำเป็นตัวเล็ก)
+_CONFUSABLES = str.maketrans({'I': 'l', '|': 'l', '’': "'", '‘': "'", '“': '"', '”': '"'})
+_NOISE_RE = re.compile(r'[\W_]+', re.UNICODE)   # ช่องว่าง + เครื่องหมายวรรคตอน
+_DIGITS_RE = re.compile(r'\d+')
+_PUNCTUATION_RE = re.compile(r'[?!.,;:]')
+
+
+def canonical_text(text: str) -> str:
+    """
+    รูปแบบกลางสำหรับเทียบข้อความ: I/| -> l, ตัวเล็กทั้งหมด, ตัดช่องว่างและเครื่องหมายวรรคตอนทิ้ง
+    เช่น "Hello, Illidan!" กับ "Hel lo lllidan" ได้ค่าเดียวกัน
+    """
+    return _NOISE_RE.sub('', normalize_text(text).translate(_CONFUSABLES).lower())
+
+
+def digit_signature(text: str) -> str:
+    """ตัวเลขในข้อความ (ข้อความที่ตัวเลขต่างกัน เช่น "เก็บ 10 ชิ้น" / "เก็บ 12 ชิ้น" ห้ามใช้คำแปลร่วมกัน)"""
+    return ' '.join(_DIGITS_RE.findall(text))
+
+
+def punctuation_signature(text: str) -> str:
+    """เครื่องหมายวรรคตอนในข้อความ ตามลำดับ ("ทางนี้ถูกแล้ว." กับ "ทางนี้ถูกไหม?" ห้ามใช้คำแปลร่วมกัน)"""
+    return ''.join(_PUNCTUATION_RE.findall(normalize_text(text).replace('…', '...')))
+
+
+# ====================================================================
+# II. ตรวจว่าสองข้อความต่างกันแค่ "แบบที่ OCR อ่านผิด" หรือไม่
+# ====================================================================
+# ตัวอักษร / กลุ่มตัวอักษรที่ OCR มักอ่านสลับกัน (หลัง canonical: I -> l และเป็นตัวเล็กแล้ว)
+_OCR_CONFUSIONS = {frozenset(pair) for pair in (
+    ('l', '1'), ('l', 'i'), ('1', 'i'), ('o', '0'), ('rn', 'm'), ('cl', 'd'), ('vv', 'w'), ('ii', 'u'),
+)}
+# คำปฏิเสธ (รวมคำที่ลงท้ายด้วย n't) ต่างกันแม้ตัวเดียว = ความหมายกลับกัน
+_NEGATIONS = frozenset(('no', 'not', 'never', 'nor', 'none', 'nothing', 'nobody', 'nowhere', 'neither',
+                        'cannot', 'without'))
+_WORD_RE = re.compile(r"[^\W_]+(?:'[^\W_]+)*", re.UNICODE)
+
+
+def ocr_words(text: str) -> List[str]:
+    """คำในข้อความ (ตัวเล็ก, I/| -> l, เก็บ ' ในคำไว้ เช่น don't)"""
+    return _WORD_RE.findall(normalize_text(text).translate(_CONFUSABLES).lower())
+
+
+def _negations(words: List[str]) -> List[str]:
+    return sorted(w for w in words if w in _NEGATIONS or w.endswith("n't"))
+
+
+def _small_edit(a: str, b: str) -> bool:
+    """
+    คำ (หรือกลุ่มคำที่ OCR แยก / รวมช่องว่างผิด) ต่างกันแค่เล็กน้อย:
+    ตัวอักษรที่ OCR สับสนกันได้ไม่จำกัด + แก้ไขทั่วไปได้ 1 ตำแหน่ง (แทน / เพิ่ม / ลบ 1 ตัว)
+    เฉพาะคำที่ยาวอย่างน้อย 4 ตัว (คำสั้นต่างกัน 1 ตัวมักเป็นคนละคำ เช่น can / cat)
+    """
+    a, b = a.replace("'", ''), b.replace("'", '')
+    edits = 0
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == 'equal':
+            continue
+        if tag == 'replace' and frozenset((a[i1:i2], b[j1:j2])) in _OCR_CONFUSIONS:
+            continue
+        if max(i2 - i1, j2 - j1) > 1 or min(len(a), len(b)) < 4:
+            return False
+        edits += 1
+    return edits <= 1
+
+
+def is_ocr_variant(a: str, b: str) -> bool:
+    """
+    สองข้อความต่างกันเฉพาะแบบที่มาจาก OCR อ่านผิด (ใช้คำแปลร่วมกันได้):
+        - คำปฏิเสธ ตัวเลข และเครื่องหมายวรรคตอนต้องเหมือนกันทุกตัว
+        - ห้ามมีคำที่เพิ่ม / หายไปทั้งคำ (can -> cannot, honest -> dishonest ไม่ผ่าน)
+        - คำที่ต่างกันต้องต่างแค่ตัวอักษรที่ OCR สับสนกัน (l/1/I, O/0, rn/m ...) หรือแก้ไข 1 ตัวในคำยาว
+          (ยอมให้ช่องว่างแยก / รวมคำผิดได้ เช่น "Hel lo" / "Hello")
+    """
+    if digit_signature(a) != digit_signature(b) or punctuation_signature(a) != punctuation_signature(b):
+        return False
+    words_a, words_b = ocr_words(a), ocr_words(b)
+    if _negations(words_a) != _negations(words_b):
+        return False
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, words_a, words_b, autojunk=False).get_opcodes():
+        if tag == 'equal':
+            continue
+        # insert / delete = คำหายไปทั้งคำ, replace หลายคำ = เกินกว่าการแยก / รวมคำผิด 1 จุด
+        if tag != 'replace' or (i2 - i1) + (j2 - j1) > 3:
+            return False
+        if not _small_edit(''.join(words_a[i1:i2]), ''.join(words_b[j1:j2])):
+            return False
+    return True
+
+
+# ====================================================================
+# III. MinHash ของ Trigram (ใช้หาข้อความที่ใกล้เคียงโดยไม่ต้องเทียบทุกรายการ)
+# ====================================================================
+_PRIME = (1 << 31) - 1
+
+
+class MinHasher:
+    """
+    สร้างลายเซ็น MinHash num_perm ค่าจาก Trigram ของข้อความ แล้วแบ่งเป็น bands กลุ่ม
+    ข้อความที่มี Band ใดตรงกันอย่างน้อย 1 กลุ่มถือเป็น "ผู้สมัคร" ที่ต้องตรวจความเหมือนจริงอีกที
+    (Jaccard ~0.8 ขึ้นไป แทบทุกคู่จะเป็นผู้สมัคร ส่วนข้อความที่ต่างกันมากแทบไม่เคยชนกัน)
+
+    ใช้ Seed คงที่ ลายเซ็นที่บันทึกลงไฟล์จึงใช้ข้ามการเปิดโปรแกรมได้
+    """
+
+    def __init__(self, num_perm: int = 32, bands: int = 8):
+        if num_perm % bands:
+            raise ValueError("num_perm ต้องหารด้วย bands ลงตัว")
+        self.num_perm = num_perm
+        self.bands = bands
+        self._band_bytes = num_perm // bands * 4   # ลายเซ็นเก็บเป็น uint32
+        rng = np.random.RandomState(1)
+        self._a = rng.randint(1, _PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _PRIME, size=num_perm).astype(np.uint64)
+
+    @staticmethod
+    def shingles(canonical: str) -> np.ndarray:
+        if len(canonical) < 3:
+            canonical = canonical.ljust(3, '\0')
+        grams = {canonical[i:i + 3] for i in range(len(canonical) - 2)}
+        return np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams), dtype=np.uint64, count=len(grams))
+
+    def signature(self, canonical: str) -> np.ndarray:
+        hashes = self.shingles(canonical)
+        return ((np.outer(hashes, self._a) + self._b) % _PRIME).min(axis=0).astype(np.uint32)
+
+    def band_keys(self, signature: bytes) -> List[bytes]:
+        """แบ่งลายเซ็น (bytes ของ uint32) เป็น Key ของแต่ละ Band"""
+        size = self._band_bytes
+        return [signature[i:i + size] for i in range(0, len(signature), size)]
+
+
+# ====================================================================
+# IV. Translation Memory แบบยอมรับความคลาดเคลื่อนของ OCR
+# ====================================================================
+class MemoryEntry(NamedTuple):
+    source_text: str
+    source_lang: str
+    target_lang: str
+    translated: str
+    canonical: str
+    digits: str
+    punctuation: str
+    band_keys: Tuple[bytes, ...]
+
+
+class TranslationMemory:
+    """
+    จำคำแปลของประโยคที่เคยแปล แล้วนำกลับมาใช้กับประโยคที่ "เกือบเหมือน" (ต่างกันจาก OCR)
+    ใช้หลัง TranslationCache (ซึ่งต้องตรงกันทุกตัวอักษร) และก่อนเรียก API
+
+    ค้นหา 2 ชั้น:
+        1. รูปแบบกลางตรงกัน (canonical_text) -> ใช้ได้ทันที
+        2. MinHash LSH หาผู้สมัคร เทียบด้วย SequenceMatcher ต้องได้อย่างน้อย threshold แล้วต้องผ่าน
+           is_ocr_variant (ต่างกันแค่ตัวอักษรที่ OCR อ่านผิด ไม่ใช่คำที่เพิ่ม / หาย หรือคำปฏิเสธที่เปลี่ยน)
+    ทั้งสองชั้นต้องมีตัวเลขและเครื่องหมายวรรคตอนชุดเดียวกัน และข้อความต้องยาวอย่างน้อย min_chars
+    (ประโยคสั้นๆ ต่างกัน 1 ตัวก็เป็นคนละคำ)
+
+    Args:
+        db_path: path ของไฟล์ SQLite (':memory:' สำหรับไม่เขียนไฟล์)
+        threshold: ความเหมือนขั้นต่ำ (0.0 - 1.0) ของรูปแบบกลาง
+        min_chars: ความยาวขั้นต่ำของรูปแบบกลางที่จะจำ/ค้นแบบใกล้เคียง
+        max_entries: จำนวนรายการสูงสุด (เกินแล้วลบรายการเก่าสุด)
+        num_perm, bands: ขนาดลายเซ็น MinHash
+        enabled: False = ไม่จำและไม่ค้นหา
+    """
+
+    def __init__(self, db_path: str, threshold: float = 0.9, min_chars: int = 8, max_entries: int = 50000,
+                 num_perm: int = 32, bands: int = 8, enabled: bool = True):
+        self.db_path = db_path
+        self.threshold = threshold
+        self.min_chars = min_chars
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hasher = MinHasher(num_perm, bands)
+
+        self._lock = threading.Lock()
+        self._conn = None
+        self._entries = OrderedDict()   # (source_lang, target_lang, canonical) -> MemoryEntry (เก่า -> ใหม่)
+        self._buckets = {}              # (source_lang, target_lang) -> [dict ต่อ Band: band_key -> list ของ key]
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+
+    # --- SQLite ---
+    def _connect(self) -> sqlite3.Connection:
+        # เปิดไฟล์และสร้าง Index ในหน่วยความจำตอนใช้งานครั้งแรก (ไม่ถ่วงการเปิดโปรแกรม)
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS memory (
+                    canonical TEXT NOT NULL,
+                    source_lang TEXT NOT NULL,
+                    target_lang TEXT NOT NULL,
+                    source_text TEXT NOT NULL,
+                    translated TEXT NOT NULL,
+                    signature BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (canonical, source_lang, target_lang)
+                )
+            """)
+            self._conn.commit()
+            self._load()
+        return self._conn
+
+    def _load(self):
+        rows = self._conn.execute("SELECT source_text, source_lang, target_lang, translated, canonical, signature "
+                                  "FROM memory ORDER BY created_at").fetchall()
+        stale = []
+        for source_text, source_lang, target_lang, translated, canonical, signature in rows:
+            if len(signature) != self.hasher.num_perm * 4:
+                # ตั้ง num_perm ใหม่ -> คำนวณลายเซ็นใหม่
+                signature = self.hasher.signature(canonical).tobytes()
+                stale.append((signature, canonical, source_lang, target_lang))
+            self._index(MemoryEntry(source_text, source_lang, target_lang, translated, canonical,
+                                    digit_signature(source_text), punctuation_signature(source_text),
+                                    tuple(self.hasher.band_keys(signature))))
+        if stale:
+            self._conn.executemany("UPDATE memory SET signature = ? WHERE canonical = ? AND source_lang = ? "
+                                   "AND target_lang = ?", stale)
+            self._conn.commit()
+
+    # --- Index ในหน่วยความจำ ---
+    def _index(self, entry: MemoryEntry):
+        key = (entry.source_lang, entry.target_lang, entry.canonical)
+        if key in self._entries:
+            self._unindex(key)
+        self._entries[key] = entry
+        bands = self._buckets.get(key[:2])
+        if bands is None:
+            bands = self._buckets[key[:2]] = [{} for _ in range(self.hasher.bands)]
+        for buckets, band_key in zip(bands, entry.band_keys):
+            bucket = buckets.get(band_key)
+            if bucket is None:
+                buckets[band_key] = [key]
+            else:
+                bucket.append(key)
+
+    def _unindex(self, key):
+        entry = self._entries.pop(key)
+        for buckets, band_key in zip(self._buckets[key[:2]], entry.band_keys):
+            bucket = buckets.get(band_key)
+            if bucket is not None and key in bucket:
+                bucket.remove(key)
+                if not bucket:
+                    del buckets[band_key]
+
+    def _best_match(self, text: str, canonical: str, digits: str, punctuation: str, source_language: str,
+                    target_language: str, band_keys: List[bytes]) -> Optional[MemoryEntry]:
+        candidates = set()
+        for buckets, band_key in zip(self._buckets.get((source_language, target_language), ()), band_keys):
+            candidates.update(buckets.get(band_key, ()))
+
+        # ข้อความที่ค้นเป็น seq2 (SequenceMatcher เตรียม Index ของ seq2 ครั้งเดียว ใช้กับทุกผู้สมัคร)
+        matcher = SequenceMatcher(None, b=canonical, autojunk=False)
+        best, best_ratio = None, self.threshold
+        for key in candidates:
+            entry = self._entries[key]
+            # ความยาวต่างกันมาก -> ratio ไม่มีทางถึงเกณฑ์ (เหมือน real_quick_ratio แต่ไม่ต้องสร้าง Matcher)
+            total = len(canonical) + len(entry.canonical)
+            if entry.digits != digits or entry.punctuation != punctuation \
+                    or 2.0 * min(len(canonical), len(entry.canonical)) < best_ratio * total:
+                continue
+            matcher.set_seq1(entry.canonical)
+            if matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= best_ratio and is_ocr_variant(entry.source_text, text):
+                best, best_ratio = entry, ratio
+        return best
+
+    # --- Public API ---
+    def get(self, text: str, source_language: str, target_language: str) -> Optional[str]:
+        """คืนคำแปลของประโยคที่เหมือน/ใกล้เคียงที่สุด หรือ None ถ้าไม่มีที่ใกล้พอ"""
+        if not self.enabled or not text:
+            return None
+        canonical = canonical_text(text)
+        if len(canonical) < self.min_chars:
+            return None
+        digits = digit_signature(text)
+        punctuation = punctuation_signature(text)
+
+        with self._lock:
+            try:
+                self._connect()
+            except sqlite3.Error as e:
+                print(f"Warning: เปิด Translation Memory ไม่ได้: {e}")
+                return None
+            entry = self._entries.get((source_language, target_language, canonical))
+            if entry is not None and entry.digits == digits and entry.punctuation == punctuation:
+                self.exact_hits += 1
+                return entry.translated
+
+        # คำนวณลายเซ็นนอก Lock (ส่วนที่ใช้เวลาที่สุด)
+        band_keys = self.hasher.band_keys(self.hasher.signature(canonical).tobytes())
+        with self._lock:
+            entry = self._best_match(text, canonical, digits, punctuation, source_language, target_language,
+                                     band_keys)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.fuzzy_hits += 1
+            return entry.translated
+
+    def put(self, text: str, source_language: str, target_language: str, translated: str):
+        """จำคำแปล (ข้อความที่สั้นกว่า min_chars จะไม่ถูกจำ)"""
+        self.put_many([(text, source_language, target_language, translated)])
+
+    def put_many(self, items: Iterable[Tuple[str, str, str, str]]) -> int:
+        """จำคำแปลหลายรายการในครั้งเดียว (text, source_lang, target_lang, translated) คืนจำนวนที่จำได้"""
+        if not self.enabled:
+            return 0
+        now = time.time()
+        entries, rows = [], []
+        for text, source_language, target_language, translated in items:
+            canonical = canonical_text(text or '')
+            if not translated or len(canonical) < self.min_chars:
+                continue
+            signature = self.hasher.signature(canonical).tobytes()
+            source_text = normalize_text(text)
+            entries.append(MemoryEntry(source_text, source_language, target_language, translated, canonical,
+                                       digit_signature(text), punctuation_signature(text),
+                                       tuple(self.hasher.band_keys(signature))))
+            rows.append((canonical, source_language, target_language, source_text, translated, signature, now))
+        if not entries:
+            return 0
+
+        with self._lock:
+            try:
+                conn = self._connect()
+            except sqlite3.Error as e:
+                print(f"Warning: เปิด Translation Memory ไม่ได้: {e}")
+                return 0
+            for entry in entries:
+                self._index(entry)
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                key = next(iter(self._entries))
+                self._unindex(key)
+                evicted.append((key[2], key[0], key[1]))
+            try:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO memory
+                        (canonical, source_lang, target_lang, source_text, translated, signature, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                if evicted:
+                    conn.executemany("DELETE FROM memory WHERE canonical = ? AND source_lang = ? "
+                                     "AND target_lang = ?", evicted)
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: เขียน Translation Memory ไม่ได้: {e}")
+        return len(entries)
+
+    def preload(self) -> threading.Thread:
+        """โหลดไฟล์และสร้าง Index ใน Background Thread (ค้นหาระหว่างโหลดจะรอจนโหลดเสร็จ)"""
+        thread = threading.Thread(target=self._preload, name="MemoryPreload", daemon=True)
+        thread.start()
+        return thread
+
+    def _preload(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            try:
+                self._connect()
+            except sqlite3.Error as e:
+                print(f"Warning: เปิด Translation Memory ไม่ได้: {e}")
+
+    # --- นำเข้า / ส่งออก ---
+    def export_file(self, path: str) -> int:
+        """
+        ส่งออกทุกรายการเป็นไฟล์ .jsonl (บรรทัดละ {"source", "translated", "source_lang", "target_lang"})
+        หรือ .csv (คอลัมน์เดียวกัน) ตามนามสกุลไฟล์ คืนจำนวนรายการ
+        """
+        with self._lock:
+            self._connect()
+            entries = list(self._entries.values())
+        fields = ('source', 'translated', 'source_lang', 'target_lang')
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            if path.lower().endswith('.csv'):
+                writer = csv.writer(f)
+                writer.writerow(fields)
+                for e in entries:
+                    writer.writerow((e.source_text, e.translated, e.source_lang, e.target_lang))
+            else:
+                for e in entries:
+                    f.write(json.dumps(dict(zip(fields, (e.source_text, e.translated, e.source_lang, e.target_lang))),
+                                       ensure_ascii=False) + "\n")
+        return len(entries)
+
+    def import_file(self, path: str, source_language: str = 'en', target_language: str = 'th') -> int:
+        """
+        นำเข้าจากไฟล์ .jsonl / .csv แบบเดียวกับ export_file (ไม่มีคอลัมน์ภาษา = ใช้ค่าที่ส่งมา)
+        รายการที่ซ้ำกับของเดิมจะเขียนทับ คืนจำนวนรายการที่นำเข้า
+        """
+        with open(path, encoding='utf-8', newline='') as f:
+            if path.lower().endswith('.csv'):
+                records = list(csv.DictReader(f))
+            else:
+                records = [json.loads(line) for line in f if line.strip()]
+        return self.put_many((r.get('source', ''), r.get('source_lang') or source_language,
+                              r.get('target_lang') or target_language, r.get('translated', ''))
+                             for r in records)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            self.exact_hits = self.fuzzy_hits = self.misses = 0
+            try:
+                conn = self._connect()
+                conn.execute("DELETE FROM memory")
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: ล้าง Translation Memory ไม่ได้: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.exact_hits + self.fuzzy_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'buckets': sum(len(buckets) for bands in self._buckets.values() for buckets in bands),
+                'exact_hits': self.exact_hits,
+                'fuzzy_hits': self.fuzzy_hits,
+                'misses': self.misses,
+                'hit_rate': (self.exact_hits + self.fuzzy_hits) / lookups if lookups else 0.0,
+            }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def create_translation_memory() -> TranslationMemory:
+    """สร้าง Translation Memory ตามค่าใน settings (หมวด translation_memory)"""
+    config = get_section('translation_memory')
+    return TranslationMemory(
+        db_path=os.path.join(get_base_path(), config.get('file_name', 'translation_memory.sqlite3')),
+        threshold=config.get('threshold', 0.9),
+        min_chars=config.get('min_chars', 8),
+        max_entries=config.get('max_entries', 50000),
+        num_perm=config.get('num_perm', 32),
+        bands=config.get('bands', 8),
+        enabled=config.get('enabled', True),
+    )
+
+
+if __name__ == '__main__':
+    # นำเข้า / ส่งออก Translation Memory:
+    #   python translation_memory.py export memory.jsonl
+    #   python translation_memory.py import glossary.csv
+    import argparse
+    parser = argparse.ArgumentParser(description="นำเข้า / ส่งออก Translation Memory (.jsonl หรือ .csv)")
+    parser.add_argument('command', choices=('import', 'export', 'stats'))
+    parser.add_argument('path', nargs='?')
+    parser.add_argument('--source', default='en', help="ภาษาต้นทาง ถ้าไฟล์นำเข้าไม่ได้ระบุ")
+    parser.add_argument('--target', default='th', help="ภาษาปลายทาง ถ้าไฟล์นำเข้าไม่ได้ระบุ")
+    args = parser.parse_args()
+    if args.command != 'stats' and not args.path:
+        parser.error("ต้องระบุไฟล์")
+
+    memory = create_translation_memory()
+    if args.command == 'import':
+        print(f"นำเข้า {memory.import_file(args.path, args.source, args.target)} รายการ")
+    elif args.command == 'export':
+        print(f"ส่งออก {memory.export_file(args.path)} รายการ")
+    print(memory.stats())
+    memory.close()
@@ -0,0 +1,553 @@
+"""
+ดึงคำบรรยายจากไฟล์วิดีโอ (เกม / คลิปที่ไม่มีซับไตเติล) แล้วแปลเป็นไฟล์ SRT / VTT
+
+อ่านวิดีโอทีละเฟรมแบบ Streaming (ไม่โหลดทั้งไฟล์) เฉพาะพื้นที่คำบรรยาย แล้วเทียบลายนิ้วมือของตัวอักษร
+กับเฟรมก่อนหน้า (ถูกมาก) จะส่ง OCR ก็ต่อเมื่อคำบรรยายเปลี่ยนและนิ่งแล้วเท่านั้น
+คำบรรยายเดียวกันที่ OCR ซ้ำ (เช่น ฉากหลังเปลี่ยนแต่ข้อความเดิม) จะถูกรวมเป็นช่วงเวลาเดียว
+หน่วยความจำคงที่ไม่ขึ้นกับความยาววิดีโอ: ใช้ Buffer เฟรมเดียว และมีงาน OCR ค้างได้ไม่เกิน max_pending งาน
+
+ตัวถอดรหัสวิดีโอ (เลือกอัตโนมัติ):
+    ffmpeg  : โปรแกรม ffmpeg ใน PATH (หรือระบุด้วย --ffmpeg) ตัดพื้นที่และลดเฟรมตั้งแต่ตอนถอดรหัส
+    opencv  : pip install opencv-python
+
+วิธีใช้:
+    python video_subtitles.py gameplay.mp4                       # -> gameplay.th.srt (พื้นที่ 25% ล่างของภาพ)
+    python video_subtitles.py clip.mkv -o clip.vtt --region 0,880,1920,200 --original
+"""
+import os
+import re
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+import settings
+from settings import get_section
+from frame_tools import frame_thumbnail, thumbnail_diff_ratio
+from image_pipeline import to_grayscale
+from translation_memory import canonical_text
+
+Region = Tuple[int, int, int, int]   # (x, y, กว้าง, สูง) หน่วย Pixel ของวิดีโอ
+
+
+class VideoInfo(NamedTuple):
+    width: int
+    height: int
+    duration: float   # วินาที (0 = ไม่ทราบ)
+
+
+def resolve_region(region: Optional[Region], info: VideoInfo, bottom_fraction: float = 0.25) -> Region:
+    """ตัดพื้นที่ให้อยู่ในภาพ (None = แถบล่างสุดสูง bottom_fraction ของภาพ ซึ่งเป็นตำแหน่งคำบรรยายทั่วไป)"""
+    if region is None:
+        h = max(1, int(info.height * bottom_fraction))
+        return 0, info.height - h, info.width, h
+    x, y, w, h = region
+    x, y = max(0, min(x, info.width - 1)), max(0, min(y, info.height - 1))
+    return x, y, max(1, min(w, info.width - x)), max(1, min(h, info.height - y))
+
+
+def parse_region(text: str) -> Region:
+    """'x,y,w,h' -> (x, y, w, h)"""
+    values = [int(v) for v in text.replace(' ', '').split(',')]
+    if len(values) != 4 or values[2] <= 0 or values[3] <= 0:
+        raise ValueError(f"พื้นที่ต้องเป็น x,y,กว้าง,สูง: {text}")
+    return tuple(values)
+
+
+# ====================================================================
+# I. ตัวถอดรหัสวิดีโอ: frames() คืน (เวลาเป็นวินาที, เฟรม BGRA ของพื้นที่คำบรรยาย)
+#    เฟรมที่ได้ใช้ได้จนกว่าจะอ่านเฟรมถัดไป (Buffer เดิมถูกเขียนทับ)
+# ====================================================================
+class FfmpegReader:
+    """
+    ถอดรหัสด้วย ffmpeg ใน Process แยก ให้ ffmpeg ลดเฟรม (fps) และตัดพื้นที่ (crop) เอง
+    แล้วอ่าน Pixel ดิบจาก Pipe ลง Buffer เดียวตลอดทั้งไฟล์
+
+    Args:
+        path: ไฟล์วิดีโอ
+        fps: จำนวนเฟรมต่อวินาทีของวิดีโอที่นำมาตรวจ
+        region: พื้นที่คำบรรยาย (None = แถบล่าง bottom_fraction ของภาพ)
+        ffmpeg: path ของ ffmpeg (ว่าง = หาใน PATH)
+    """
+    name = "ffmpeg"
+
+    def __init__(self, path: str, fps: float, region: Optional[Region] = None, bottom_fraction: float = 0.25,
+                 ffmpeg: str = ''):
+        self.path = path
+        self.fps = fps
+        self.ffmpeg = ffmpeg or shutil.which('ffmpeg')
+        if not self.ffmpeg:
+            raise RuntimeError("ไม่พบโปรแกรม ffmpeg (ติดตั้งแล้วเพิ่มใน PATH หรือระบุด้วย --ffmpeg)")
+        self.info = self._probe()
+        # crop บนภาพ YUV 4:2:0 ปัดพิกัด / ขนาดลงเป็นเลขคู่เอง ต้องปัดให้ตรงกัน ไม่งั้นขนาด Buffer จะไม่ตรงกับเฟรม
+        x, y, w, h = resolve_region(region, self.info, bottom_fraction)
+        self.region = x & ~1, y & ~1, max(2, w & ~1), max(2, h & ~1)
+
+    def _probe(self) -> VideoInfo:
+        # ffmpeg -i ไม่มี Output จะพิมพ์ข้อมูลไฟล์ลง stderr แล้วจบด้วย Error (ไม่ต้องพึ่ง ffprobe)
+        out = subprocess.run([self.ffmpeg, '-hide_banner', '-i', self.path], capture_output=True,
+                             text=True, errors='replace').stderr
+        size = re.search(r"Stream #.*?Video:.*?(\d{2,5})x(\d{2,5})", out)
+        if not size:
+            last = out.strip().splitlines()[-1] if out.strip() else self.path
+            raise ValueError(f"ไม่พบ Video Stream: {last}")
+        duration = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", out)
+        seconds = int(duration[1]) * 3600 + int(duration[2]) * 60 + float(duration[3]) if duration else 0.0
+        return VideoInfo(int(size[1]), int(size[2]), seconds)
+
+    def frames(self) -> Iterator[Tuple[float, np.ndarray]]:
+        x, y, w, h = self.region
+        cmd = [self.ffmpeg, '-v', 'error', '-nostdin', '-i', self.path, '-an', '-sn',
+               '-vf', f"fps={self.fps},crop={w}:{h}:{x}:{y}", '-pix_fmt', 'bgra', '-f', 'rawvideo', '-']
+        buffer = bytearray(w * h * 4)
+        view = memoryview(buffer)
+        frame = np.frombuffer(buffer, dtype=np.uint8).reshape(h, w, 4)
+        # stderr ลงไฟล์ชั่วคราว: ไฟล์เสียอาจมี Error หลายพันบรรทัด ถ้าใช้ Pipe จะค้างเมื่อ Pipe เต็ม
+        with tempfile.TemporaryFile() as errors:
+            # แยก Process Group: Ctrl+C ให้ Python จัดการฝ่ายเดียว (ffmpeg ถูกปิดใน finally)
+            isolate = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP} if os.name == 'nt' \
+                else {'start_new_session': True}
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=errors, bufsize=0, **isolate)
+            finished = False
+            try:
+                index = 0
+                while True:
+                    filled = 0
+                    while filled < len(buffer):
+                        n = proc.stdout.readinto(view[filled:])
+                        if not n:
+                            break
+                        filled += n
+                    if filled < len(buffer):
+                        break
+                    yield index / self.fps, frame
+                    index += 1
+                finished = True
+            finally:
+                if not finished:
+                    proc.kill()   # ผู้เรียกหยุดอ่านก่อนจบไฟล์
+                proc.stdout.close()
+                code = proc.wait()
+            if code != 0:
+                errors.seek(0)
+                message = errors.read().decode('utf-8', 'replace').strip().splitlines()
+                raise RuntimeError(f"ffmpeg ถอดรหัสไม่สำเร็จ (exit {code}): {message[-1] if message else ''}")
+
+
+class OpenCvReader:
+    """
+    ถอดรหัสด้วย OpenCV (pip install opencv-python) ข้ามเฟรมที่ไม่ได้ตรวจด้วย grab() (ไม่แปลงสี)
+    แล้วคัดลอกเฉพาะพื้นที่คำบรรยายลง Buffer BGRA เดียวตลอดทั้งไฟล์
+    """
+    name = "opencv"
+
+    def __init__(self, path: str, fps: float, region: Optional[Region] = None, bottom_fraction: float = 0.25):
+        import cv2
+        self.cv2 = cv2
+        self.path = path
+        self.fps = fps
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            raise ValueError(f"OpenCV เปิดไฟล์วิดีโอไม่ได้: {path}")
+        self.native_fps = self.capture.get(cv2.CAP_PROP_FPS) or 0.0
+        count = self.capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0
+        self.info = VideoInfo(int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                              int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                              count / self.native_fps if self.native_fps else 0.0)
+        self.region = resolve_region(region, self.info, bottom_fraction)
+
+    def frames(self) -> Iterator[Tuple[float, np.ndarray]]:
+        x, y, w, h = self.region
+        frame = np.full((h, w, 4), 255, dtype=np.uint8)
+        image = None
+        step = 1.0 / self.fps
+        next_time = 0.0
+        index = 0
+        try:
+            while self.capture.grab():
+                if self.native_fps:
+                    t = index / self.native_fps
+                else:
+                    t = self.capture.get(self.cv2.CAP_PROP_POS_MSEC) / 1000.0
+                index += 1
+                if t + 1e-6 < next_time:
+                    continue
+                ok, image = self.capture.retrieve(image)
+                if not ok:
+                    break
+                while next_time <= t + 1e-6:
+                    next_time += step
+                frame[:, :, :3] = image[y:y + h, x:x + w]
+                yield t, frame
+        finally:
+            self.capture.release()
+
+
+DECODERS = ('auto', 'ffmpeg', 'opencv')
+
+
+def open_video(path: str, fps: float, region: Optional[Region] = None, bottom_fraction: float = 0.25,
+               decoder: str = 'auto', ffmpeg: str = ''):
+    """เลือกตัวถอดรหัส ('auto' = ffmpeg ถ้ามี ไม่มีก็ใช้ OpenCV)"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"ไม่พบไฟล์วิดีโอ: {path}")
+    if decoder == 'ffmpeg' or (decoder == 'auto' and (ffmpeg or shutil.which('ffmpeg'))):
+        return FfmpegReader(path, fps, region, bottom_fraction, ffmpeg)
+    try:
+        return OpenCvReader(path, fps, region, bottom_fraction)
+    except ImportError:
+        raise RuntimeError("ไม่มีตัวถอดรหัสวิดีโอ: ติดตั้ง ffmpeg (แนะนำ) หรือ pip install opencv-python")
+
+
+# ====================================================================
+# II. ตรวจการเปลี่ยนคำบรรยาย
+# ====================================================================
+def text_fingerprint(frame: np.ndarray, text_brightness: int = 200, grid_width: int = 64,
+                     grid_height: int = 24) -> np.ndarray:
+    """
+    ลายนิ้วมือของ "ตัวอักษร" ในพื้นที่: สัดส่วนพิกเซลที่สว่างตั้งแต่ text_brightness ในแต่ละช่องของ Grid
+    (คำบรรยายส่วนใหญ่เป็นตัวอักษรสีอ่อนขอบเข้ม ฉากหลังที่ขยับแต่ไม่สว่างจึงไม่ทำให้ดูเหมือนข้อความเปลี่ยน)
+    text_brightness = 0: ใช้ค่าเทาเฉลี่ยทั้งภาพแบบ Story Watch (เหมาะกับกล่องข้อความทึบของเกม)
+    """
+    if text_brightness <= 0:
+        return frame_thumbnail(frame, grid_width, grid_height)
+    # ลดจำนวนพิกเซลก่อนแปลงเป็นขาวดำ (เหลือ >= 4 พิกเซลต่อช่อง เหมือน frame_thumbnail)
+    step = max(1, min(frame.shape[0] // (grid_height * 4), frame.shape[1] // (grid_width * 4)))
+    gray = to_grayscale(frame[::step, ::step])
+    mask = (gray >= text_brightness).view(np.uint8) * np.uint8(255)
+    return frame_thumbnail(mask, grid_width, grid_height)
+
+
+def text_diff_ratio(a: np.ndarray, b: np.ndarray, pixel_tolerance: float = 40.0) -> float:
+    """
+    สัดส่วนช่องที่ต่างกัน เทียบกับช่องที่มีตัวอักษร (ไม่ใช่ทั้ง Grid)
+    คำบรรยายสั้นๆ เช่น "Hi." กินพื้นที่ไม่ถึง 1% ของ Grid แต่เปลี่ยนเกือบ 100% ของช่องที่มีตัวอักษร
+    """
+    ink = np.count_nonzero((a > pixel_tolerance) | (b > pixel_tolerance))
+    if not ink:
+        return 0.0
+    return float(np.count_nonzero(np.abs(a - b) > pixel_tolerance)) / ink
+
+
+class SubtitleTracker:
+    """
+    ติดตามลายนิ้วมือทีละเฟรม แล้วบอกว่าคำบรรยายเริ่ม / จบเมื่อไร
+
+    ลักษณะใหม่ของพื้นที่ (คำบรรยายใหม่ หรือไม่มีคำบรรยาย) ต้องนิ่งอย่างน้อย stable_ms ก่อน จึงถือว่าเปลี่ยนจริง
+    (กันเฟรมกระพริบ / คำบรรยายที่ค่อยๆ Fade) แต่เวลาที่บันทึกคือเฟรมแรกที่เริ่มเปลี่ยน
+
+    Args:
+        stable_seconds: เวลาที่ภาพต้องนิ่ง
+        change_ratio: สัดส่วนช่องที่ต่างเกินนี้ = ภาพเปลี่ยน
+        pixel_tolerance: ความต่างของค่าในช่อง (0-255) ที่ยังถือว่าเหมือนเดิม
+        min_ink: ช่องที่มีตัวอักษรหนาแน่นที่สุดต่ำกว่าสัดส่วนนี้ = ไม่มีคำบรรยาย (ไม่ต้อง OCR)
+        text_mode: ลายนิ้วมือมาจาก text_fingerprint แบบ Mask (เทียบด้วย text_diff_ratio)
+            False = ลายนิ้วมือค่าเทาเฉลี่ย (เทียบด้วย thumbnail_diff_ratio ทั้ง Grid)
+    """
+
+    def __init__(self, stable_seconds: float = 0.2, change_ratio: float = 0.2, pixel_tolerance: float = 40.0,
+                 min_ink: float = 0.05, text_mode: bool = True):
+        self.stable_seconds = stable_seconds
+        self.change_ratio = change_ratio
+        self.pixel_tolerance = pixel_tolerance
+        self.min_ink = min_ink if text_mode else 0.0
+        self.diff = text_diff_ratio if text_mode else thumbnail_diff_ratio
+        self.current = None        # ลายนิ้วมือของช่วงปัจจุบัน (คำบรรยาย หรือพื้นที่ว่าง)
+        self.showing = False       # ช่วงปัจจุบันมีคำบรรยายหรือไม่
+        self._previous = None
+        self._since = 0.0          # เวลาที่ลักษณะใหม่เริ่มปรากฏ
+
+    def _changed(self, a, b) -> bool:
+        return b is None or self.diff(a, b, self.pixel_tolerance) > self.change_ratio
+
+    def is_blank(self, thumb: np.ndarray) -> bool:
+        return self.min_ink > 0 and float(thumb.max()) < self.min_ink * 255
+
+    def update(self, t: float, thumb: np.ndarray) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Returns:
+            (เวลาที่คำบรรยายปัจจุบันจบ หรือ None, เวลาที่คำบรรยายใหม่เริ่ม หรือ None)
+            ถ้าค่าที่สองไม่ใช่ None ผู้เรียกควร OCR เฟรมนี้
+        """
+        if not self._changed(thumb, self.current):
+            self._previous = None
+            return None, None
+        if self._changed(thumb, self._previous):
+            self._since = t     # ยังขยับอยู่ -> เริ่มนับเวลานิ่งใหม่
+        self._previous = thumb
+        if t - self._since + 1e-6 < self.stable_seconds:
+            return None, None
+
+        ended = self._since if self.showing else None
+        self.current, self._previous = thumb, None
+        self.showing = not self.is_blank(thumb)
+        return ended, self._since if self.showing else None
+
+    def finish(self, t: float) -> Optional[float]:
+        """จบวิดีโอ: คืนเวลาจบของคำบรรยายที่ยังแสดงอยู่"""
+        ended = t if self.showing else None
+        self.showing = False
+        return ended
+
+
+# ====================================================================
+# III. ไฟล์คำบรรยาย (SRT / WebVTT)
+# ====================================================================
+class Cue(NamedTuple):
+    start: float
+    end: float
+    original: str
+    translated: Optional[str]
+
+
+def format_timestamp(seconds: float, separator: str = ',') -> str:
+    """วินาที -> 'HH:MM:SS,mmm' (SRT) หรือ 'HH:MM:SS.mmm' (VTT)"""
+    millis = int(round(max(0.0, seconds) * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def _cue_lines(text: str) -> str:
+    # บรรทัดว่างในคำบรรยายทำให้ไฟล์ SRT / VTT จบ Cue ก่อนเวลา
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+class SubtitleWriter:
+    """
+    เขียนคำบรรยายทีละ Cue แล้ว flush ทันที (หยุดกลางคันก็ได้ไฟล์ที่เปิดดูได้)
+    รูปแบบดูจากนามสกุลไฟล์: .vtt = WebVTT, อื่นๆ = SRT
+
+    Args:
+        include_original: เขียนข้อความต้นฉบับไว้ใต้คำแปล
+    """
+
+    def __init__(self, path: str, include_original: bool = False):
+        self.path = path
+        self.is_vtt = path.lower().endswith('.vtt')
+        self.include_original = include_original
+        self.count = 0
+        self._file = open(path, 'w', encoding='utf-8', newline='\n')
+        if self.is_vtt:
+            self._file.write("WEBVTT\n\n")
+
+    def write(self, cue: Cue):
+        text = cue.translated or cue.original
+        if self.include_original and cue.translated:
+            text = f"{cue.translated}\n{cue.original}"
+        separator = '.' if self.is_vtt else ','
+        self.count += 1
+        header = "" if self.is_vtt else f"{self.count}\n"
+        self._file.write(f"{header}{format_timestamp(cue.start, separator)} --> "
+                         f"{format_timestamp(cue.end, separator)}\n{_cue_lines(text)}\n\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+# ====================================================================
+# IV. ตัวจัดการงาน: ถอดรหัส -> ตรวจการเปลี่ยน -> OCR + แปล (Thread Pool) -> รวม Cue ซ้ำ -> เขียนไฟล์
+# ====================================================================
+_pipeline = None
+
+
+def init_pipeline(settings_path: Optional[str] = None):
+    """โหลด settings จากไฟล์ที่ระบุ (ต้องทำก่อน import cloud_processor) แล้วสร้าง ImagePipeline"""
+    global _pipeline
+    if settings_path:
+        settings.settings.clear()
+        settings.settings.update(settings.load_settings(settings_path))
+    from image_pipeline import create_image_pipeline
+    _pipeline = create_image_pipeline()
+
+
+def recognize(image_data: bytes, source_language: str, target_language: str
+              ) -> Tuple[Optional[str], Optional[str]]:
+    """OCR + แปลคำบรรยาย 1 เฟรม คืน (ต้นฉบับ, คำแปล) ไม่พบข้อความ = (None, None) (ไม่ raise)"""
+    from cloud_processor import process_image_to_text, translate_incremental
+    try:
+        original = process_image_to_text(image_data)
+        if not original:
+            return None, None
+        return original, translate_incremental(original, target_language, source_language)
+    except Exception as e:
+        print(f"Video OCR Error: {e}")
+        return None, None
+
+
+def extract_subtitles(reader, writer: SubtitleWriter, tracker: SubtitleTracker, text_brightness: int = 200,
+                      workers: int = 4, max_pending: int = 0, merge_gap: float = 0.25,
+                      source_language: str = 'en', target_language: str = 'th',
+                      progress_every: float = 5.0) -> dict:
+    """
+    อ่านวิดีโอจนจบ แล้วเขียนคำบรรยายที่แปลแล้วตามลำดับเวลา
+
+    งาน OCR ส่งเข้า Pool ทันทีที่พบคำบรรยายใหม่ (ไม่ต้องรอให้คำบรรยายจบ) ค้างได้ไม่เกิน max_pending งาน
+    ถ้าเต็มจะรอผลของงานที่เก่าที่สุดก่อนถอดรหัสต่อ Cue ที่ OCR ได้ข้อความเดิมติดกัน (ห่างไม่เกิน merge_gap วินาที)
+    จะถูกรวมเป็น Cue เดียว
+
+    Returns:
+        สรุปผล (จำนวนเฟรม / OCR / Cue, เวลา, ความเร็วเทียบเวลาจริงของวิดีโอ)
+    """
+    max_pending = max(2, max_pending or workers * 2)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="VideoOcr")
+    queue = deque()     # [start, end (None = ยังแสดงอยู่), Future ของ (ต้นฉบับ, คำแปล)]
+    held = None         # Cue ล่าสุดที่ยังไม่เขียน (รอดูว่า Cue ถัดไปเป็นข้อความเดิมหรือไม่)
+    counts = {'frames': 0, 'ocr': 0, 'no_text': 0, 'merged': 0, 'untranslated': 0}
+    start = last_report = time.perf_counter()
+    t = 0.0
+    interrupted = False
+
+    def emit(cue: Optional[Cue]):
+        nonlocal held
+        if held is not None and cue is not None and cue.start - held.end <= merge_gap \
+                and canonical_text(cue.original) == canonical_text(held.original):
+            held = held._replace(end=cue.end)
+            counts['merged'] += 1
+            return
+        if held is not None:
+            writer.write(held)
+            counts['untranslated'] += held.translated is None
+        held = cue
+
+    def collect(block: bool):
+        # เขียนตามลำดับเวลาเสมอ: ทำได้เฉพาะงานหัวคิวที่คำบรรยายจบแล้ว
+        while queue and queue[0][1] is not None and (block or queue[0][2].done()):
+            cue_start, cue_end, future = queue.popleft()
+            block = block and len(queue) >= max_pending
+            if future.cancelled():
+                continue
+            original, translated = future.result()
+            if original:
+                emit(Cue(cue_start, cue_end, original, translated))
+            else:
+                counts['no_text'] += 1
+
+    try:
+        for t, frame in reader.frames():
+            counts['frames'] += 1
+            ended, started = tracker.update(t, text_fingerprint(frame, text_brightness))
+            if ended is not None:
+                queue[-1][1] = ended
+            if started is not None:
+                while len(queue) >= max_pending:
+                    collect(block=True)
+                image_data = _pipeline.run(frame)   # เข้ารหัสตอนนี้ Buffer ของเฟรมจะถูกเขียนทับในรอบถัดไป
+                queue.append([started, None, pool.submit(recognize, image_data, source_language, target_language)])
+                counts['ocr'] += 1
+            collect(block=False)
+
+            now = time.perf_counter()
+            if progress_every and now - last_report >= progress_every:
+                total = f"/{reader.info.duration:.0f}" if reader.info.duration else ""
+                print(f"[{t:.0f}{total}s] x{t / (now - start):.1f} เวลาจริง  OCR {counts['ocr']}  "
+                      f"คำบรรยาย {writer.count}")
+                last_report = now
+
+        ended = tracker.finish(t + 1.0 / reader.fps)
+        if ended is not None:
+            queue[-1][1] = ended
+        while queue:
+            collect(block=True)
+        emit(None)
+    except KeyboardInterrupt:
+        # เก็บ Cue ที่ OCR เสร็จแล้ว ที่เหลือทิ้ง
+        interrupted = True
+        for item in queue:
+            item[2].cancel()
+        if queue and queue[-1][1] is None:
+            queue[-1][1] = t
+        collect(block=False)
+        emit(None)
+    finally:
+        pool.shutdown(wait=not interrupted, cancel_futures=True)
+
+    elapsed = time.perf_counter() - start
+    return {
+        **counts,
+        'cues': writer.count,
+        'interrupted': interrupted,
+        'video_seconds': round(t, 2),
+        'seconds': round(elapsed, 2),
+        'speed': round(t / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def create_subtitle_tracker() -> SubtitleTracker:
+    """สร้าง Tracker ตามค่าใน settings (หมวด video_subtitles)"""
+    config = get_section('video_subtitles')
+    return SubtitleTracker(
+        stable_seconds=config.get('stable_ms', 200) / 1000.0,
+        change_ratio=config.get('change_ratio', 0.2),
+        pixel_tolerance=config.get('pixel_tolerance', 40),
+        min_ink=config.get('min_ink', 0.05),
+        text_mode=config.get('text_brightness', 200) > 0,
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('video', help="ไฟล์วิดีโอ")
+    parser.add_argument('-o', '--output', help="ไฟล์คำบรรยาย .srt หรือ .vtt (ค่าเริ่มต้น <ชื่อวิดีโอ>.<ภาษา>.srt)")
+    parser.add_argument('--region', type=parse_region, help="พื้นที่คำบรรยาย x,y,กว้าง,สูง (Pixel ของวิดีโอ)")
+    parser.add_argument('--fps', type=float, help="จำนวนเฟรมต่อวินาทีที่ตรวจ (ความละเอียดของเวลาคำบรรยาย)")
+    parser.add_argument('--decoder', choices=DECODERS, help="ตัวถอดรหัสวิดีโอ")
+    parser.add_argument('--ffmpeg', help="path ของโปรแกรม ffmpeg")
+    parser.add_argument('--workers', type=int, help="จำนวนงาน OCR / แปล พร้อมกัน")
+    parser.add_argument('--source', default='en', help="ภาษาต้นทาง")
+    parser.add_argument('--target', default='th', help="ภาษาปลายทาง")
+    parser.add_argument('--original', action='store_true', help="เขียนข้อความต้นฉบับไว้ใต้คำแปล")
+    parser.add_argument('--settings', help="ไฟล์ settings.json ที่จะใช้แทนของโฟลเดอร์โปรแกรม")
+    args = parser.parse_args(argv)
+
+    init_pipeline(args.settings)
+    config = get_section('video_subtitles')
+    fps = args.fps or config.get('fps', 5)
+    output = args.output or f"{os.path.splitext(args.video)[0]}.{args.target}.srt"
+    try:
+        reader = open_video(args.video, fps, args.region or config.get('region') or None,
+                            bottom_fraction=config.get('bottom_fraction', 0.25),
+                            decoder=args.decoder or config.get('decoder', 'auto'),
+                            ffmpeg=args.ffmpeg or config.get('ffmpeg', ''))
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    x, y, w, h = reader.region
+    print(f"{args.video}: {reader.info.width}x{reader.info.height} {reader.info.duration:.0f}s ({reader.name})  "
+          f"พื้นที่ {x},{y},{w},{h}  ตรวจ {fps:g} เฟรม/วินาที -> {output}")
+    writer = SubtitleWriter(output, include_original=args.original)
+    try:
+        summary = extract_subtitles(reader, writer, create_subtitle_tracker(),
+                                    text_brightness=config.get('text_brightness', 200),
+                                    workers=args.workers or config.get('workers', 4),
+                                    max_pending=config.get('max_pending', 0),
+                                    merge_gap=config.get('merge_gap_ms', 250) / 1000.0,
+                                    source_language=args.source, target_language=args.target)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        writer.close()
+
+    print("\n--- สรุป ---")
+    print(f"คำบรรยาย {summary['cues']} ช่วง  (OCR {summary['ocr']} ครั้ง จาก {summary['frames']} เฟรม, "
+          f"ไม่พบข้อความ {summary['no_text']}, รวมข้อความซ้ำ {summary['merged']}, แปลไม่สำเร็จ {summary['untranslated']})")
+    print(f"วิดีโอ {summary['video_seconds']}s ใน {summary['seconds']}s = x{summary['speed']} เวลาจริง")
+    if summary['interrupted']:
+        print("หยุดกลางคัน: ไฟล์คำบรรยายมีเฉพาะช่วงที่ทำเสร็จแล้ว")
+        return 130
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
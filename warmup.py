@@ -0,0 +1,77 @@
+import threading
+import time
+from typing import Callable, Optional
+
+import tracing
+
+
+class Warmup:
+    """
+    เรียก load() (เช่น import โมดูล Google Cloud ที่ใช้เวลาหลายร้อย ms) ใน Background Thread
+    เพื่อให้หน้าต่างแรกขึ้นได้ทันที แล้วค่อยโหลดส่วนที่หนักตามหลัง
+
+    - start(): เริ่มโหลด (เรียกซ้ำได้ จะไม่สร้าง Thread ซ้อน)
+    - result(): คืนค่าที่ load() คืนมา ถ้ายังโหลดไม่เสร็จจะรอ (และบันทึกเวลาที่รอลง Trace เป็นขั้น 'warmup')
+      ถ้ายังไม่เคย start() จะเริ่มโหลดให้เลย
+
+    Args:
+        load: ฟังก์ชันที่โหลดของหนัก แล้วคืนผลที่ต้องใช้ (เช่น โมดูล)
+        name: ชื่อ Thread / ชื่อที่แสดงใน Log
+    """
+
+    def __init__(self, load: Callable[[], object], name: str = "Warmup"):
+        self.load = load
+        self.name = name
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._value = None
+        self._error: Optional[BaseException] = None
+        self.load_ms = 0.0
+        self.waits = 0
+        self.waited_ms = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def start(self) -> 'Warmup':
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        return self
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            self._value = self.load()
+        except BaseException as e:   # ImportError ฯลฯ ส่งต่อให้ผู้เรียก result()
+            self._error = e
+            print(f"Error: {self.name} failed: {e}")
+        self.load_ms = (time.perf_counter() - start) * 1000
+        print(f"Info: {self.name} ready in {self.load_ms:.0f} ms")
+        self._done.set()
+
+    def result(self):
+        """คืนผลของ load() (รอถ้ายังไม่เสร็จ) ถ้า load() ล้มเหลวจะ raise Error เดิม"""
+        if not self._done.is_set():
+            self.start()
+            start = time.perf_counter()
+            with tracing.span('warmup'):
+                self._done.wait()
+            with self._lock:
+                self.waits += 1
+                self.waited_ms += (time.perf_counter() - start) * 1000
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'ready': self.ready,
+                'load_ms': round(self.load_ms, 1),
+                'waits': self.waits,
+                'waited_ms': round(self.waited_ms, 1),
+            }